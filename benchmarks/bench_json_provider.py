@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: orjson vs stdlib JSON backend on GET /api/sensor-history?limit=500
+
+Usage (from the repository root):
+    python benchmarks/bench_json_provider.py [--requests 200]
+
+Uses a throwaway SQLite database seeded with 500 sensor rows and the Flask test
+client, so no server needs to be running.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requests per backend")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="gcs-bench-")
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from gcs import create_app, db, json_provider
+    from gcs.models import SensorData
+
+    app = create_app()
+    with app.app_context():
+        start = datetime(2025, 1, 15, 10, 0, 0)
+        db.session.add_all([
+            SensorData(ts=start + timedelta(seconds=i), co_ppm=1.0 + i / 1000, no2_ppm=0.8, nh3_ppm=0.3,
+                       light_lux=500.0, temp_c=22.5, pressure_hpa=1013.25, humidity_pct=60.0, source="bench")
+            for i in range(500)
+        ])
+        db.session.commit()
+
+        payload = app.test_client().get("/api/sensor-history?limit=500").get_json()
+
+    client = app.test_client()
+    backends = ["stdlib"] + (["orjson"] if json_provider.orjson is not None else [])
+    results = {}
+    for backend in backends:
+        json_provider.configure(backend)
+        client.get("/api/sensor-history?limit=500")  # warm-up
+
+        t0 = time.perf_counter()
+        for _ in range(args.requests):
+            response = client.get("/api/sensor-history?limit=500")
+            assert response.status_code == 200
+        request_ms = (time.perf_counter() - t0) * 1000 / args.requests
+
+        t0 = time.perf_counter()
+        for _ in range(args.requests):
+            json_provider.dumps(payload)
+        encode_ms = (time.perf_counter() - t0) * 1000 / args.requests
+
+        results[backend] = (request_ms, encode_ms)
+        print(f"{backend:7s}  request {request_ms:7.3f} ms   encode-only {encode_ms:7.3f} ms")
+
+    if len(results) == 2:
+        (req_std, enc_std), (req_or, enc_or) = results["stdlib"], results["orjson"]
+        print(f"speed-up  request x{req_std / req_or:.2f}   encode-only x{enc_std / enc_or:.2f}")
+    else:
+        print("orjson not installed; only the stdlib backend was measured")
+
+
+if __name__ == "__main__":
+    main()
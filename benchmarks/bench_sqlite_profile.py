@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent ingest writes and dashboard reads with and without the SQLite profile
+
+Usage (from the repository root):
+    python benchmarks/bench_sqlite_profile.py [--seconds 5] [--writers 2] [--readers 4]
+
+For each setting a throwaway SQLite file is seeded with 5000 sensor rows. Writer threads
+then commit single SensorData rows (like POST /api/sensors) while reader threads run
+GET /api/sensor-history?limit=100 through the Flask test client. Reported: writes/s,
+reads/s, the p95 latency of each and how many operations failed with "database is
+locked". No server needs to be running.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _p95(samples):
+    if not samples:
+        return float("nan")
+    samples = sorted(samples)
+    return samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0] * 1000
+
+
+def run(profile: bool, seconds: float, writers: int, readers: int):
+    from config import Config
+    from gcs import create_app, db
+    from gcs.models import SensorData
+
+    tmpdir = tempfile.mkdtemp(prefix="gcs-bench-")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    Config.SQLITE_PROFILE_ENABLED = profile
+    app = create_app()
+    with app.app_context():
+        start = datetime(2025, 1, 15, 10, 0, 0)
+        db.session.add_all([
+            SensorData(ts=start + timedelta(seconds=i), co_ppm=1.0, no2_ppm=0.8, nh3_ppm=0.3, light_lux=500.0,
+                       temp_c=22.5, pressure_hpa=1013.25, humidity_pct=60.0, source="bench")
+            for i in range(5000)
+        ])
+        db.session.commit()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {"write": [], "read": [], "write_errors": 0, "read_errors": 0}
+
+    def writer():
+        with app.app_context():
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    db.session.add(SensorData(ts=datetime.utcnow(), co_ppm=1.5, temp_c=23.0, source="bench"))
+                    db.session.commit()
+                    with lock:
+                        results["write"].append(time.perf_counter() - t0)
+                except Exception:
+                    db.session.rollback()
+                    with lock:
+                        results["write_errors"] += 1
+            db.session.remove()
+
+    def reader():
+        client = app.test_client()
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            ok = client.get("/api/sensor-history?limit=100").status_code == 200
+            with lock:
+                if ok:
+                    results["read"].append(time.perf_counter() - t0)
+                else:
+                    results["read_errors"] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    with app.app_context():
+        db.engine.dispose()
+
+    label = "profile" if profile else "default"
+    print(f"{label:8s}  writes {len(results['write']) / seconds:8.1f}/s  p95 {_p95(results['write']):7.2f} ms"
+          f"  errors {results['write_errors']:4d}   reads {len(results['read']) / seconds:8.1f}/s"
+          f"  p95 {_p95(results['read']):7.2f} ms  errors {results['read_errors']:4d}")
+    return len(results["write"]) / seconds, len(results["read"]) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each run")
+    parser.add_argument("--writers", type=int, default=2, help="concurrent ingest threads")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent dashboard readers")
+    args = parser.parse_args()
+
+    before = run(False, args.seconds, args.writers, args.readers)
+    after = run(True, args.seconds, args.writers, args.readers)
+    print(f"speed-up  writes x{after[0] / max(before[0], 1e-9):.2f}   reads x{after[1] / max(before[1], 1e-9):.2f}")
+
+
+if __name__ == "__main__":
+    main()
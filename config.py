@@ -5,6 +5,51 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-key")
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI", "sqlite:///uav_gcs.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLite file databases: WAL journal + per-connection pragmas (see gcs/db_profile.py)
+    SQLITE_PROFILE_ENABLED = os.getenv("SQLITE_PROFILE_ENABLED", "true").lower() in ("1", "true", "yes")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+    SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
     MAX_UI_DATA_LATENCY_S = 4
+    # "auto" uses orjson when installed, "stdlib" forces the standard json module
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+    # Cap on decompressed request bodies (Content-Encoding: gzip/deflate/zstd)
+    MAX_DECODED_BODY_BYTES = int(os.getenv("MAX_DECODED_BODY_BYTES", str(32 * 1024 * 1024)))
+    MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", str(16 * 1024 * 1024)))
+    SENSOR_BATCH_MAX = int(os.getenv("SENSOR_BATCH_MAX", "1000"))
+    NDJSON_CHUNK_SIZE = int(os.getenv("NDJSON_CHUNK_SIZE", "500"))
+    # Write-behind ingest: /api/sensors and /api/targets return 202 and rows are group-committed
+    WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "false").lower() in ("1", "true", "yes")
+    WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+    WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+    WRITE_BEHIND_FLUSH_MS = int(os.getenv("WRITE_BEHIND_FLUSH_MS", "250"))
+    # Target images are written to the archive by a worker pool after the rows commit
+    IMAGE_WRITER_ENABLED = os.getenv("IMAGE_WRITER_ENABLED", "true").lower() in ("1", "true", "yes")
+    IMAGE_WRITER_WORKERS = int(os.getenv("IMAGE_WRITER_WORKERS", "2"))
+    IMAGE_WRITER_MAX_QUEUE = int(os.getenv("IMAGE_WRITER_MAX_QUEUE", "32"))
+    # Target image archive: "files" (one file per frame) or "pack" (append-only segment files)
+    ARCHIVE_BACKEND = os.getenv("ARCHIVE_BACKEND", "files")
+    ARCHIVE_PACK_SEGMENT_MB = int(os.getenv("ARCHIVE_PACK_SEGMENT_MB", "256"))
+    # Small JPEG thumbnails for detection cards (needs Pillow; cards use the full image otherwise)
+    THUMBNAILS_ENABLED = os.getenv("THUMBNAILS_ENABLED", "true").lower() in ("1", "true", "yes")
+    THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "320"))
+    THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "1"))
+    THUMBNAIL_MAX_QUEUE = int(os.getenv("THUMBNAIL_MAX_QUEUE", "64"))
+    # Longest a /frames/...?wait= long-poll may block before answering 304
+    FRAME_LONG_POLL_MAX_S = int(os.getenv("FRAME_LONG_POLL_MAX_S", "30"))
+    # Recent frames kept per device for MJPEG viewers; a viewer further behind skips ahead
+    FRAME_RING_SIZE = int(os.getenv("FRAME_RING_SIZE", "8"))
+    MJPEG_MAX_LAG = int(os.getenv("MJPEG_MAX_LAG", "2"))
+    MJPEG_MAX_CLIENTS = int(os.getenv("MJPEG_MAX_CLIENTS", "8"))
+    # Frames attached to detection events for /stream clients that emit subscribe_images
+    IMAGE_PUSH_SIZE = int(os.getenv("IMAGE_PUSH_SIZE", "320"))
+    IMAGE_PUSH_MAX_BYTES = int(os.getenv("IMAGE_PUSH_MAX_BYTES", str(256 * 1024)))
+    # 10 s / 1 min / 10 min sensor rollups, folded from new rows by a background compactor
+    ROLLUPS_ENABLED = os.getenv("ROLLUPS_ENABLED", "true").lower() in ("1", "true", "yes")
+    ROLLUP_INTERVAL_MS = int(os.getenv("ROLLUP_INTERVAL_MS", "2000"))
+    ROLLUP_BATCH_SIZE = int(os.getenv("ROLLUP_BATCH_SIZE", "5000"))
     API_KEY = os.getenv("API_KEY", None)
     SOCKETIO_CORS_ORIGINS = os.getenv("SOCKETIO_CORS_ORIGINS", "*")
\ No newline at end of file
@@ -7,8 +7,17 @@ from flask_migrate import Migrate
 from flask_socketio import SocketIO
 from dotenv import load_dotenv
 
+from . import db_profile, json_provider
 from .services.throughput import ThroughputMeter
 from .services.recent_detections import RecentDetections
+from .services.ingest_queue import WriteBehindQueue
+from .services.image_writer import ImageWriter
+from .services.thumbnails import ThumbnailWorker
+from .services.latest_frames import LatestFrames
+from .services.image_push import ImagePush
+from .services.rollup_compactor import RollupCompactor
+from .services.table_stats import TableStats
+from .services.image_store import configure_archive
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -16,6 +25,13 @@ migrate = Migrate()
 socketio = SocketIO(async_mode="threading", cors_allowed_origins="*")
 throughput_meter = ThroughputMeter(4.0)
 recent_detections = RecentDetections(window_sec=3600, max_items=200, min_conf=0.75, refresh_sec=4.0)
+ingest_queue = WriteBehindQueue()
+image_writer = ImageWriter()
+thumbnailer = ThumbnailWorker()
+latest_frames = LatestFrames()
+image_push = ImagePush()
+rollup_compactor = RollupCompactor()
+table_stats = TableStats()
 
 
 def get_local_ip():
@@ -37,13 +53,23 @@ def create_app():
     app = Flask(__name__, template_folder="templates", static_folder="static")
     app.config.from_object("config.Config")
 
+    # One JSON encoder for HTTP responses and Socket.IO packets (orjson when available)
+    json_provider.configure(app.config.get("JSON_BACKEND", "auto"))
+    app.json = json_provider.FastJSONProvider(app)
+
     @app.before_request
     def before_request():
         request.start_time = time.time()
 
+    sqlite_profile = app.config.get("SQLITE_PROFILE_ENABLED") and db_profile.configure_app(app)
     db.init_app(app)
+    if sqlite_profile:
+        with app.app_context():
+            db_profile.install(db.engine, app.config)
     migrate.init_app(app, db)
-    socketio.init_app(app)
+    # Import socket handlers before init_app so they are (re)applied to every server instance
+    from .sockets import bp as sockets_bp
+    socketio.init_app(app, json=json_provider)
 
     # Add context processor to inject server IP into all templates
     @app.context_processor
@@ -65,12 +91,58 @@ def create_app():
 
     from .models import SensorData, TargetDetection, SystemLog  # noqa: F401
     from .routes import bp as routes_bp
-    from .sockets import bp as sockets_bp
 
     app.register_blueprint(routes_bp)
     app.register_blueprint(sockets_bp)
 
+    from .commands import register_commands
+    register_commands(app)
+
     with app.app_context():
         db.create_all()
+        # Row counts for /api/stats: seeded here, then kept current from session events
+        table_stats.install(db.session)
+        table_stats.load()
+
+    if app.config.get("WRITE_BEHIND_ENABLED"):
+        ingest_queue.configure(
+            max_size=app.config["WRITE_BEHIND_MAX_QUEUE"],
+            batch_size=app.config["WRITE_BEHIND_BATCH_SIZE"],
+            flush_ms=app.config["WRITE_BEHIND_FLUSH_MS"],
+        )
+        ingest_queue.start(app)
+
+    configure_archive(
+        app.config.get("ARCHIVE_BACKEND", "files"),
+        app.config.get("ARCHIVE_PACK_SEGMENT_MB", 256) * 1024 * 1024,
+    )
+
+    latest_frames.configure(ring_size=app.config.get("FRAME_RING_SIZE", 8))
+    image_push.configure(
+        max_size=app.config.get("IMAGE_PUSH_SIZE", 320),
+        max_bytes=app.config.get("IMAGE_PUSH_MAX_BYTES", 256 * 1024),
+    )
+
+    if app.config.get("IMAGE_WRITER_ENABLED"):
+        image_writer.configure(
+            workers=app.config["IMAGE_WRITER_WORKERS"],
+            max_queue=app.config["IMAGE_WRITER_MAX_QUEUE"],
+        )
+        image_writer.start(app)
+
+    if app.config.get("THUMBNAILS_ENABLED"):
+        thumbnailer.configure(
+            workers=app.config["THUMBNAIL_WORKERS"],
+            max_queue=app.config["THUMBNAIL_MAX_QUEUE"],
+            max_size=app.config["THUMBNAIL_SIZE"],
+        )
+        thumbnailer.start()
+
+    if app.config.get("ROLLUPS_ENABLED"):
+        rollup_compactor.configure(
+            interval_ms=app.config["ROLLUP_INTERVAL_MS"],
+            batch_size=app.config["ROLLUP_BATCH_SIZE"],
+        )
+        rollup_compactor.start(app)
 
     return app
@@ -0,0 +1,19 @@
+import click
+
+from .services.image_store import reindex_archive
+from .services.rollups import rebuild
+
+
+def register_commands(app):
+    @app.cli.command("reindex-archive")
+    def reindex_archive_command():
+        """Rebuild the target image archive index with a one-off walk of the archive."""
+        count = reindex_archive()
+        click.echo(f"Indexed {count} archived images")
+
+    @app.cli.command("backfill-rollups")
+    @click.option("--batch-size", default=5000, show_default=True, help="Sensor rows folded per commit.")
+    def backfill_rollups_command(batch_size):
+        """Recompute the sensor rollup tables from every stored sensor row."""
+        count = rebuild(batch_size)
+        click.echo(f"Rolled up {count} sensor rows")
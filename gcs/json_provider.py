@@ -0,0 +1,81 @@
+"""JSON encoding shared by Flask responses and Socket.IO packets.
+
+Uses orjson when it is installed (and JSON_BACKEND is not "stdlib"), falling back to
+the standard library otherwise. Either way datetimes are written as ISO 8601 strings,
+so routes and socket emits can pass ``datetime`` objects straight through.
+"""
+import json as _stdlib_json
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+_use_orjson = orjson is not None
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+# Formatting kwargs that orjson output already satisfies (compact separators, UTF-8)
+_ORJSON_COMPATIBLE_KWARGS = {"separators", "ensure_ascii", "sort_keys"}
+
+
+def configure(backend: str = "auto") -> str:
+    """Select the encoder ("auto", "orjson" or "stdlib"); returns the backend in use."""
+    global _use_orjson
+    _use_orjson = orjson is not None and backend != "stdlib"
+    return backend_name()
+
+
+def backend_name() -> str:
+    return "orjson" if _use_orjson else "stdlib"
+
+
+def _default(o):
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+def dumps(obj, **kwargs) -> str:
+    """Drop-in for ``json.dumps`` (also used as the Socket.IO packet encoder)."""
+    if _use_orjson and not (kwargs.keys() - _ORJSON_COMPATIBLE_KWARGS):
+        option = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if kwargs.get("sort_keys") else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib copes
+    kwargs.setdefault("default", _default)
+    return _stdlib_json.dumps(obj, **kwargs)
+
+
+def loads(s, **kwargs):
+    """Drop-in for ``json.loads``."""
+    if _use_orjson and not kwargs:
+        return orjson.loads(s)
+    return _stdlib_json.loads(s, **kwargs)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by :func:`dumps` / :func:`loads`."""
+
+    default = staticmethod(_default)
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if _use_orjson and not pretty:
+            try:
+                body = orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+                return self._app.response_class(body, mimetype=self.mimetype)
+            except TypeError:
+                pass
+        return super().response(obj)
@@ -1,19 +1,26 @@
 import os
 from functools import wraps
 
-from flask import request, jsonify, make_response
+from flask import current_app, request, jsonify, make_response
+
+from .services.content_encoding import BodyTooLarge, UnsupportedEncoding, decode_stream, supported_encodings
+from .services import http_cache
+
+
+def check_api_key(provided_key):
+    """True when API key auth is disabled or the provided key matches."""
+    api_key = os.getenv("API_KEY")
+    
+    if not api_key:
+        return True
+    
+    return bool(provided_key) and provided_key == api_key
 
 
 def api_key_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        api_key = os.getenv("API_KEY")
-        
-        if not api_key:
-            return f(*args, **kwargs)
-        
-        provided_key = request.headers.get("X-API-Key")
-        if not provided_key or provided_key != api_key:
+        if not check_api_key(request.headers.get("X-API-Key")):
             return jsonify({"error": "Invalid or missing API key"}), 401
         
         return f(*args, **kwargs)
@@ -35,3 +42,92 @@ def cors_headers(f):
         
         return response
     return decorated_function
+
+
+def decode_content_encoding(f):
+    """Decompress gzip/deflate/zstd request bodies before the view parses them.
+
+    The decoded body replaces the WSGI input, so request.get_json(), request.files and
+    request.stream all see plain data. request.wire_bytes / request.decoded_bytes hold
+    the sizes on the wire and after decoding.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        encoding = request.headers.get("Content-Encoding", "").strip().lower()
+        if not encoding or encoding == "identity":
+            return f(*args, **kwargs)
+        
+        max_bytes = current_app.config.get("MAX_DECODED_BODY_BYTES", 32 * 1024 * 1024)
+        try:
+            body, wire, decoded = decode_stream(request.stream, encoding, max_bytes)
+        except UnsupportedEncoding:
+            return jsonify({
+                "error": f"Unsupported Content-Encoding: {encoding}",
+                "supported": supported_encodings()
+            }), 415
+        except BodyTooLarge as e:
+            return jsonify({"error": str(e)}), 413
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        environ = request.environ
+        environ["wsgi.input"] = body
+        environ["CONTENT_LENGTH"] = str(decoded)
+        environ.pop("HTTP_CONTENT_ENCODING", None)
+        # Drop cached values so the view reads the decoded body
+        request.__dict__.pop("stream", None)
+        request.__dict__.pop("content_length", None)
+        request.wire_bytes = wire
+        request.decoded_bytes = decoded
+        try:
+            return f(*args, **kwargs)
+        finally:
+            body.close()
+    return decorated_function
+
+
+def etag_cached(version_fn):
+    """Weak-ETag a read API by a cheap data version (e.g. latest row id).
+
+    ``version_fn`` runs before the view; when the client's If-None-Match matches, a
+    bodiless 304 is returned without running the view's query at all.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = http_cache.make_etag(version_fn(), request.full_path)
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            # Always revalidate; the 304 makes that cheap
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return decorated_function
+    return decorator
+
+
+def compress_response(f):
+    """gzip/brotli-compress JSON responses according to Accept-Encoding."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = make_response(f(*args, **kwargs))
+        response.vary.add("Accept-Encoding")
+        
+        if (response.status_code != 200 or response.direct_passthrough
+                or "Content-Encoding" in response.headers):
+            return response
+        encoding = http_cache.choose_encoding(request.accept_encodings)
+        if not encoding:
+            return response
+        data = response.get_data()
+        if len(data) < http_cache.MIN_COMPRESS_BYTES:
+            return response
+        
+        response.set_data(http_cache.compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
+    return decorated_function
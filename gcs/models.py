@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from sqlalchemy import literal
+
 from . import db
 
 
@@ -18,14 +20,84 @@ class SensorData(db.Model):
     source = db.Column(db.String(64))
 
 
+# Heartbeat rows posted by the live feed; never shown as detections
+LIVEDATA_TYPE = "livedata"
+_NOT_LIVEDATA_SQL = f"target_type != '{LIVEDATA_TYPE}'"
+
+
 class TargetDetection(db.Model):
     __tablename__ = "target_detection"
+    __table_args__ = (
+        db.Index("ix_target_detection_target_type_ts", "target_type", "ts"),
+        # Detections only, newest first, without wading through heartbeats (SQLite/PostgreSQL)
+        db.Index("ix_target_detection_ts_not_livedata", "ts",
+                 sqlite_where=db.text(_NOT_LIVEDATA_SQL), postgresql_where=db.text(_NOT_LIVEDATA_SQL)),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     target_type = db.Column(db.String(32))
     details_json = db.Column(db.JSON)
     image_url = db.Column(db.String(256))
+    # NULL once the image is on disk (or while the write is pending); "failed" if it never made it
+    image_status = db.Column(db.String(16))
+
+
+def not_livedata():
+    """Filter for real detections, matching the partial index.
+
+    The value is rendered inline rather than bound, so the planner can match the index's
+    WHERE term without having to look at parameter values.
+    """
+    return TargetDetection.target_type != literal(LIVEDATA_TYPE, literal_execute=True)
+
+
+class SensorRollup(db.Model):
+    """Min/max/sum/count of every sensor field per time bucket (10 s, 1 min, 10 min).
+
+    Maintained by services/rollups.py from SensorData; mean = sum / count per field.
+    """
+    __tablename__ = "sensor_rollup"
+    
+    resolution = db.Column(db.Integer, primary_key=True)  # bucket width in seconds
+    bucket_ts = db.Column(db.DateTime, primary_key=True)  # bucket start (UTC)
+    count = db.Column(db.Integer, nullable=False, default=0)  # readings in the bucket
+    co_ppm_min = db.Column(db.Float)
+    co_ppm_max = db.Column(db.Float)
+    co_ppm_sum = db.Column(db.Float)
+    co_ppm_count = db.Column(db.Integer, nullable=False, default=0)
+    no2_ppm_min = db.Column(db.Float)
+    no2_ppm_max = db.Column(db.Float)
+    no2_ppm_sum = db.Column(db.Float)
+    no2_ppm_count = db.Column(db.Integer, nullable=False, default=0)
+    nh3_ppm_min = db.Column(db.Float)
+    nh3_ppm_max = db.Column(db.Float)
+    nh3_ppm_sum = db.Column(db.Float)
+    nh3_ppm_count = db.Column(db.Integer, nullable=False, default=0)
+    light_lux_min = db.Column(db.Float)
+    light_lux_max = db.Column(db.Float)
+    light_lux_sum = db.Column(db.Float)
+    light_lux_count = db.Column(db.Integer, nullable=False, default=0)
+    temp_c_min = db.Column(db.Float)
+    temp_c_max = db.Column(db.Float)
+    temp_c_sum = db.Column(db.Float)
+    temp_c_count = db.Column(db.Integer, nullable=False, default=0)
+    pressure_hpa_min = db.Column(db.Float)
+    pressure_hpa_max = db.Column(db.Float)
+    pressure_hpa_sum = db.Column(db.Float)
+    pressure_hpa_count = db.Column(db.Integer, nullable=False, default=0)
+    humidity_pct_min = db.Column(db.Float)
+    humidity_pct_max = db.Column(db.Float)
+    humidity_pct_sum = db.Column(db.Float)
+    humidity_pct_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RollupCheckpoint(db.Model):
+    """Highest SensorData id already folded into the rollups."""
+    __tablename__ = "rollup_checkpoint"
+    
+    name = db.Column(db.String(32), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
 
 
 class SystemLog(db.Model):
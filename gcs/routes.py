@@ -1,15 +1,93 @@
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+import queue
+
+from flask import Blueprint, Response, abort, current_app, request, jsonify, render_template, send_file
+
+from .middleware import api_key_required, cors_headers, decode_content_encoding, etag_cached, compress_response
+from .services.data_handler import (
+    SENSOR_FIELDS, ingest_sensor_batch, build_sensor_record, ingest_ndjson_stream,
+    persist_records, validate_sensor_payload, serialize_sensor,
+)
+from .services.image_store import (
+    decode_b64_image, get_image_url, forget_latest, archive_url_for, archive_index, clear_archive,
+    read_archive, latest_archive_url, latest_image_path, image_id, is_packed, ARCHIVE_URL_PREFIX,
+    PACK_URL_PREFIX,
+)
+from .services.latest_frames import MJPEG_BOUNDARY, mjpeg_stream
+from .services.sensor_frames import SENSOR_FRAME_MIMETYPE, decode_frames
+from .services.thumbnails import THUMB_URL_PREFIX, existing_thumb_url, remove_thumbnail
+from .services.target_ingest import (
+    parse_ts, store_target_image_stream, buffer_latest_frame,
+    normalize_detections, build_detection_records, publish_detections,
+)
+from .services import rollups
+from .services.downsample import METHODS as DOWNSAMPLE_METHODS, sensor_series
+from .services.keyset import keyset_page
+from .services.http_cache import IMMUTABLE_CACHE_CONTROL, bump_generation
+from .services.logger import log_request, log_error, push_sensor_update, push_sensor_batch
+from . import throughput_meter, recent_detections, ingest_queue, image_writer, thumbnailer, latest_frames, rollup_compactor, table_stats
 
-from flask import Blueprint, request, jsonify, render_template
+bp = Blueprint("routes", __name__)
 
-from .middleware import api_key_required, cors_headers
-from .services.data_handler import ingest_sensor_json, ingest_target_json
-from .services.image_store import ensure_targets_dir, save_image_bytes, decode_b64_image, parse_details, get_image_url, archive_image_bytes
-from .services.logger import log_request, log_error, push_sensor_update, push_target_detected
-from . import throughput_meter, recent_detections
 
-bp = Blueprint("routes", __name__)
+def _latest_sensor_id():
+    from .models import SensorData
+    from . import db
+    return db.session.query(db.func.max(SensorData.id)).scalar()
+
+
+def _latest_target_id():
+    from .models import TargetDetection
+    from . import db
+    return db.session.query(db.func.max(TargetDetection.id)).scalar()
+
+
+def _recent_detections_version():
+    return (recent_detections.version, _latest_target_id())
+
+
+def _rollup_version():
+    return rollups.checkpoint_id()
+
+
+def _table_stats_version():
+    return table_stats.version
+
+
+def _archive_version():
+    return archive_index.version
+
+
+RAW_IMAGE_MIMETYPES = ("image/jpeg", "image/png", "application/octet-stream")
+
+
+def _ts_arg(name):
+    """Query arg as a naive UTC datetime; accepts epoch seconds or ISO 8601 (naive means UTC)."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromtimestamp(float(value), timezone.utc).replace(tzinfo=None)
+    except (ValueError, OverflowError, OSError):
+        ts = parse_ts(value)
+        if ts is None:
+            raise ValueError(f"Invalid '{name}' timestamp")
+        return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def _raw_meta(name, header):
+    """Detection metadata for raw image uploads: query parameter first, then header."""
+    return request.args.get(name) or request.headers.get(header)
+
+
+def _request_bytes():
+    """(wire bytes, decoded bytes) of the current request body for ThroughputMeter."""
+    # Compressed bodies were measured while decode_content_encoding inflated them
+    decoded = getattr(request, "decoded_bytes", None)
+    if decoded is None:
+        decoded = request.content_length or len(request.get_data(cache=True) or b"")
+    return getattr(request, "wire_bytes", decoded), decoded
+
 
 @bp.route("/")
 def index():
@@ -47,7 +125,7 @@ def latest_sensor():
     latest = SensorData.query.order_by(SensorData.ts.desc()).first()
     if latest:
         return jsonify({
-            "ts": latest.ts.isoformat(),
+            "ts": latest.ts,
             "co_ppm": latest.co_ppm,
             "no2_ppm": latest.no2_ppm,
             "nh3_ppm": latest.nh3_ppm,
@@ -60,10 +138,14 @@ def latest_sensor():
     return jsonify(None)
 
 @bp.route("/api/sensor-history")
+@compress_response
+@etag_cached(_latest_sensor_id)
 def sensor_history():
     """Get historical sensor data for graphs (chronological order)"""
     from .models import SensorData
     from sqlalchemy import select
+    if any(name in request.args for name in ("from", "to", "max_points")):
+        return _sensor_history_range()
     limit = request.args.get('limit', 100, type=int)
     
     # Limit to reasonable values
@@ -76,7 +158,7 @@ def sensor_history():
     records = SensorData.query.filter(SensorData.id.in_(subquery)).order_by(SensorData.ts.asc()).all()
     
     return jsonify([{
-        "ts": record.ts.isoformat(),
+        "ts": record.ts,
         "co_ppm": record.co_ppm,
         "no2_ppm": record.no2_ppm,
         "nh3_ppm": record.nh3_ppm,
@@ -87,6 +169,59 @@ def sensor_history():
         "source": record.source
     } for record in records])
 
+def _sensor_history_range():
+    """Every reading in [from, to), downsampled per field to at most max_points"""
+    from .models import SensorData
+    from . import db
+    from sqlalchemy import select
+    try:
+        start, end = _ts_arg("from"), _ts_arg("to")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    max_points = min(max(request.args.get("max_points", 1000, type=int), 3), 5000)
+    method = request.args.get("method", "lttb")
+    if method not in DOWNSAMPLE_METHODS:
+        return jsonify({"error": f"method must be one of {list(DOWNSAMPLE_METHODS)}"}), 400
+
+    # Plain column tuples: no ORM objects for what can be hours of readings
+    query = select(SensorData.ts, *[getattr(SensorData, field) for field in SENSOR_FIELDS]).where(
+        SensorData.ts.is_not(None)
+    )
+    if start is not None:
+        query = query.where(SensorData.ts >= start)
+    if end is not None:
+        query = query.where(SensorData.ts < end)
+    rows = db.session.execute(query.order_by(SensorData.ts.asc())).all()
+    ts, *columns = zip(*rows) if rows else ((),) * (len(SENSOR_FIELDS) + 1)
+
+    return jsonify({
+        "from": start,
+        "to": end,
+        "rows": len(rows),
+        "max_points": max_points,
+        "method": method,
+        "series": sensor_series(ts, dict(zip(SENSOR_FIELDS, columns)), max_points, method),
+    })
+
+@bp.route("/api/sensor-rollups")
+@compress_response
+@etag_cached(_rollup_version)
+def sensor_rollups():
+    """Per-bucket min/max/mean/count of every sensor field (10 s, 1 min or 10 min buckets)"""
+    resolution = request.args.get("resolution", 60, type=int)
+    if resolution not in rollups.RESOLUTIONS:
+        return jsonify({"error": f"resolution must be one of {list(rollups.RESOLUTIONS)}"}), 400
+    try:
+        start, end = _ts_arg("from"), _ts_arg("to")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = min(max(request.args.get("limit", 500, type=int), 1), 5000)
+
+    return jsonify({
+        "resolution": resolution,
+        "buckets": rollups.rollup_series(resolution, start, end, limit),
+    })
+
 @bp.route("/api/recent-targets")
 def recent_targets():
     """Get recent target detections for dashboard initialization"""
@@ -94,13 +229,15 @@ def recent_targets():
     recent = TargetDetection.query.order_by(TargetDetection.ts.desc()).limit(20).all()
     # Filter out "livedata" type (not a real detection)
     return jsonify([{
-        "ts": target.ts.isoformat(),
+        "ts": target.ts,
         "target_type": target.target_type,
         "details": target.details_json,
         "image_url": target.image_url
     } for target in recent if target.target_type != "livedata"])
 
 @bp.route("/api/recent-detections")
+@compress_response
+@etag_cached(_recent_detections_version)
 def api_recent_detections():
     """Get recent detections with archive and de-duplication logic"""
     limit = request.args.get("limit", 40, type=int)
@@ -110,19 +247,19 @@ def api_recent_detections():
     
     # If no detections in memory, fall back to database
     if not detections:
-        from .models import TargetDetection
+        from .models import TargetDetection, not_livedata
         # Get the most recent records and reverse them to show earliest to latest
         # Filter out "livedata" type (not a real detection)
         recent = TargetDetection.query.filter(
-            TargetDetection.target_type != "livedata"
+            not_livedata()
         ).order_by(TargetDetection.ts.desc()).limit(limit).all()
         recent.reverse()  # Reverse to show earliest to latest
         detections = [{
             "ts": target.ts.timestamp(),  # Convert to epoch seconds for consistency
             "type": target.target_type,
             "details": target.details_json or {},
-            "image_url": target.image_url or "/static/targets/latest.jpg",
-            "thumb_url": target.image_url or "/static/targets/latest.jpg"
+            "image_url": target.image_url or get_image_url(),
+            "thumb_url": existing_thumb_url(target.image_url) or target.image_url or get_image_url()
         } for target in recent]
     
     return jsonify(detections)
@@ -132,66 +269,218 @@ def database_viewer():
     """Database viewer page"""
     return render_template("database_viewer.html")
 
+def _sensor_row(record):
+    return {
+        "id": record.id,
+        "ts": record.ts,
+        "co_ppm": record.co_ppm,
+        "no2_ppm": record.no2_ppm,
+        "nh3_ppm": record.nh3_ppm,
+        "light_lux": record.light_lux,
+        "temp_c": record.temp_c,
+        "pressure_hpa": record.pressure_hpa,
+        "humidity_pct": record.humidity_pct,
+        "source": record.source
+    }
+
+
+def _target_row(record):
+    return {
+        "id": record.id,
+        "ts": record.ts,
+        "target_type": record.target_type,
+        "details": record.details_json,
+        "image_url": record.image_url,
+        "image_status": record.image_status
+    }
+
+
+def _paged_response(query, model, serialize):
+    """Keyset page when a ``cursor`` arg is present (empty = newest page), else offset page"""
+    per_page = request.args.get('per_page', 50, type=int)
+    if 'cursor' not in request.args:
+        page = request.args.get('page', 1, type=int)
+        paged = query.order_by(model.ts.desc()).paginate(page=page, per_page=per_page, error_out=False)
+        return jsonify({
+            "data": [serialize(record) for record in paged.items],
+            "total": paged.total,
+            "pages": paged.pages,
+            "current_page": paged.page,
+            "per_page": paged.per_page
+        })
+
+    per_page = min(max(per_page, 1), 1000)
+    try:
+        rows, next_cursor, prev_cursor = keyset_page(
+            query, model.ts, model.id, request.args['cursor'], per_page
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    body = {
+        "data": [serialize(record) for record in rows],
+        "next": next_cursor,
+        "prev": prev_cursor,
+        "per_page": per_page
+    }
+    # The exact total costs a COUNT(*) over the table, so it is opt-in
+    if request.args.get('total', type=int):
+        body["total"] = query.order_by(None).count()
+    return jsonify(body)
+
+
 @bp.route("/api/sensor-data")
+@compress_response
+@etag_cached(_latest_sensor_id)
 def api_sensor_data():
     """Get all sensor data for database viewer"""
     from .models import SensorData
-    from flask import request
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
-    
-    sensor_data = SensorData.query.order_by(SensorData.ts.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return jsonify({
-        "data": [{
-            "id": record.id,
-            "ts": record.ts.isoformat(),
-            "co_ppm": record.co_ppm,
-            "no2_ppm": record.no2_ppm,
-            "nh3_ppm": record.nh3_ppm,
-            "light_lux": record.light_lux,
-            "temp_c": record.temp_c,
-            "pressure_hpa": record.pressure_hpa,
-            "humidity_pct": record.humidity_pct,
-            "source": record.source
-        } for record in sensor_data.items],
-        "total": sensor_data.total,
-        "pages": sensor_data.pages,
-        "current_page": sensor_data.page,
-        "per_page": sensor_data.per_page
-    })
+    return _paged_response(SensorData.query, SensorData, _sensor_row)
 
 @bp.route("/api/target-data")
+@compress_response
+@etag_cached(_latest_target_id)
 def api_target_data():
     """Get all target detection data for database viewer"""
-    from .models import TargetDetection
-    from flask import request
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
-    
+    from .models import TargetDetection, not_livedata
     # Filter out "livedata" type (not a real detection)
-    target_data = TargetDetection.query.filter(
-        TargetDetection.target_type != "livedata"
-    ).order_by(TargetDetection.ts.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
+    return _paged_response(TargetDetection.query.filter(not_livedata()), TargetDetection, _target_row)
+
+@bp.route("/api/stats")
+@etag_cached(_table_stats_version)
+def api_stats():
+    """Row counts and ts ranges per table and per target type, from memory"""
+    return jsonify(table_stats.snapshot())
+
+@bp.route("/api/archive")
+@compress_response
+@etag_cached(_archive_version)
+def api_archive():
+    """List archived target images from the archive index (newest first)"""
+    def _epoch(name):
+        ts = _ts_arg(name)
+        return None if ts is None else ts.replace(tzinfo=timezone.utc).timestamp()
+
+    try:
+        start, end = _epoch("from"), _epoch("to")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = min(max(request.args.get("limit", 100, type=int), 1), 1000)
+
+    entries = archive_index.entries(start=start, end=end, limit=limit)
     return jsonify({
-        "data": [{
-            "id": record.id,
-            "ts": record.ts.isoformat(),
-            "target_type": record.target_type,
-            "details": record.details_json,
-            "image_url": record.image_url
-        } for record in target_data.items],
-        "total": target_data.total,
-        "pages": target_data.pages,
-        "current_page": target_data.page,
-        "per_page": target_data.per_page
+        "images": [{
+            "id": entry["id"],
+            "url": entry["url"],
+            "thumb_url": existing_thumb_url(entry["url"]),
+            "size": entry["size"],
+            "ts": entry["ts"]
+        } for entry in entries],
+        "count": archive_index.count(start=start, end=end)
     })
 
+ARCHIVE_MIMETYPES = {".jpg": "image/jpeg", ".png": "image/png", ".gif": "image/gif"}
+IMMUTABLE_IMAGE_PREFIXES = (ARCHIVE_URL_PREFIX, THUMB_URL_PREFIX, PACK_URL_PREFIX)
+
+
+@bp.after_app_request
+def _immutable_image_cache(response):
+    """Archive frames and thumbnails are content-addressed, so browsers may keep them forever"""
+    if (response.status_code in (200, 304) and request.path.startswith(IMMUTABLE_IMAGE_PREFIXES)
+            and request.path.endswith(tuple(ARCHIVE_MIMETYPES))):
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+@bp.route("/archive/<image_name>")
+def archive_image(image_name):
+    """Serve a frame from a pack segment (offset + length from the archive index)"""
+    stem, dot, ext = image_name.rpartition(".")
+    entry = archive_index.get(stem) if dot else None
+    if entry is None or "pack" not in entry:
+        abort(404)
+    response = Response(read_archive(entry["url"]),
+                        mimetype=ARCHIVE_MIMETYPES.get("." + ext, "application/octet-stream"))
+    response.set_etag(stem)
+    return response.make_conditional(request)
+
+
+def _frame_response(frame):
+    response = Response(frame.data, mimetype=frame.mimetype)
+    response.set_etag(frame.etag)
+    response.last_modified = datetime.fromtimestamp(frame.ts, timezone.utc)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Device-Id"] = frame.device_id
+    return response.make_conditional(request)
+
+
+@bp.route("/frames/latest.jpg", defaults={"device_id": None})
+@bp.route("/frames/<device_id>/latest.jpg")
+def latest_frame(device_id):
+    """
+    GET /frames/latest.jpg (newest frame of any device) or /frames/<device_id>/latest.jpg
+    Served from memory. With ?wait=N the request blocks (up to N seconds) until a frame
+    other than the one named by If-None-Match (or ?etag=) arrives; 304 if none did.
+    """
+    wait = request.args.get("wait", type=float)
+    if wait:
+        known = request.args.get("etag") or next(iter(request.if_none_match.as_set()), None)
+        wait = min(max(wait, 0.0), float(current_app.config.get("FRAME_LONG_POLL_MAX_S", 30)))
+        frame = latest_frames.wait_newer(device_id, known, wait)
+    else:
+        frame = latest_frames.get(device_id)
+    if frame is None:
+        abort(404)
+    return _frame_response(frame)
+
+
+@bp.route("/frames/live.mjpeg", defaults={"device_id": None})
+@bp.route("/frames/<device_id>/live.mjpeg")
+def live_mjpeg(device_id):
+    """
+    GET /frames/live.mjpeg (all devices) or /frames/<device_id>/live.mjpeg
+    multipart/x-mixed-replace stream of frames as they arrive; usable as an <img> src.
+    Each viewer drops frames on its own when it falls behind.
+    """
+    if not latest_frames.open_viewer(current_app.config.get("MJPEG_MAX_CLIENTS", 8)):
+        return jsonify({"error": "Too many live stream viewers"}), 503
+    parts = mjpeg_stream(latest_frames, device_id, max_lag=current_app.config.get("MJPEG_MAX_LAG", 2))
+    response = Response(parts, mimetype=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}")
+    response.call_on_close(latest_frames.close_viewer)
+    response.headers["Cache-Control"] = "no-cache, no-store"
+    response.headers["X-Accel-Buffering"] = "no"  # keep reverse proxies from buffering the stream
+    return response
+
+
+@bp.route("/api/frames")
+def api_frames():
+    """Devices with a frame in the live buffer (newest first)"""
+    return jsonify({"devices": latest_frames.devices(), **latest_frames.stats()})
+
+
+@bp.route("/targets/latest.jpg")
+def latest_image():
+    """Newest target frame; ETag/Last-Modified let unchanged polls end in a bodiless 304"""
+    frame = latest_frames.get()
+    if frame is not None:
+        return _frame_response(frame)
+    # The content hash of the archived frame is a free strong validator
+    current = latest_archive_url()
+    if current and is_packed(current):
+        # The pack backend keeps no latest.jpg; read the frame from its segment
+        response = Response(read_archive(current),
+                            mimetype=ARCHIVE_MIMETYPES.get("." + current.rpartition(".")[2], "image/jpeg"))
+        response.set_etag(image_id(current))
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+    # Nothing received since start-up: fall back to the file on disk
+    path = latest_image_path()
+    if not path.exists():
+        abort(404)
+    response = send_file(path.resolve(), mimetype="image/jpeg", conditional=True,
+                         etag=image_id(current) if current else True, max_age=0)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
 @bp.route("/health")
 def health():
     """Health check endpoint for monitoring"""
@@ -206,61 +495,199 @@ def api_throughput():
     from . import throughput_meter
     return jsonify(throughput_meter.snapshot())
 
+@bp.route("/api/telemetry/ingest-queue")
+def api_ingest_queue():
+    """Write-behind queue depth and commit progress"""
+    stats = ingest_queue.stats()
+    stats["image_writer"] = image_writer.stats()
+    stats["thumbnails"] = thumbnailer.stats()
+    stats["rollups"] = rollup_compactor.stats()
+    return jsonify(stats)
+
+def _ingest_sensor_frames():
+    """Store binary sensor frames posted to /api/sensors (see services/sensor_frames.py)."""
+    body = request.get_data(cache=False)
+    throughput_meter.add("AQSA", getattr(request, "wire_bytes", len(body)), len(body))
+    
+    source = request.headers.get("X-Sensor-Source") or request.args.get("source") or "payload"
+    try:
+        payloads = decode_frames(body, source=source)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    max_items = current_app.config.get("SENSOR_BATCH_MAX", 1000)
+    if len(payloads) > max_items:
+        return jsonify({"error": f"Batch too large: at most {max_items} readings allowed"}), 413
+    
+    errors = []
+    for index, payload in enumerate(payloads):
+        error = validate_sensor_payload(payload)
+        if error:
+            errors.append({"index": index, "error": error})
+    if errors:
+        return jsonify({"error": "Invalid sensor frames", "errors": errors}), 400
+    
+    records = [build_sensor_record(payload) for payload in payloads]
+    record_dicts = [serialize_sensor(rec) for rec in records]
+    try:
+        seqs = persist_records(records)
+    except queue.Full:
+        return jsonify({"error": "Ingest queue full, retry later"}), 503
+    
+    status_code = 202 if seqs else 201
+    log_request(request, status_code)
+    
+    if len(record_dicts) == 1:
+        push_sensor_update(record_dicts[0])
+    else:
+        push_sensor_batch(record_dicts)
+    
+    if seqs:
+        return jsonify({"status": "queued", "saved": len(records), "seq": seqs}), 202
+    return jsonify({"status": "ok", "saved": len(records), "ids": [rec.id for rec in records]}), 201
+
 @bp.route("/api/sensors", methods=["POST"])
 @api_key_required
 @cors_headers
+@decode_content_encoding
 def api_sensors():
     try:
+        # Compact binary frames (one or many per body)
+        if request.mimetype == SENSOR_FRAME_MIMETYPE:
+            return _ingest_sensor_frames()
+        
         # Validate JSON content type
         if not request.is_json:
             return jsonify({"error": "Content-Type must be application/json"}), 400
         
         # Measure payload size for AQSA
-        nbytes = request.content_length or len(request.get_data(cache=True) or b"")
-        throughput_meter.add("AQSA", nbytes)
+        throughput_meter.add("AQSA", *_request_bytes())
         
         data = request.get_json(silent=False)
         if data is None:
             return jsonify({"error": "Invalid JSON payload"}), 400
         
-        # Validate required fields (at least one sensor reading)
-        sensor_fields = ["co_ppm", "no2_ppm", "nh3_ppm", "light_lux", "temp_c", "pressure_hpa", "humidity_pct"]
-        if not any(field in data for field in sensor_fields):
-            return jsonify({"error": "At least one sensor reading is required"}), 400
+        error = validate_sensor_payload(data)
+        if error:
+            return jsonify({"error": error}), 400
         
-        # Validate data types
-        for field in sensor_fields:
-            if field in data and data[field] is not None:
-                try:
-                    float(data[field])
-                except (ValueError, TypeError):
-                    return jsonify({"error": f"Invalid value for {field}: must be numeric"}), 400
+        # Serialize before persisting: with write-behind the writer owns the row once queued
+        rec = build_sensor_record(data)
+        record = serialize_sensor(rec)
+        try:
+            seqs = persist_records([rec])
+        except queue.Full:
+            return jsonify({"error": "Ingest queue full, retry later"}), 503
         
-        rec = ingest_sensor_json(data)
-        log_request(request, 201)
+        status_code = 202 if seqs else 201
+        log_request(request, status_code)
         
         # Emit sensor update via Socket.IO
-        push_sensor_update({
-            "ts": rec.ts.isoformat(),
-            "co_ppm": rec.co_ppm,
-            "no2_ppm": rec.no2_ppm,
-            "nh3_ppm": rec.nh3_ppm,
-            "light_lux": rec.light_lux,
-            "temp_c": rec.temp_c,
-            "pressure_hpa": rec.pressure_hpa,
-            "humidity_pct": rec.humidity_pct,
-            "source": rec.source
-        })
+        push_sensor_update(record)
         
+        if seqs:
+            return jsonify({"status": "queued", "seq": seqs[0]}), 202
         return jsonify({"status": "ok", "id": rec.id}), 201
         
     except Exception as e:
         log_error(f"Sensor API error: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@bp.route("/api/sensors/batch", methods=["POST"])
+@api_key_required
+@cors_headers
+@decode_content_encoding
+def api_sensors_batch():
+    """
+    POST /api/sensors/batch
+    Accepts a JSON array of sensor readings (or {"readings": [...]}), e.g. when the
+    AQSA payload catches up after a link dropout. The whole batch is validated first
+    and stored in a single transaction; one coalesced sensor_update is emitted.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Content-Type must be application/json"}), 400
+        
+        throughput_meter.add("AQSA", *_request_bytes())
+        
+        data = request.get_json(silent=False)
+        if isinstance(data, dict):
+            data = data.get("readings")
+        if not isinstance(data, list):
+            return jsonify({"error": "Payload must be an array of sensor readings"}), 400
+        if not data:
+            return jsonify({"error": "At least one sensor reading is required"}), 400
+        
+        max_items = current_app.config.get("SENSOR_BATCH_MAX", 1000)
+        if len(data) > max_items:
+            return jsonify({"error": f"Batch too large: at most {max_items} readings allowed"}), 413
+        
+        # Validate everything before touching the database (all-or-nothing)
+        errors = []
+        for index, item in enumerate(data):
+            error = validate_sensor_payload(item)
+            if error:
+                errors.append({"index": index, "error": error})
+        if errors:
+            return jsonify({"error": "Invalid sensor readings", "errors": errors}), 400
+        
+        records = ingest_sensor_batch(data)
+        log_request(request, 201)
+        
+        push_sensor_batch([serialize_sensor(rec) for rec in records])
+        
+        return jsonify({"status": "ok", "saved": len(records), "ids": [rec.id for rec in records]}), 201
+        
+    except Exception as e:
+        log_error(f"Sensor batch API error: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@bp.route("/api/ingest/ndjson", methods=["POST"])
+@api_key_required
+@cors_headers
+@decode_content_encoding
+def api_ingest_ndjson():
+    """
+    POST /api/ingest/ndjson
+    Bulk upload of post-flight logs as newline-delimited JSON (application/x-ndjson).
+    Each line is a sensor reading or a target detection (records with `target_type`).
+    The body is parsed line by line from the request stream and committed in chunks;
+    invalid lines are skipped and reported in the summary. No socket events are emitted.
+    """
+    try:
+        mimetype = request.mimetype or ""
+        if mimetype not in ("application/x-ndjson", "application/jsonl"):
+            return jsonify({"error": "Content-Type must be application/x-ndjson"}), 400
+        
+        summary = ingest_ndjson_stream(
+            request.stream,
+            chunk_size=current_app.config.get("NDJSON_CHUNK_SIZE", 500),
+        )
+        # Split wire bytes across streams in proportion to the decoded bytes of each
+        decoded_total = summary["bytes"]["AQSA"] + summary["bytes"]["TAIP"]
+        ratio = getattr(request, "wire_bytes", decoded_total) / decoded_total if decoded_total else 1.0
+        for stream, decoded in summary["bytes"].items():
+            throughput_meter.add(stream, int(decoded * ratio), decoded)
+        
+        stored = summary["sensors"] + summary["targets"]
+        status_code = 201 if stored else 400
+        log_request(request, status_code)
+        return jsonify({
+            "status": "ok" if stored else "error",
+            "lines": summary["lines"],
+            "saved": {"sensors": summary["sensors"], "targets": summary["targets"]},
+            "error_count": summary["error_count"],
+            "errors": summary["errors"]
+        }), status_code
+        
+    except Exception as e:
+        log_error(f"NDJSON ingest API error: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @bp.route("/api/targets", methods=["POST"])
 @api_key_required
 @cors_headers
+@decode_content_encoding
 def api_targets():
     """
     POST /api/targets
@@ -275,6 +702,10 @@ def api_targets():
           image_b64: data URL OR raw base64
           details: object OR array of detection items
           ts, device_id: optional
+      - image/jpeg, image/png or application/octet-stream (raw frame, no base64):
+          body: the image bytes, streamed straight to the archive
+          target_type, details, ts, device_id, confidence: query parameters
+          or X-Target-Type, X-Details, X-Timestamp, X-Device-Id, X-Confidence headers
 
     Behavior:
       - Saves/archives image ONCE, reuses same URLs for all detection rows
@@ -283,9 +714,10 @@ def api_targets():
       - Responds with batch summary
     """
     try:
-        # 1) TAIP metering
-        nbytes = request.content_length or len(request.get_data(cache=True) or b"")
-        throughput_meter.add("TAIP", nbytes)
+        # 1) TAIP metering (raw uploads are metered as they stream to disk)
+        raw_upload = request.mimetype in RAW_IMAGE_MIMETYPES
+        if not raw_upload:
+            throughput_meter.add("TAIP", *_request_bytes())
 
         # 2) Defaults
         server_ts = datetime.utcnow()
@@ -293,6 +725,7 @@ def api_targets():
         archived_url = None
         thumb_url = None
         device_id = None
+        pending_image = None  # decoded bytes for the image writer
 
         raw_details = None
         top_ts = None
@@ -307,24 +740,16 @@ def api_targets():
                 return jsonify({"error": "File must be JPEG or PNG"}), 400
 
             device_id = request.form.get("device_id")
-            top_ts_str = request.form.get("ts")
-            if top_ts_str:
-                try:
-                    top_ts = datetime.fromisoformat(top_ts_str.replace("Z", "+00:00"))
-                except Exception:
-                    top_ts = None
+            top_ts = parse_ts(request.form.get("ts"))
 
             # details can be a JSON object or JSON array (string)
             raw_details = request.form.get("details")
+            legacy_target_type = request.form.get("target_type")
+            legacy_confidence = request.form.get("confidence")
 
-            # save/archive image once
-            img_bytes = file.read()
-            save_image_bytes(img_bytes, "latest.jpg")
-            archived_url = archive_image_bytes(img_bytes, request.form.get("target_type") or "batch")
-            # If your archiver also creates a thumb, expose it (optional)
-            if isinstance(archived_url, dict):
-                thumb_url = archived_url.get("thumb_url")
-                archived_url = archived_url.get("image_url")
+            # archive URL is assigned now; the image writer stores the file after the commit
+            pending_image = file.read()
+            archived_url = archive_url_for(pending_image)
 
         elif request.is_json:
             data = request.get_json(silent=False)
@@ -332,14 +757,11 @@ def api_targets():
                 return jsonify({"error": "Invalid JSON payload"}), 400
 
             device_id = data.get("device_id")
-            top_ts_str = data.get("ts")
-            if top_ts_str:
-                try:
-                    top_ts = datetime.fromisoformat(top_ts_str.replace("Z", "+00:00"))
-                except Exception:
-                    top_ts = None
+            top_ts = parse_ts(data.get("ts"))
 
             raw_details = data.get("details")
+            legacy_target_type = data.get("target_type")
+            legacy_confidence = data.get("confidence")
             if "image_b64" not in data:
                 # allow image-less event (e.g., livedata heartbeat), but still need details
                 if raw_details is None:
@@ -347,182 +769,89 @@ def api_targets():
                 img_bytes = None
             else:
                 try:
-                    img_bytes = decode_b64_image(data["image_b64"])
+                    img_bytes = decode_b64_image(
+                        data["image_b64"], current_app.config.get("MAX_IMAGE_BYTES", 16 * 1024 * 1024)
+                    )
                 except ValueError as e:
                     return jsonify({"error": str(e)}), 400
 
             if img_bytes:
-                save_image_bytes(img_bytes, "latest.jpg")
-                archived_url = archive_image_bytes(img_bytes, data.get("target_type") or "batch")
-                if isinstance(archived_url, dict):
-                    thumb_url = archived_url.get("thumb_url")
-                    archived_url = archived_url.get("image_url")
+                pending_image = img_bytes
+                archived_url = archive_url_for(pending_image)
+        elif raw_upload:
+            device_id = _raw_meta("device_id", "X-Device-Id")
+            top_ts = parse_ts(_raw_meta("ts", "X-Timestamp"))
+            raw_details = _raw_meta("details", "X-Details")
+            legacy_target_type = _raw_meta("target_type", "X-Target-Type")
+            legacy_confidence = _raw_meta("confidence", "X-Confidence")
+            if raw_details is None and not legacy_target_type:
+                return jsonify({"error": "target_type or details required"}), 400
+
+            try:
+                archived_url, thumb_url, streamed_image = store_target_image_stream(
+                    request.stream,
+                    current_app.config.get("MAX_IMAGE_BYTES", 16 * 1024 * 1024),
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            nbytes = len(streamed_image)
+            throughput_meter.add("TAIP", getattr(request, "wire_bytes", nbytes), nbytes)
         else:
-            return jsonify({"error": "Content-Type must be multipart/form-data or application/json"}), 400
+            return jsonify({
+                "error": "Content-Type must be multipart/form-data, application/json or image/jpeg"
+            }), 400
 
         # 4) Normalize `details` to a Python list of detection items
-        def _to_list(obj):
-            if obj is None:
-                return []
-            if isinstance(obj, list):
-                return obj
-            if isinstance(obj, dict):
-                # Check if this dict has the batch detection schema (target_type + details fields)
-                # If not, it's probably just a details object from the old API
-                if "target_type" in obj and "details" in obj:
-                    return [obj]  # This is a single detection item
-                else:
-                    return []  # This is just a details dict, not a detection item
-            if isinstance(obj, str):
-                # stringified JSON -> parse then recurse
-                try:
-                    parsed = json.loads(obj)
-                except Exception:
-                    return []
-                return _to_list(parsed)
-            return []
-
-        detections = _to_list(raw_details)
-
-        # Back-compat: if client sent only top-level `target_type/details` style (single detection)
-        # Check if we have a top-level target_type field
-        legacy_target_type = (request.form.get("target_type") if request.form else None) or \
-                             (request.json.get("target_type") if request.is_json else None)
-        legacy_confidence = (request.form.get("confidence") if request.form else None) or \
-                           (request.json.get("confidence") if request.is_json else None)
-        
-        if not detections and legacy_target_type:
-            # Old-style API: target_type at top level, details is just the details object
-            legacy_details = parse_details(raw_details if raw_details is not None else {})
-            
-            # Add top-level confidence to details if present
-            if legacy_confidence is not None:
-                legacy_details["confidence"] = float(legacy_confidence)
-            
-            detections = [{
-                "target_type": legacy_target_type,
-                "details": legacy_details
-            }]
-        elif not detections and raw_details is not None:
-            # Have details but no target_type - use "unknown"
-            legacy_details = parse_details(raw_details)
-            # Accept even empty details
-            detections = [{
-                "target_type": "unknown",
-                "details": legacy_details
-            }]
-
+        # (back-compat: top-level `target_type/details` style is a single detection)
+        detections = normalize_detections(raw_details, legacy_target_type, legacy_confidence)
         if not detections:
             return jsonify({"error": "No detections found in 'details'"}), 400
 
         # 5) Persist each detection as a row
-        from .models import TargetDetection
-        from . import db
-        saved = []
-        created = 0
-
         # fallback image URL fields
         final_image_url = archived_url or image_url_latest
         final_thumb_url = thumb_url
 
-        for det in detections:
-            # Validate/normalize one item
-            if not isinstance(det, dict):
-                continue
-            target_type = det.get("target_type") or "unknown"
-            details_obj = parse_details(det.get("details", {}))
-            
-            # Merge top-level confidence into details if present
-            if "confidence" in det:
-                details_obj["confidence"] = det["confidence"]
-            
-            det_ts = det.get("ts")
-            try:
-                ts = datetime.fromisoformat(det_ts.replace("Z", "+00:00")) if det_ts else (top_ts or server_ts)
-            except Exception:
-                ts = top_ts or server_ts
-
-            rec = TargetDetection(
-                ts=ts,
-                target_type=target_type,
-                details_json=details_obj,
-                image_url=final_image_url
-            )
-            db.session.add(rec)
-            saved.append({
-                "target_type": target_type,
-                "ts": ts.isoformat(),
-                "details": details_obj
-            })
-            created += 1
-
-        db.session.commit()
-        log_request(request, 201)
+        records, saved = build_detection_records(detections, final_image_url, top_ts, server_ts)
+        created = len(records)
 
-        # 6) Broadcast per detection & feed "recent_detections"
-        accepted_detections = []
-        is_batch = (created > 1)  # Flag to suppress individual socket events for batches
-        
-        for s in saved:
-            # Still call push_target_detected for logging, but skip socket emission for batches
-            # We'll emit a batch event instead
-            if not is_batch:
-                push_target_detected({
-                    "ts": s["ts"],
-                    "target_type": s["target_type"],
-                    "details": s["details"],
-                    "image_url": final_image_url,
-                    "thumb_url": final_thumb_url,
-                    "device_id": device_id
-                })
-            try:
-                # Use server timestamp seconds for de-dupe windowing
-                accepted = recent_detections.consider(
-                    s["target_type"],
-                    s["details"],
-                    final_image_url,
-                    server_ts=server_ts.timestamp(),
-                )
-                if accepted:
-                    accepted_detections.append({
-                        "ts": accepted.ts,
-                        "type": accepted.type,
-                        "details": accepted.details,
-                        "image_url": accepted.image_url,
-                        "thumb_url": accepted.thumb_url
-                    })
-            except Exception:
-                # non-fatal
-                pass
-
-        # Emit events based on ORIGINAL detection count (not filtered count)
-        # This prevents flickering when multiple detections arrive together
+        # Write-behind mode hands rows to the group-commit writer and answers 202
         try:
-            from . import socketio
-            if created == 1 and len(accepted_detections) == 1:
-                # Single detection - emit individual event
-                socketio.emit("recent_detection", accepted_detections[0], namespace="/stream")
-            elif created > 1 and len(accepted_detections) > 0:
-                # Multiple detections sent together - always emit batch event
-                # Even if some were filtered by deduplication
-                socketio.emit("target_batch", {
-                    "count": len(accepted_detections),
-                    "image_url": final_image_url,
-                    "thumb_url": final_thumb_url,
-                    "device_id": device_id,
-                    "detections": accepted_detections
-                }, namespace="/stream")
-            # If all detections were filtered (len(accepted_detections) == 0), emit nothing
-        except Exception:
-            pass
+            seqs = persist_records(records)
+        except queue.Full:
+            return jsonify({"error": "Ingest queue full, retry later"}), 503
+        status_code = 202 if seqs is not None else 201
+        log_request(request, status_code)
+
+        # Live viewers get the frame from memory now; the archive write may still be queued
+        if pending_image is not None:
+            buffer_latest_frame(device_id, archived_url, pending_image)
+        elif raw_upload:
+            buffer_latest_frame(device_id, archived_url, streamed_image)
 
-        return jsonify({
+        # 6) Broadcast per detection & feed "recent_detections"
+        # (once the image is on disk, so dashboards never fetch a missing file)
+        def _publish():
+            publish_detections(saved, final_image_url, final_thumb_url, device_id, server_ts)
+            if archived_url:
+                thumbnailer.submit(archived_url)
+
+        if pending_image is not None:
+            image_writer.submit(archived_url, pending_image, on_done=_publish)
+        else:
+            _publish()
+
+        response = {
             "ok": True,
             "saved": created,
             "image_url": final_image_url,
             "thumb_url": final_thumb_url,
             "detections": saved
-        }), 201
+        }
+        if seqs is not None:
+            response["queued"] = True
+            response["seq"] = seqs
+        return jsonify(response), status_code
 
     except Exception as e:
         log_error(f"Target API error: {str(e)}")
@@ -567,32 +896,37 @@ def api_set_display_mode(device_id):
 def api_clear_history():
     """Clear all history including database records and stored images"""
     try:
-        import os
-        import shutil
-        from pathlib import Path
         from .models import SensorData, TargetDetection, SystemLog
         from . import db
         
+        # Let queued rows, images and thumbnails land first so they don't reappear after the clear
+        ingest_queue.flush()
+        image_writer.flush()
+        thumbnailer.flush()
+        
         # Clear database tables
-        TargetDetection.query.delete()
-        SensorData.query.delete()
-        SystemLog.query.delete()
-        db.session.commit()
-        
-        # Clear archived images
-        archive_dir = Path("gcs/static/targets/archive")
-        if archive_dir.exists():
-            for file in archive_dir.iterdir():
-                if file.is_file():
-                    file.unlink()
+        # Hold the compactor off so it can't fold rows that are about to vanish
+        with rollups.compact_lock:
+            TargetDetection.query.delete()
+            SensorData.query.delete()
+            SystemLog.query.delete()
+            rollups.clear()
+            db.session.commit()
+        
+        # Clear archived images and their thumbnails (driven by the archive index, no directory scans)
+        for entry in clear_archive():
+            remove_thumbnail(entry["url"])
         
         # Clear latest.jpg (optional - replace with placeholder or delete)
-        latest_jpg = Path("gcs/static/targets/latest.jpg")
+        latest_jpg = latest_image_path()
         if latest_jpg.exists():
             latest_jpg.unlink()
         
         # Clear in-memory services
+        forget_latest()
+        latest_frames.clear()
         recent_detections.clear()
+        bump_generation()
         throughput_meter.reset()
         
         log_request(request, 200)
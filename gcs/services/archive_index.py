@@ -0,0 +1,128 @@
+# gcs/services/archive_index.py
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger('uav_gcs')
+
+
+class ArchiveIndex:
+    """Append-only JSON-lines index of archived frames.
+
+    One line per image: ``{"id", "url", "size", "ts"}`` where ``id`` is the content hash,
+    plus ``pack``/``offset`` for frames stored in pack segments. The file is read once
+    (lazily) into a dict plus a ts-sorted list, so lookups, time range listings and
+    deletes never have to walk the archive directories. Lines that were cut short by a
+    crash are skipped on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._by_id: Optional[dict] = None
+        self._order: List[tuple] = []  # (ts, id), sorted by ts
+        self.version = 0  # bumped on every change; used for HTTP ETags
+
+    def _load(self):
+        if self._by_id is not None:
+            return
+        self._by_id = {}
+        self._order = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._insert(entry)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def _insert(self, entry: dict):
+        if entry["id"] in self._by_id:
+            return
+        self._by_id[entry["id"]] = entry
+        bisect.insort(self._order, (entry["ts"], entry["id"]))
+
+    def get(self, image_id: str) -> Optional[dict]:
+        with self._lock:
+            self._load()
+            return self._by_id.get(image_id)
+
+    def add(self, image_id: str, url: str, size: int, ts: Optional[float] = None, **extra) -> dict:
+        """Record an archived frame (no-op if ``image_id`` is already indexed)."""
+        with self._lock:
+            self._load()
+            existing = self._by_id.get(image_id)
+            if existing is not None:
+                return existing
+            entry = {"id": image_id, "url": url, "size": size, "ts": time.time() if ts is None else ts, **extra}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._insert(entry)
+            self.version += 1
+            return entry
+
+    def entries(self, start: Optional[float] = None, end: Optional[float] = None,
+                limit: Optional[int] = None, newest_first: bool = True) -> List[dict]:
+        """Indexed frames with ``start <= ts < end`` (epoch seconds), newest first by default."""
+        with self._lock:
+            self._load()
+            lo = 0 if start is None else bisect.bisect_left(self._order, (start,))
+            hi = len(self._order) if end is None else bisect.bisect_left(self._order, (end,))
+            window = self._order[lo:hi]
+            if newest_first:
+                window = window[::-1]
+            if limit is not None:
+                window = window[:limit]
+            return [self._by_id[image_id] for _, image_id in window]
+
+    def count(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        with self._lock:
+            self._load()
+            lo = 0 if start is None else bisect.bisect_left(self._order, (start,))
+            hi = len(self._order) if end is None else bisect.bisect_left(self._order, (end,))
+            return max(hi - lo, 0)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def clear(self) -> List[dict]:
+        """Forget every entry and truncate the file; returns the removed entries."""
+        with self._lock:
+            self._load()
+            removed = list(self._by_id.values())
+            self._by_id = {}
+            self._order = []
+            if self.path.exists():
+                open(self.path, "w").close()
+            self.version += 1
+            return removed
+
+    def reset(self):
+        """Drop the in-memory copy; the file is re-read on next use."""
+        with self._lock:
+            self._by_id = None
+            self._order = []
+            self.version += 1
+
+    def rebuild(self, entries: List[dict]):
+        """Replace the index with ``entries`` (e.g. after a one-off archive walk)."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            os.replace(tmp, self.path)
+            self._by_id = None
+            self._load()
+            self.version += 1
+        logger.info(f"Archive index rebuilt with {len(entries)} images")
@@ -0,0 +1,105 @@
+# gcs/services/content_encoding.py
+import zlib
+from tempfile import SpooledTemporaryFile
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_BYTES = 1024 * 1024  # decoded bodies larger than this spill to a temp file
+# zstd input fed per decompress() call; one input byte can expand to ~32 KiB at most, so
+# this caps a single call's output at a few MiB
+ZSTD_FEED_BYTES = 64
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class UnsupportedEncoding(Exception):
+    pass
+
+
+def supported_encodings() -> list:
+    encodings = ["gzip", "deflate"]
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def _decompressor(encoding: str):
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj()
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise UnsupportedEncoding(encoding)
+
+
+def decode_stream(src, encoding: str, max_bytes: int):
+    """Decompress ``src`` chunk by chunk into a spooled file, enforcing ``max_bytes``.
+
+    Concatenated gzip members and zstd frames (``cat a.gz b.gz``) decode one after the
+    other. Returns ``(file, wire_bytes, decoded_bytes)`` with the file rewound to the start.
+    Raises BodyTooLarge, UnsupportedEncoding, or ValueError for corrupt/truncated data.
+    """
+    encoding = encoding.strip().lower()
+    d = _decompressor(encoding)
+    is_zlib = encoding != "zstd"
+    multi = encoding != "deflate"
+    out = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    wire = 0
+    decoded = 0
+
+    def _write(data):
+        nonlocal decoded
+        decoded += len(data)
+        if decoded > max_bytes:
+            raise BodyTooLarge(f"Decoded body exceeds {max_bytes} bytes")
+        out.write(data)
+
+    def _inflate(buf):
+        nonlocal d
+        buf = memoryview(buf)
+        while buf:
+            if d.eof:
+                if not multi:
+                    raise ValueError(f"Trailing data after {encoding} body")
+                d = _decompressor(encoding)
+            if is_zlib:
+                # Bound each call's output so a small bomb can't allocate unbounded memory
+                _write(d.decompress(buf, CHUNK_SIZE))
+                buf = memoryview(d.unconsumed_tail)
+            else:
+                # zstd's decompress() has no output limit; feeding small slices bounds it
+                _write(d.decompress(buf[:ZSTD_FEED_BYTES]))
+                buf = buf[ZSTD_FEED_BYTES:]
+            if d.eof and d.unused_data:
+                # Start of the next member/frame (or trailing garbage)
+                buf = memoryview(d.unused_data + bytes(buf))
+
+    try:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            wire += len(chunk)
+            _inflate(chunk)
+        if is_zlib:
+            _write(d.flush())
+        if not d.eof:
+            raise ValueError(f"Truncated {encoding} body")
+    except zlib.error as e:
+        out.close()
+        raise ValueError(f"Invalid {encoding} body: {str(e)}")
+    except Exception as e:
+        out.close()
+        if zstandard is not None and isinstance(e, zstandard.ZstdError):
+            raise ValueError(f"Invalid {encoding} body: {str(e)}")
+        raise
+
+    out.seek(0)
+    return out, wire, decoded
@@ -1,19 +1,54 @@
-from datetime import datetime
+from datetime import datetime, timezone
+import json
+from typing import List, Optional
 
-from .. import db
+from flask import current_app
+
+from .. import db, ingest_queue
 from ..models import SensorData, TargetDetection
 
 
-def ingest_sensor_json(payload: dict) -> SensorData:
+SENSOR_FIELDS = ["co_ppm", "no2_ppm", "nh3_ppm", "light_lux", "temp_c", "pressure_hpa", "humidity_pct"]
+
+
+def validate_sensor_payload(payload) -> Optional[str]:
+    """Return an error message for an invalid sensor reading, or None if it is valid."""
+    if not isinstance(payload, dict):
+        return "Sensor reading must be a JSON object"
+
+    # At least one sensor reading is required
+    if not any(field in payload for field in SENSOR_FIELDS):
+        return "At least one sensor reading is required"
+
+    for field in SENSOR_FIELDS:
+        if field in payload and payload[field] is not None:
+            try:
+                float(payload[field])
+            except (ValueError, TypeError):
+                return f"Invalid value for {field}: must be numeric"
+
+    return None
+
+
+def naive_utc(ts: datetime) -> datetime:
+    """Timestamps are stored and compared as naive UTC, like the utcnow() default."""
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def build_sensor_record(payload: dict) -> SensorData:
     ts = datetime.utcnow()
-    if "timestamp" in payload:
+    if isinstance(payload.get("timestamp"), datetime):
+        # Already decoded (e.g. binary sensor frames)
+        ts = payload["timestamp"]
+    elif "timestamp" in payload:
         try:
             ts = datetime.fromisoformat(payload["timestamp"].replace("Z", "+00:00"))
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, AttributeError):
             pass
-    
-    rec = SensorData(
-        ts=ts,
+    return SensorData(
+        ts=naive_utc(ts),
         co_ppm=payload.get("co_ppm"),
         no2_ppm=payload.get("no2_ppm"),
         nh3_ppm=payload.get("nh3_ppm"),
@@ -23,25 +58,159 @@ def ingest_sensor_json(payload: dict) -> SensorData:
         humidity_pct=payload.get("humidity_pct"),
         source=payload.get("source", "payload")
     )
+
+
+def serialize_sensor(rec: SensorData) -> dict:
+    return {
+        "ts": rec.ts,
+        "co_ppm": rec.co_ppm,
+        "no2_ppm": rec.no2_ppm,
+        "nh3_ppm": rec.nh3_ppm,
+        "light_lux": rec.light_lux,
+        "temp_c": rec.temp_c,
+        "pressure_hpa": rec.pressure_hpa,
+        "humidity_pct": rec.humidity_pct,
+        "source": rec.source
+    }
+
+
+def ingest_sensor_json(payload: dict) -> SensorData:
+    rec = build_sensor_record(payload)
     db.session.add(rec)
     db.session.commit()
     return rec
 
 
-def ingest_target_json(payload: dict) -> TargetDetection:
+def ingest_sensor_batch(payloads: List[dict]) -> List[SensorData]:
+    """Insert many (already validated) sensor readings in a single transaction."""
+    records = [build_sensor_record(payload) for payload in payloads]
+    db.session.add_all(records)
+    db.session.commit()
+    return records
+
+
+def build_target_record(payload: dict) -> TargetDetection:
     ts = datetime.utcnow()
-    if "timestamp" in payload:
+    raw_ts = payload.get("timestamp") or payload.get("ts")
+    if raw_ts:
         try:
-            ts = datetime.fromisoformat(payload["timestamp"].replace("Z", "+00:00"))
-        except (ValueError, TypeError):
+            ts = datetime.fromisoformat(raw_ts.replace("Z", "+00:00"))
+        except (ValueError, TypeError, AttributeError):
             pass
     
-    rec = TargetDetection(
-        ts=ts,
+    return TargetDetection(
+        ts=naive_utc(ts),
         target_type=payload.get("target_type"),
         details_json=payload.get("details") or {},
         image_url=payload.get("image_url"),
     )
+
+
+def get_write_behind_queue():
+    """Return the ingest queue when write-behind mode is enabled, otherwise None."""
+    if not current_app.config.get("WRITE_BEHIND_ENABLED"):
+        return None
+    ingest_queue.start(current_app._get_current_object())
+    return ingest_queue
+
+
+def persist_records(records: list) -> Optional[List[int]]:
+    """Store rows through the write-behind queue when enabled, else commit them now.
+
+    Returns the queue sequence ids when the rows were queued, or None once they are
+    committed (their primary keys are then populated). Raises ``queue.Full`` when the
+    write-behind queue has no room.
+    """
+    write_behind = get_write_behind_queue()
+    if write_behind is not None:
+        return write_behind.put_many(records)
+    db.session.add_all(records)
+    db.session.commit()
+    return None
+
+
+def ingest_target_json(payload: dict) -> TargetDetection:
+    rec = build_target_record(payload)
     db.session.add(rec)
     db.session.commit()
     return rec
+
+
+def ingest_ndjson_stream(stream, chunk_size: int = 500, max_line_bytes: int = 1024 * 1024,
+                         max_errors: int = 100) -> dict:
+    """Parse newline-delimited sensor/target records from a byte stream and store them.
+
+    Lines are read one at a time so memory stays flat regardless of upload size; rows
+    are committed every ``chunk_size`` records. A record is a target when it carries
+    ``target_type`` (or ``"kind": "target"``), otherwise it is validated as a sensor
+    reading. Bad lines are skipped and reported in the returned summary.
+    """
+    summary = {"lines": 0, "sensors": 0, "targets": 0, "errors": [], "error_count": 0,
+               "bytes": {"AQSA": 0, "TAIP": 0}}
+    pending = 0
+
+    def _error(line_no, message):
+        summary["error_count"] += 1
+        if len(summary["errors"]) < max_errors:
+            summary["errors"].append({"line": line_no, "error": message})
+
+    def _commit():
+        db.session.commit()
+        # Drop committed rows from the identity map to keep memory flat
+        db.session.expunge_all()
+
+    line_no = 0
+    while True:
+        raw = stream.readline(max_line_bytes + 1)
+        if not raw:
+            break
+        line_no += 1
+        if len(raw) > max_line_bytes and not raw.endswith(b"\n"):
+            # Skip the rest of an oversized line
+            while raw and not raw.endswith(b"\n"):
+                raw = stream.readline(max_line_bytes)
+            _error(line_no, f"Line exceeds {max_line_bytes} bytes")
+            continue
+
+        line = raw.strip()
+        if not line:
+            continue
+        summary["lines"] += 1
+
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            _error(line_no, f"Invalid JSON: {str(e)}")
+            continue
+        if not isinstance(payload, dict):
+            _error(line_no, "Record must be a JSON object")
+            continue
+
+        kind = payload.get("kind") or ("target" if "target_type" in payload else "sensor")
+        if kind == "target":
+            if not payload.get("target_type"):
+                _error(line_no, "target_type is required")
+                continue
+            db.session.add(build_target_record(payload))
+            summary["targets"] += 1
+            summary["bytes"]["TAIP"] += len(raw)
+        elif kind == "sensor":
+            error = validate_sensor_payload(payload)
+            if error:
+                _error(line_no, error)
+                continue
+            db.session.add(build_sensor_record(payload))
+            summary["sensors"] += 1
+            summary["bytes"]["AQSA"] += len(raw)
+        else:
+            _error(line_no, f"Unknown record kind: {kind}")
+            continue
+
+        pending += 1
+        if pending >= chunk_size:
+            _commit()
+            pending = 0
+
+    if pending:
+        _commit()
+    return summary
@@ -0,0 +1,132 @@
+# gcs/services/downsample.py
+"""Shape-preserving downsampling of sensor time series for the graphs.
+
+Both methods return the indices of the points to keep, in time order, and always keep
+the first and last point:
+
+* ``lttb``   Largest-Triangle-Three-Buckets: one point per bucket, chosen to maximize
+             the triangle it forms with its neighbours; keeps the visual shape.
+* ``minmax`` the minimum and maximum of each bucket; keeps every spike and dip.
+"""
+from datetime import timezone
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to pure Python
+    np = None
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb(x: Sequence[float], y: Sequence[float], n_out: int) -> List[int]:
+    """Indices of ``n_out`` points picked with Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if n_out >= n:
+        return list(range(n))
+    n_out = max(n_out, 3)
+    if np is not None:
+        return _lttb_numpy(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), n_out)
+
+    # Bucket i covers [edges[i], edges[i + 1]); first and last point are buckets of their own
+    every = (n - 2) / (n_out - 2)
+    edges = [int(i * every) + 1 for i in range(n_out - 2)] + [n - 1]
+    picked = [0]
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The next bucket's centroid; after the last bucket that is the final point
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = sum(x[nxt_lo:nxt_hi]) / (nxt_hi - nxt_lo)
+        avg_y = sum(y[nxt_lo:nxt_hi]) / (nxt_hi - nxt_lo)
+        ax, ay = x[picked[-1]], y[picked[-1]]
+        picked.append(max(
+            range(lo, hi),
+            key=lambda j: abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+        ))
+    picked.append(n - 1)
+    return picked
+
+
+def _lttb_numpy(x, y, n_out: int) -> List[int]:
+    n = len(x)
+    edges = np.append((np.arange(n_out - 2) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1, n - 1)
+    # Centroid of every "next bucket" up front, via cumulative sums
+    csx = np.concatenate(([0.0], np.cumsum(x)))
+    csy = np.concatenate(([0.0], np.cumsum(y)))
+    nxt_lo = edges[1:]
+    nxt_hi = np.append(edges[2:], n)
+    avg_x = (csx[nxt_hi] - csx[nxt_lo]) / (nxt_hi - nxt_lo)
+    avg_y = (csy[nxt_hi] - csy[nxt_lo]) / (nxt_hi - nxt_lo)
+
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    # The pick of each bucket depends on the previous one, so only the inner area is vectorized
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked.tolist()
+
+
+def minmax(y: Sequence[float], n_out: int) -> List[int]:
+    """Indices of the min and max of ``n_out // 2`` equal-count buckets (plus both ends)."""
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n_out >= n or n < 3:
+        return list(range(n))
+    if np is not None:
+        values = np.asarray(y, dtype=np.float64)
+        edges = np.arange(buckets + 1) * n // buckets
+        bucket_of = np.repeat(np.arange(buckets), np.diff(edges))
+        # Sort by (bucket, value): each bucket's first entry is its min, its last entry its max
+        order = np.lexsort((values, bucket_of))
+        keep = np.concatenate((order[edges[:-1]], order[edges[1:] - 1], [0, n - 1]))
+        return np.unique(keep).tolist()
+
+    keep = {0, n - 1}
+    for b in range(buckets):
+        lo, hi = b * n // buckets, (b + 1) * n // buckets
+        bucket = range(lo, hi)
+        keep.add(min(bucket, key=y.__getitem__))
+        keep.add(max(bucket, key=y.__getitem__))
+    return sorted(keep)
+
+
+def downsample(x: Sequence[float], y: Sequence[float], max_points: int, method: str = "lttb") -> List[int]:
+    """Indices of at most ``max_points`` points of (x, y) chosen by ``method``."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {list(METHODS)}")
+    if len(y) <= max_points:
+        return list(range(len(y)))
+    if method == "minmax":
+        return minmax(y, max_points - 2)
+    return lttb(x, y, max_points)
+
+
+def _epoch_seconds(ts: Sequence) -> Sequence[float]:
+    if np is not None:
+        return np.array(ts, dtype="datetime64[us]").astype(np.int64) / 1e6
+    return [t.replace(tzinfo=timezone.utc).timestamp() for t in ts]
+
+
+def sensor_series(ts: Sequence, columns: Dict[str, Sequence], max_points: int, method: str = "lttb") -> dict:
+    """Downsample each column of a chronological sensor history on its own.
+
+    ``columns`` maps a field name to its values, row-aligned with ``ts`` (None = missing).
+    Returns ``{field: {"ts": [...], "values": [...]}}`` with at most ``max_points`` per field.
+    """
+    x = _epoch_seconds(ts)
+    series = {}
+    for field, values in columns.items():
+        if np is not None:
+            y = np.array(values, dtype=np.float64)  # None -> NaN
+            present = np.flatnonzero(~np.isnan(y))
+            rows = present[downsample(x[present], y[present], max_points, method)].tolist()
+        else:
+            present = [i for i, value in enumerate(values) if value is not None]
+            keep = downsample([x[i] for i in present], [values[i] for i in present], max_points, method)
+            rows = [present[i] for i in keep]
+        series[field] = {"ts": [ts[i] for i in rows], "values": [values[i] for i in rows]}
+    return series
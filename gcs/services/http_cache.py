@@ -0,0 +1,46 @@
+# gcs/services/http_cache.py
+import gzip
+import hashlib
+from threading import Lock
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024
+# Content-addressed images never change under the same URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+_generation = 0
+_generation_lock = Lock()
+
+
+def bump_generation():
+    """Invalidate every ETag handed out so far (e.g. after history is cleared)."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+def make_etag(*parts) -> str:
+    """Short opaque tag from the data version parts plus the cache generation."""
+    raw = "|".join(str(p) for p in (_generation,) + parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def choose_encoding(accept_encodings) -> str:
+    """Pick br or gzip from a werkzeug Accept-Encoding header; None for identity."""
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
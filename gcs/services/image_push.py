@@ -0,0 +1,92 @@
+# gcs/services/image_push.py
+import io
+import logging
+import mimetypes
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .image_store import ARCHIVE_URL_PREFIX, PACK_URL_PREFIX, image_id, read_archive
+from .thumbnails import Image, existing_thumb_url, render_thumbnail, thumb_path
+
+logger = logging.getLogger('uav_gcs')
+
+IMAGE_ROOM = "detection-images"  # /stream clients that asked for inline frames
+
+
+class ImagePush:
+    """Inline detection frames for /stream clients that opted in.
+
+    Subscribed clients sit in ``IMAGE_ROOM`` and get ``recent_detection``/``target_batch``
+    with the frame attached as a binary ``image`` field, so they can draw it without a
+    second HTTP request. The frame is the thumbnail when it already exists, otherwise a
+    downscale rendered once per image (Pillow) and kept in a small LRU. Without Pillow
+    the original frame is sent when it is at most ``max_bytes``; bigger frames go out as
+    URLs only.
+    """
+
+    def __init__(self, max_size: int = 320, max_bytes: int = 256 * 1024, cache_items: int = 32):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.cache_items = cache_items
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._cache: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+
+    def configure(self, max_size: int, max_bytes: int):
+        with self._lock:
+            self.max_size = max_size
+            self.max_bytes = max_bytes
+            self._cache.clear()
+
+    def subscribe(self, sid: str):
+        with self._lock:
+            self._subscribers.add(sid)
+
+    def unsubscribe(self, sid: str):
+        with self._lock:
+            self._subscribers.discard(sid)
+
+    def subscribers(self) -> List[str]:
+        with self._lock:
+            return list(self._subscribers)
+
+    def preview(self, image_url: str, device_id: Optional[str] = None) -> Optional[Tuple[bytes, str]]:
+        """(bytes, mimetype) to attach for ``image_url``; None when there is nothing to send."""
+        if not image_url or not image_url.startswith((ARCHIVE_URL_PREFIX, PACK_URL_PREFIX)):
+            return None
+        key = image_id(image_url)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        data = self._render(image_url, key, device_id)
+        if data is not None:
+            with self._lock:
+                self._cache[key] = data
+                while len(self._cache) > self.cache_items:
+                    self._cache.popitem(last=False)
+        return data
+
+    def _render(self, image_url: str, key: str, device_id: Optional[str]) -> Optional[Tuple[bytes, str]]:
+        from .. import latest_frames
+
+        try:
+            thumb_url = existing_thumb_url(image_url)
+            if thumb_url:
+                return thumb_path(thumb_url).read_bytes(), "image/jpeg"
+            # The frame was received moments ago; take it from memory when it is still there
+            frame = latest_frames.get(device_id)
+            data = frame.data if frame is not None and frame.etag == key else read_archive(image_url)
+            if Image is not None:
+                return render_thumbnail(io.BytesIO(data), self.max_size), "image/jpeg"
+            if len(data) > self.max_bytes:
+                return None
+            return data, mimetypes.guess_type(image_url)[0] or "application/octet-stream"
+        except Exception as e:
+            logger.warning(f"Could not prepare inline image for {image_url}: {str(e)}")
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
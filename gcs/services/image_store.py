@@ -1,9 +1,16 @@
 import base64
+import hashlib
+import io
 import json
 import os
+import shutil
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+from .archive_index import ArchiveIndex
+from .pack_store import PackStore
 
 
 def ensure_targets_dir() -> str:
@@ -12,17 +19,33 @@ def ensure_targets_dir() -> str:
     return targets_dir
 
 
-def save_image_bytes(img_bytes: bytes, fname: str = "latest.jpg") -> str:
-    targets_dir = ensure_targets_dir()
-    file_path = os.path.join(targets_dir, fname)
-    
-    with open(file_path, "wb") as f:
-        f.write(img_bytes)
-    
-    return file_path
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG', b'GIF8')
+MIN_IMAGE_BYTES = 100
+
+
+def _check_image_head(head: bytes):
+    if not head.startswith(IMAGE_SIGNATURES):
+        raise ValueError("Invalid image format - must be JPEG, PNG, or GIF")
 
 
-def decode_b64_image(image_b64: str) -> bytes:
+def _check_image_size(nbytes: int, max_bytes: Optional[int]):
+    if max_bytes is not None and nbytes > max_bytes:
+        raise ValueError(f"Image exceeds {max_bytes} bytes")
+
+
+def validate_image_bytes(img_bytes: Any, max_bytes: Optional[int] = None) -> bytes:
+    """The frame as ``bytes``; ValueError unless it is a binary JPEG/PNG/GIF of sane size."""
+    if not isinstance(img_bytes, (bytes, bytearray, memoryview)):
+        raise ValueError("Image must be binary data")
+    img_bytes = bytes(img_bytes)
+    if len(img_bytes) < MIN_IMAGE_BYTES:
+        raise ValueError("Image data too small")
+    _check_image_size(len(img_bytes), max_bytes)
+    _check_image_head(img_bytes)
+    return img_bytes
+
+
+def decode_b64_image(image_b64: str, max_bytes: Optional[int] = None) -> bytes:
     if image_b64.startswith("data:image/"):
         if "," in image_b64:
             image_b64 = image_b64.split(",", 1)[1]
@@ -30,18 +53,7 @@ def decode_b64_image(image_b64: str) -> bytes:
             raise ValueError("Invalid data URL format")
     
     try:
-        img_bytes = base64.b64decode(image_b64)
-        
-        if len(img_bytes) < 100:
-            raise ValueError("Image data too small")
-            
-        if not (img_bytes.startswith(b'\xff\xd8\xff') or
-                img_bytes.startswith(b'\x89PNG') or
-                img_bytes.startswith(b'GIF8')):
-            raise ValueError("Invalid image format - must be JPEG, PNG, or GIF")
-            
-        return img_bytes
-        
+        return validate_image_bytes(base64.b64decode(image_b64), max_bytes)
     except Exception as e:
         raise ValueError(f"Failed to decode base64 image: {str(e)}")
 
@@ -63,22 +75,301 @@ def parse_details(details: Any) -> Dict[str, Any]:
 
 
 def get_image_url() -> str:
-    return "/static/targets/latest.jpg"
+    # Served by the /targets/latest.jpg route (ETag/Last-Modified, 304 when unchanged)
+    return "/targets/latest.jpg"
+
+
+def latest_image_path() -> Path:
+    return Path(ensure_targets_dir()) / "latest.jpg"
 
 
 # Archive functionality
 ARCHIVE_DIR = Path("gcs/static/targets/archive")
+ARCHIVE_URL_PREFIX = "/static/targets/archive/"
+
+# Frames live in UTC date/hour shards (archive/YYYY/MM/DD/HH/<hash>.jpg); the index maps
+# image id -> url, size, ts so nothing ever has to list those directories. It is kept
+# under instance/, not static/, so the whole listing can't be downloaded.
+ARCHIVE_INDEX_PATH = Path("instance/archive_index.jsonl")
+_LEGACY_INDEX_PATH = ARCHIVE_DIR / "index.jsonl"
+archive_index = ArchiveIndex(ARCHIVE_INDEX_PATH)
+
+# Optional pack backend (ARCHIVE_BACKEND=pack): frames are appended to large segment files
+# outside static/ and served by the /archive/<id> route from the index's offset + length
+PACK_DIR = Path("instance/packs")
+PACK_URL_PREFIX = "/archive/"
+pack_store = PackStore(PACK_DIR)
+_backend = "files"
+_pack_lock = threading.Lock()
+
+
+def configure_archive(backend: str = "files", segment_bytes: int = 256 * 1024 * 1024):
+    """Select where new frames go ("files" or "pack"); existing frames stay readable."""
+    global _backend
+    _backend = "pack" if backend == "pack" else "files"
+    pack_store.segment_bytes = segment_bytes
+    pack_store.reset()
+    _adopt_legacy_archive()
+
+
+def _adopt_legacy_archive():
+    """Bring archives from older versions under the index, once.
+
+    An index left under static/ is moved to ARCHIVE_INDEX_PATH (and no longer served).
+    An archive with no index at all predates it and is indexed with a single walk; after
+    that the index file exists and start-up never scans the archive again.
+    """
+    if _LEGACY_INDEX_PATH.exists():
+        if archive_index.path.exists():
+            _LEGACY_INDEX_PATH.unlink()
+        else:
+            archive_index.path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(_LEGACY_INDEX_PATH, archive_index.path)
+        archive_index.reset()
+    if not archive_index.path.exists() and ARCHIVE_DIR.is_dir():
+        reindex_archive()
 
 def ensure_archive_dir():
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
 
-def archive_image_bytes(img_bytes: bytes, det_type: str) -> str:
+# Archive files are named by a hash of their bytes, so identical frames share one file
+ARCHIVE_HASH_BYTES = 16  # blake2b-128 -> 32 hex chars
+
+
+def _content_hasher():
+    return hashlib.blake2b(digest_size=ARCHIVE_HASH_BYTES)
+
+
+def _image_ext(head: bytes) -> str:
+    if head.startswith(b'\x89PNG'):
+        return ".png"
+    if head.startswith(b'GIF8'):
+        return ".gif"
+    return ".jpg"
+
+
+def _shard(ts: Optional[float] = None) -> str:
+    return time.strftime("%Y/%m/%d/%H", time.gmtime(ts))
+
+
+def _archive_url(digest: str, head: bytes) -> str:
+    """URL of an already-indexed frame, else a fresh one (current hour's shard, or pack)."""
+    entry = archive_index.get(digest)
+    if entry is not None:
+        return entry["url"]
+    if _backend == "pack":
+        return f"{PACK_URL_PREFIX}{digest}{_image_ext(head)}"
+    return f"{ARCHIVE_URL_PREFIX}{_shard()}/{digest}{_image_ext(head)}"
+
+
+def is_packed(archive_url: str) -> bool:
+    return archive_url.startswith(PACK_URL_PREFIX)
+
+
+def image_id(archive_url: str) -> str:
+    """Index key of an archive URL (the content hash)."""
+    return Path(archive_url).stem
+
+
+def _tmp_path(path: Path) -> Path:
+    # Same directory as the target so os.replace() stays an atomic rename
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write via a temp file + rename so readers never see a half-written image."""
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def archive_url_for(img_bytes: bytes) -> str:
+    """Content-addressed archive URL for a frame (write it later with write_archive())."""
+    hasher = _content_hasher()
+    hasher.update(img_bytes)
+    return _archive_url(hasher.hexdigest(), img_bytes[:8])
+
+
+def _write_pack(archive_url: str, img_bytes: bytes) -> bool:
+    with _pack_lock:
+        if archive_index.get(image_id(archive_url)) is not None:
+            return False
+        segment, offset = pack_store.append(img_bytes)
+        archive_index.add(image_id(archive_url), archive_url, len(img_bytes), pack=segment, offset=offset)
+        return True
+
+
+def write_archive(archive_url: str, img_bytes: bytes) -> bool:
+    """Store and index a frame under its archive URL; False if it is already there."""
+    if is_packed(archive_url):
+        return _write_pack(archive_url, img_bytes)
+    path = archive_path(archive_url)
+    if path.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(path, img_bytes)
+    archive_index.add(image_id(archive_url), archive_url, len(img_bytes))
+    return True
+
+
+def archive_image_stream(stream, max_bytes: int, chunk_size: int = 64 * 1024):
+    """Copy an uploaded image from ``stream`` straight into the archive, chunk by chunk.
+
+    The bytes are hashed as they are written; the temp file is renamed to its content
+    address, or dropped if that file already exists. The data is also kept in memory
+    (never more than ``max_bytes``) so the caller can hand the frame on without reading
+    it back. Returns ``(url, img_bytes)``. Raises ValueError (and removes the partial
+    file) when the data is not a JPEG/PNG/GIF, is too small, or exceeds ``max_bytes``.
+    """
     ensure_archive_dir()
-    # UTC iso-ish filename safe for files
-    ts = time.time()
-    fname = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(ts))}_{det_type}.jpg"
-    fpath = ARCHIVE_DIR / fname
-    with open(fpath, "wb") as f:
-        f.write(img_bytes)
-    # return URL path
-    return f"/static/targets/archive/{fname}"
+    tmp = _tmp_path(ARCHIVE_DIR / "upload")
+    hasher = _content_hasher()
+    head = b""
+    nbytes = 0
+    buf = bytearray()
+    try:
+        with open(tmp, "wb") as f:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if nbytes == 0:
+                    _check_image_head(chunk)
+                    head = chunk[:8]
+                nbytes += len(chunk)
+                _check_image_size(nbytes, max_bytes)
+                hasher.update(chunk)
+                f.write(chunk)
+                buf += chunk
+        if nbytes < MIN_IMAGE_BYTES:
+            raise ValueError("Image data too small")
+        archive_url = _archive_url(hasher.hexdigest(), head)
+        fpath = archive_path(archive_url)
+        if is_packed(archive_url):
+            _write_pack(archive_url, bytes(buf))
+            tmp.unlink()
+        elif fpath.exists():
+            tmp.unlink()
+        else:
+            fpath.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, fpath)
+            archive_index.add(image_id(archive_url), archive_url, nbytes)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+    return archive_url, bytes(buf)
+
+
+def archive_path(archive_url: str) -> Path:
+    if archive_url.startswith(ARCHIVE_URL_PREFIX):
+        return ARCHIVE_DIR / archive_url[len(ARCHIVE_URL_PREFIX):]
+    return ARCHIVE_DIR / archive_url.rsplit("/", 1)[-1]
+
+
+def read_archive(archive_url: str) -> bytes:
+    """Bytes of an archived frame from either backend; FileNotFoundError if unknown."""
+    if is_packed(archive_url):
+        entry = archive_index.get(image_id(archive_url))
+        if entry is None or "pack" not in entry:
+            raise FileNotFoundError(archive_url)
+        return pack_store.read(entry["pack"], entry["offset"], entry["size"])
+    return archive_path(archive_url).read_bytes()
+
+
+def open_archive(archive_url: str):
+    """Binary file object for an archived frame (a BytesIO view for packed frames)."""
+    if is_packed(archive_url):
+        return io.BytesIO(read_archive(archive_url))
+    return open(archive_path(archive_url), "rb")
+
+
+def prune_empty_dirs(path: Path, root: Path):
+    """Remove ``path``'s parent directories up to (not including) ``root`` while empty."""
+    parent = path.parent
+    while parent != root and root in parent.parents:
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+        parent = parent.parent
+
+
+def clear_archive() -> List[dict]:
+    """Delete every indexed frame (and emptied shard dirs); returns the removed entries."""
+    removed = archive_index.clear()
+    segments = set()
+    for entry in removed:
+        if "pack" in entry:
+            segments.add(entry["pack"])
+            continue
+        path = archive_path(entry["url"])
+        path.unlink(missing_ok=True)
+        prune_empty_dirs(path, ARCHIVE_DIR)
+    pack_store.remove_segments(segments)
+    return removed
+
+
+def reindex_archive() -> int:
+    """One-off walk of ARCHIVE_DIR to rebuild the index (e.g. for pre-index archives).
+
+    Packed frames cannot be rediscovered from their segments, so their entries are kept.
+    """
+    entries = [entry for entry in archive_index.entries(newest_first=False) if "pack" in entry]
+    for path in ARCHIVE_DIR.rglob("*"):
+        if path.suffix not in (".jpg", ".png", ".gif") or path.name.startswith("."):
+            continue
+        stat = path.stat()
+        url = ARCHIVE_URL_PREFIX + path.relative_to(ARCHIVE_DIR).as_posix()
+        entries.append({"id": image_id(url), "url": url, "size": stat.st_size, "ts": stat.st_mtime})
+    entries.sort(key=lambda e: e["ts"])
+    archive_index.rebuild(entries)
+    return len(entries)
+
+
+# In-memory pointer to the newest archived frame (what latest.jpg currently shows)
+_latest_archive_url: Optional[str] = None
+
+
+def latest_archive_url() -> Optional[str]:
+    return _latest_archive_url
+
+
+def link_latest(archive_url: str, fname: str = "latest.jpg") -> str:
+    """Point latest.jpg at an archived frame without rewriting the image.
+
+    A hard link to the archive file is created under a temp name and renamed over
+    latest.jpg, so the swap is atomic. Filesystems without hard links (e.g. FAT SD
+    cards) fall back to copy + rename. A packed frame has no file to link to, so only
+    the in-memory pointer moves (/targets/latest.jpg reads it from the pack) and its
+    archive URL is returned instead of a path.
+    """
+    global _latest_archive_url
+    if is_packed(archive_url):
+        _latest_archive_url = archive_url
+        return archive_url
+    dst = Path(ensure_targets_dir()) / fname
+    src = archive_path(archive_url)
+    tmp = _tmp_path(dst)
+    try:
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+    _latest_archive_url = archive_url
+    return str(dst)
+
+
+def forget_latest():
+    """Drop the in-memory latest pointer (latest.jpg itself is removed by the caller)."""
+    global _latest_archive_url
+    _latest_archive_url = None
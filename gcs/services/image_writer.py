@@ -0,0 +1,171 @@
+# gcs/services/image_writer.py
+import atexit
+import itertools
+import logging
+import queue
+import threading
+from typing import Callable, List, Optional
+
+from .image_store import link_latest, write_archive
+
+logger = logging.getLogger('uav_gcs')
+
+IMAGE_FAILED = "failed"
+
+_WAKE = object()  # posted by stop(), one per worker
+
+
+class ImageWriter:
+    """Small thread pool that writes decoded target images off the request thread.
+
+    The caller derives the content-addressed archive URL, commits the detection rows that
+    reference it and then ``submit``s the bytes. A worker writes the archive file (unless
+    identical bytes are already archived), repoints latest.jpg and runs ``on_done``. If the
+    write fails, every row carrying that URL gets ``image_status = "failed"``. When the pool
+    is not running or its queue is full, the write happens inline on the caller's thread,
+    so the queue bounds memory, not data.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 32):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._threads: List[threading.Thread] = []
+        self._app = None
+        self._seq = itertools.count(1)
+        self._latest_lock = threading.Lock()
+        self._latest_seq = 0
+        self._stats_lock = threading.Lock()
+        self._written = 0
+        self._deduplicated = 0
+        self._failed = 0
+        self._inline = 0
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self, app):
+        """Start the workers (idempotent); failures are marked in ``app``'s database."""
+        self._app = app
+        if self.running:
+            return
+        self._threads = [
+            threading.Thread(target=self._run, name=f"image-writer-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+        atexit.register(self.stop)
+        logger.info(f"Image writer enabled (workers={self.workers}, queue={self.max_queue})")
+
+    def configure(self, workers: int, max_queue: int):
+        """Apply sizing from app config; only valid before the workers start."""
+        if self.running:
+            return
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def submit(self, image_url: str, img_bytes: bytes, on_done: Optional[Callable] = None) -> bool:
+        """Persist ``img_bytes`` at ``image_url``; True if queued, False if written inline."""
+        job = (next(self._seq), image_url, img_bytes, on_done)
+        if self.running:
+            try:
+                self._queue.put_nowait(job)
+                return True
+            except queue.Full:
+                pass
+        with self._stats_lock:
+            self._inline += 1
+        self._write(job, None)
+        return False
+
+    def flush(self):
+        """Block until every queued image has been written (or marked failed)."""
+        if self.running:
+            self._queue.join()
+
+    def stop(self):
+        if not self.running:
+            return
+        for _ in self._threads:
+            self._queue.put(_WAKE)
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "enabled": self.running,
+                "pending": self._queue.qsize(),
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "written": self._written,
+                "deduplicated": self._deduplicated,
+                "failed": self._failed,
+                "inline": self._inline,
+            }
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _WAKE:
+                    return
+                self._write(job, self._app)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, job, app):
+        seq, image_url, img_bytes, on_done = job
+        try:
+            written = write_archive(image_url, img_bytes)
+            # Workers finish out of order; never move latest.jpg back to an older frame
+            with self._latest_lock:
+                if seq > self._latest_seq:
+                    link_latest(image_url)
+                    self._latest_seq = seq
+            with self._stats_lock:
+                if written:
+                    self._written += 1
+                else:
+                    self._deduplicated += 1
+        except Exception as e:
+            with self._stats_lock:
+                self._failed += 1
+            logger.error(f"Image write failed for {image_url}: {str(e)}")
+            self._mark_failed(image_url, app)
+        if on_done is not None:
+            try:
+                on_done()
+            except Exception as e:
+                logger.error(f"Image writer callback failed for {image_url}: {str(e)}")
+
+    def _mark_failed(self, image_url: str, app):
+        from .. import db, ingest_queue
+        from ..models import TargetDetection
+        from .http_cache import bump_generation
+
+        # Rows may still be sitting in the write-behind queue
+        ingest_queue.flush()
+        try:
+            if app is None:
+                # Inline write: we are still on the request thread
+                from flask import current_app
+                app = current_app._get_current_object()
+            with app.app_context():
+                try:
+                    TargetDetection.query.filter_by(image_url=image_url).update(
+                        {"image_status": IMAGE_FAILED}, synchronize_session=False
+                    )
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+                finally:
+                    db.session.remove()
+            bump_generation()
+        except Exception as e:
+            logger.error(f"Could not mark rows for {image_url} as failed: {str(e)}")
@@ -0,0 +1,174 @@
+# gcs/services/ingest_queue.py
+import atexit
+import itertools
+import logging
+import queue
+import threading
+from time import monotonic, time
+from typing import List, Optional
+
+logger = logging.getLogger('uav_gcs')
+
+_WAKE = object()  # posted by stop() so a blocked writer notices immediately
+
+
+class WriteBehindQueue:
+    """Bounded in-process queue that group-commits ORM rows on a background writer.
+
+    Request handlers validate, build the model instance and ``put`` it; they get a
+    sequence id back straight away. The writer drains the queue and commits every
+    ``batch_size`` records or ``flush_ms`` milliseconds, whichever comes first.
+    """
+
+    def __init__(self, max_size: int = 10000, batch_size: int = 200, flush_ms: int = 250):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self._seq = itertools.count(1)
+        self._seq_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app = None
+        self._committed = 0
+        self._failed = 0
+        self._last_committed_seq = 0
+        self._last_commit_ts: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, app):
+        """Start the background writer (idempotent)."""
+        if self.running:
+            return
+        self._app = app
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        logger.info(f"Write-behind ingest enabled (batch={self.batch_size}, flush={self.flush_ms}ms)")
+
+    def configure(self, max_size: int, batch_size: int, flush_ms: int):
+        """Apply sizing from app config; only valid before the writer starts."""
+        if self.running:
+            return
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self._queue = queue.Queue(maxsize=max_size)
+
+    def put(self, record) -> int:
+        """Enqueue one record. Raises ``queue.Full`` when the queue is at capacity."""
+        return self.put_many([record])[0]
+
+    def put_many(self, records: list) -> List[int]:
+        """Enqueue records in order and return their sequence ids."""
+        seqs = []
+        with self._seq_lock:
+            if self._queue.maxsize and self._queue.qsize() + len(records) > self._queue.maxsize:
+                raise queue.Full()
+            for rec in records:
+                seq = next(self._seq)
+                self._queue.put_nowait((seq, rec))
+                seqs.append(seq)
+        return seqs
+
+    def flush(self):
+        """Block until every record enqueued so far has been committed (or failed)."""
+        if self.running:
+            self._queue.join()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=5)
+        # Anything left behind after the writer exits is committed here
+        remaining = self._drain_nowait()
+        if remaining:
+            self._commit(remaining)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "enabled": self.running,
+                "pending": self._queue.qsize(),
+                "max_size": self.max_size,
+                "batch_size": self.batch_size,
+                "flush_ms": self.flush_ms,
+                "committed": self._committed,
+                "failed": self._failed,
+                "last_committed_seq": self._last_committed_seq,
+                "last_commit_ts": self._last_commit_ts,
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain()
+            if batch:
+                self._commit(batch)
+
+    def _drain(self) -> list:
+        """Collect up to ``batch_size`` items, waiting at most ``flush_ms`` after the first."""
+        flush_s = self.flush_ms / 1000.0
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = flush_s if deadline is None else deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _WAKE:
+                self._queue.task_done()
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = monotonic() + flush_s
+        return batch
+
+    def _drain_nowait(self) -> list:
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if item is _WAKE:
+                self._queue.task_done()
+            else:
+                batch.append(item)
+
+    def _commit(self, batch: list):
+        from .. import db
+
+        try:
+            with self._app.app_context():
+                try:
+                    db.session.add_all([rec for _, rec in batch])
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+                finally:
+                    db.session.remove()
+            with self._stats_lock:
+                self._committed += len(batch)
+                self._last_committed_seq = max(self._last_committed_seq, batch[-1][0])
+                self._last_commit_ts = time()
+        except Exception as e:
+            with self._stats_lock:
+                self._failed += len(batch)
+            logger.error(f"Write-behind commit failed for {len(batch)} records: {str(e)}")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
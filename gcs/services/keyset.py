@@ -0,0 +1,82 @@
+# gcs/services/keyset.py
+"""Keyset (cursor) pagination over ``(ts, id)``, newest first.
+
+An OFFSET page makes the database walk and discard every row before it, so deep pages
+get slower as a table grows. A keyset page starts from the last row the client saw and
+reads only ``per_page + 1`` rows off the ``ts`` index, on every page. Cursors are opaque
+to clients: url-safe base64 of the direction and the boundary row's ``(ts, id)``.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+NEXT = "n"  # older rows
+PREV = "p"  # newer rows
+
+
+def encode_cursor(direction: str, ts: Optional[datetime], row_id: int) -> str:
+    # A NULL ts is encoded as an empty field
+    raw = f"{direction}|{'' if ts is None else ts.isoformat()}|{row_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Optional[datetime], int]:
+    """(direction, ts, id) from a cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        direction, ts, row_id = raw.split("|")
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(ts) if ts else None, int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor") from None
+
+
+def keyset_page(query, ts_col, id_col, cursor: Optional[str], per_page: int) -> Tuple[List, Optional[str], Optional[str]]:
+    """One newest-first page of ``query``; returns (rows, next_cursor, prev_cursor).
+
+    Rows with a NULL ``ts`` sort after every dated row (oldest), newest id first, as
+    SQLite's ``ORDER BY ts DESC`` puts them. ``next_cursor`` is None on the oldest page
+    and ``prev_cursor`` on the newest one. Raises ValueError for a malformed cursor.
+    """
+    direction, ts, row_id = decode_cursor(cursor) if cursor else (NEXT, None, None)
+    limit = per_page + 1
+    dated, undated = query.filter(ts_col.isnot(None)), query.filter(ts_col.is_(None))
+    if direction == NEXT:
+        if row_id is None:
+            rows = dated.order_by(ts_col.desc(), id_col.desc()).limit(limit).all()
+        elif ts is None:
+            rows = []
+            undated = undated.filter(id_col < row_id)
+        else:
+            # (ts, id) < (cursor ts, id); the plain ts bound keeps it a range scan on the ts index
+            rows = (query.filter(ts_col <= ts, or_(ts_col < ts, and_(ts_col == ts, id_col < row_id)))
+                    .order_by(ts_col.desc(), id_col.desc()).limit(limit).all())
+        if len(rows) < limit:
+            # Past the oldest dated row: continue into the NULL-ts rows
+            rows += undated.order_by(id_col.desc()).limit(limit - len(rows)).all()
+    elif ts is None:
+        rows = undated.filter(id_col > row_id).order_by(id_col.asc()).limit(limit).all()
+        if len(rows) < limit:
+            rows += dated.order_by(ts_col.asc(), id_col.asc()).limit(limit - len(rows)).all()
+    else:
+        rows = (query.filter(ts_col >= ts, or_(ts_col > ts, and_(ts_col == ts, id_col > row_id)))
+                .order_by(ts_col.asc(), id_col.asc()).limit(limit).all())
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == PREV:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    first, last = rows[0], rows[-1]
+    # Coming back from an older page means there are older rows, and vice versa
+    has_older = has_more if direction == NEXT else True
+    has_newer = row_id is not None if direction == NEXT else has_more
+    next_cursor = encode_cursor(NEXT, last.ts, last.id) if has_older else None
+    prev_cursor = encode_cursor(PREV, first.ts, first.id) if has_newer else None
+    return rows, next_cursor, prev_cursor
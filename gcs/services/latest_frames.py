@@ -0,0 +1,174 @@
+# gcs/services/latest_frames.py
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+DEFAULT_DEVICE = "default"  # frames uploaded without a device_id
+MJPEG_BOUNDARY = "frame"
+
+
+@dataclass(frozen=True)
+class Frame:
+    device_id: str
+    data: bytes
+    etag: str          # content hash of the frame (same as its archive image id)
+    mimetype: str
+    ts: float          # epoch seconds (server receive time)
+    seq: int           # global arrival order
+
+
+class LatestFrames:
+    """Recent target frames per device, kept in memory.
+
+    Ingest ``put``s the decoded bytes the moment they arrive into a small ring per device
+    (plus one across all devices), so the live image routes answer from RAM instead of
+    re-reading latest.jpg from disk. ``wait_newer`` blocks until a frame with a different
+    ETag arrives (or the timeout passes), which is what the long-poll route hands to
+    clients instead of a polling timer; ``next_frame`` feeds MJPEG viewers from the ring.
+    Only the newest ``max_devices`` devices are tracked.
+    """
+
+    def __init__(self, ring_size: int = 8, max_devices: int = 64):
+        self.ring_size = ring_size
+        self.max_devices = max_devices
+        self._cond = threading.Condition()
+        self._rings: "OrderedDict[str, deque]" = OrderedDict()
+        self._all: deque = deque(maxlen=ring_size)
+        self._seq = 0
+        self._viewers = 0
+        self._skipped = 0
+
+    def configure(self, ring_size: int, max_devices: Optional[int] = None):
+        """Apply sizing from app config; buffered frames are dropped."""
+        with self._cond:
+            self.ring_size = ring_size
+            if max_devices is not None:
+                self.max_devices = max_devices
+            self._rings.clear()
+            self._all = deque(maxlen=ring_size)
+
+    def put(self, device_id: Optional[str], data: bytes, etag: str,
+            mimetype: str = "image/jpeg", ts: Optional[float] = None) -> Frame:
+        device_id = device_id or DEFAULT_DEVICE
+        with self._cond:
+            self._seq += 1
+            frame = Frame(device_id, bytes(data), etag, mimetype,
+                          time.time() if ts is None else ts, self._seq)
+            ring = self._rings.get(device_id)
+            if ring is None:
+                ring = self._rings[device_id] = deque(maxlen=self.ring_size)
+            ring.append(frame)
+            self._rings.move_to_end(device_id)
+            while len(self._rings) > self.max_devices:
+                self._rings.popitem(last=False)
+            self._all.append(frame)
+            self._cond.notify_all()
+            return frame
+
+    def _ring(self, device_id: Optional[str]) -> Optional[deque]:
+        if device_id is None:
+            return self._all
+        return self._rings.get(device_id)
+
+    def _lookup(self, device_id: Optional[str]) -> Optional[Frame]:
+        ring = self._ring(device_id)
+        return ring[-1] if ring else None
+
+    def get(self, device_id: Optional[str] = None) -> Optional[Frame]:
+        """Newest frame of ``device_id`` (any device when None)."""
+        with self._cond:
+            return self._lookup(device_id)
+
+    def wait_newer(self, device_id: Optional[str], etag: Optional[str], timeout: float) -> Optional[Frame]:
+        """Block until the frame's ETag differs from ``etag``; returns the current frame."""
+        def _changed():
+            frame = self._lookup(device_id)
+            return frame is not None and frame.etag != etag
+
+        with self._cond:
+            self._cond.wait_for(_changed, timeout)
+            return self._lookup(device_id)
+
+    def next_frame(self, device_id: Optional[str], after_seq: int, timeout: float,
+                   max_lag: int = 2) -> Optional[Frame]:
+        """The frame to send a viewer that has seen everything up to ``after_seq``.
+
+        A new viewer (``after_seq`` 0) starts at the newest frame. After that, frames are
+        handed out in order while the viewer keeps up; one with more than ``max_lag``
+        frames pending skips straight to the newest. None if nothing arrives within
+        ``timeout``.
+        """
+        def _pending():
+            frame = self._lookup(device_id)
+            return frame is not None and frame.seq > after_seq
+
+        with self._cond:
+            if not self._cond.wait_for(_pending, timeout):
+                return None
+            pending = [f for f in self._ring(device_id) if f.seq > after_seq]
+            if not after_seq:
+                return pending[-1]
+            if len(pending) > max_lag:
+                self._skipped += len(pending) - 1
+                return pending[-1]
+            return pending[0]
+
+    def open_viewer(self, limit: int) -> bool:
+        """Reserve one of ``limit`` streaming viewer slots; False when all are taken."""
+        with self._cond:
+            if self._viewers >= limit:
+                return False
+            self._viewers += 1
+            return True
+
+    def close_viewer(self):
+        with self._cond:
+            self._viewers = max(self._viewers - 1, 0)
+
+    def devices(self) -> List[dict]:
+        with self._cond:
+            return [
+                {"device_id": ring[-1].device_id, "etag": ring[-1].etag, "ts": ring[-1].ts,
+                 "size": len(ring[-1].data), "buffered": len(ring)}
+                for ring in reversed(self._rings.values())
+            ]
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "ring_size": self.ring_size,
+                "viewers": self._viewers,
+                "skipped": self._skipped,
+            }
+
+    def clear(self):
+        with self._cond:
+            self._rings.clear()
+            self._all.clear()
+            self._cond.notify_all()
+
+
+def mjpeg_stream(frames: LatestFrames, device_id: Optional[str], max_lag: int = 2,
+                 keepalive: float = 10.0) -> Iterator[bytes]:
+    """``multipart/x-mixed-replace`` body parts for one viewer, until the client goes away.
+
+    The generator runs on the viewer's own request thread: while a slow client's socket
+    write blocks, newer frames pile up in the ring and ``next_frame`` skips past them, so
+    a slow viewer never builds a backlog or holds anyone else up. Every ``keepalive``
+    seconds without a new frame something is written, so dead connections are noticed and
+    their viewer slot released: the current frame again, or a bare CRLF (multipart
+    preamble, ignored by clients) while the device has not sent a frame yet.
+    """
+    sent = None
+    while True:
+        frame = frames.next_frame(device_id, sent.seq if sent else 0, keepalive, max_lag)
+        if frame is None:
+            if sent is None:
+                yield b"\r\n"
+                continue
+            frame = sent
+        yield (f"--{MJPEG_BOUNDARY}\r\nContent-Type: {frame.mimetype}\r\n"
+               f"Content-Length: {len(frame.data)}\r\n\r\n").encode("ascii") + frame.data + b"\r\n"
+        sent = frame
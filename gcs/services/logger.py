@@ -37,6 +37,25 @@ def push_sensor_update(record_dict: dict):
         log_error(f"Failed to emit sensor update: {str(e)}")
 
 
+def push_sensor_batch(record_dicts: list):
+    """Emit one coalesced sensor_update for a batch of readings.
+
+    The latest reading stays at the top level so existing listeners keep working;
+    the full batch (chronological) is attached under ``batch``.
+    """
+    if not record_dicts:
+        return
+    try:
+        ordered = sorted(record_dicts, key=lambda r: r.get("ts") or "")
+        event = dict(ordered[-1])
+        event["count"] = len(ordered)
+        event["batch"] = ordered
+        socketio.emit("sensor_update", event, namespace="/stream")
+        log_info(f"Sensor batch emitted: {len(ordered)} readings")
+    except Exception as e:
+        log_error(f"Failed to emit sensor batch: {str(e)}")
+
+
 def push_target_detected(event_dict: dict):
     try:
         socketio.emit("target_detected", event_dict, namespace="/stream")
@@ -0,0 +1,84 @@
+# gcs/services/pack_store.py
+import mmap
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+_SEGMENT_RE = re.compile(r"^seg-(\d{6})\.pack$")
+
+
+class PackStore:
+    """Append-only segment files holding many images back to back.
+
+    ``append`` writes a frame to the active segment and returns ``(segment, offset)``;
+    the archive index keeps that together with the length. A new segment is started
+    once the active one would grow past ``segment_bytes``. Reads go through a cached
+    read-only mmap per segment, so serving a frame is a slice, not an open/seek/read.
+    """
+
+    def __init__(self, pack_dir: Path, segment_bytes: int = 256 * 1024 * 1024):
+        self.pack_dir = Path(pack_dir)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._active = None  # (name, size)
+        self._maps: Dict[str, Tuple[mmap.mmap, int]] = {}
+        self._maps_lock = threading.Lock()
+
+    @staticmethod
+    def _segment_name(number: int) -> str:
+        return f"seg-{number:06d}.pack"
+
+    def _find_active(self):
+        # Only the handful of segment files is listed, never the images themselves
+        self.pack_dir.mkdir(parents=True, exist_ok=True)
+        numbers = [int(m.group(1)) for m in map(_SEGMENT_RE.match, os.listdir(self.pack_dir)) if m]
+        name = self._segment_name(max(numbers, default=1))
+        path = self.pack_dir / name
+        return name, path.stat().st_size if path.exists() else 0
+
+    def append(self, data: bytes) -> Tuple[str, int]:
+        with self._lock:
+            if self._active is None:
+                self._active = self._find_active()
+            name, size = self._active
+            if size and size + len(data) > self.segment_bytes:
+                name, size = self._segment_name(int(_SEGMENT_RE.match(name).group(1)) + 1), 0
+            with open(self.pack_dir / name, "ab") as f:
+                f.write(data)
+            self._active = (name, size + len(data))
+            return name, size
+
+    def _map(self, segment: str, end: int) -> mmap.mmap:
+        with self._maps_lock:
+            cached = self._maps.get(segment)
+            if cached is not None and cached[1] >= end:
+                return cached[0]
+            # First read, or the active segment has grown past the old mapping
+            with open(self.pack_dir / segment, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # (an old, shorter mapping may still be in use by a reader; it closes when dropped)
+            self._maps[segment] = (mapped, len(mapped))
+            return mapped
+
+    def read(self, segment: str, offset: int, length: int) -> bytes:
+        if not _SEGMENT_RE.match(segment):
+            raise ValueError(f"Invalid pack segment {segment!r}")
+        mapped = self._map(segment, offset + length)
+        return mapped[offset:offset + length]
+
+    def reset(self):
+        """Drop mappings and the cached active segment (re-discovered on next append)."""
+        with self._lock, self._maps_lock:
+            self._maps.clear()
+            self._active = None
+
+    def remove_segments(self, segments):
+        """Delete the given segment files and forget the active segment."""
+        with self._lock, self._maps_lock:
+            self._maps.clear()
+            for segment in segments:
+                if _SEGMENT_RE.match(segment):
+                    (self.pack_dir / segment).unlink(missing_ok=True)
+            self._active = None
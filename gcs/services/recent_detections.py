@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Any, Optional
 from time import time
 from collections import deque
+import threading
 
 @dataclass
 class DetectionItem:
@@ -10,7 +11,7 @@ class DetectionItem:
     type: str
     details: dict
     image_url: str     # /static/targets/archive/...
-    thumb_url: str     # same for now (can be real thumb later)
+    thumb_url: str     # full image until the thumbnail worker fills in /static/targets/thumbs/...
 
 class RecentDetections:
     def __init__(self, window_sec: int = 3600, max_items: int = 200, min_conf: float = 0.75, refresh_sec: float = 4.0):
@@ -19,8 +20,11 @@ class RecentDetections:
         self.min_conf = min_conf
         self.refresh_sec = refresh_sec
         self.items: deque[DetectionItem] = deque()
+        # Request threads and the thumbnail workers both touch ``items``
+        self._lock = threading.Lock()
         self._last: Optional[DetectionItem] = None
         self._last_emit_ts: float = 0.0
+        self.version: int = 0  # bumped on every change; used for HTTP ETags
 
     def _same_object(self, a: dict, b: dict, t: str) -> bool:
         try:
@@ -49,38 +53,55 @@ class RecentDetections:
         item = DetectionItem(ts=server_ts, type=t, details=details, image_url=image_url, thumb_url=image_url)
         now = server_ts
 
-        # Evict old
-        cutoff = now - self.window_sec
-        while self.items and self.items[0].ts < cutoff:
-            self.items.popleft()
+        with self._lock:
+            # Evict old
+            cutoff = now - self.window_sec
+            while self.items and self.items[0].ts < cutoff:
+                self.items.popleft()
 
-        # Decide whether to append or refresh last
-        if self._last and self._same_object(self._last.details, details, t) and (now - self._last_emit_ts) < self.refresh_sec:
-            # Same object and refresh window not elapsed => keep showing previous
-            return None
+            # Decide whether to append or refresh last
+            if self._last and self._same_object(self._last.details, details, t) and (now - self._last_emit_ts) < self.refresh_sec:
+                # Same object and refresh window not elapsed => keep showing previous
+                return None
 
-        # New object OR refresh window elapsed -> append
-        self.items.append(item)
-        while len(self.items) > self.max_items:
-            self.items.popleft()
+            # New object OR refresh window elapsed -> append
+            self.items.append(item)
+            while len(self.items) > self.max_items:
+                self.items.popleft()
 
-        self._last = item
-        self._last_emit_ts = now
-        return item
+            self._last = item
+            self._last_emit_ts = now
+            self.version += 1
+            return item
 
     def list(self, limit: int = 40) -> list[dict]:
-        return [
-            {
-                "ts": it.ts,
-                "type": it.type,
-                "details": it.details,
-                "image_url": it.image_url,
-                "thumb_url": it.thumb_url
-            } for it in list(self.items)[:limit]
-        ]
+        with self._lock:
+            return [
+                {
+                    "ts": it.ts,
+                    "type": it.type,
+                    "details": it.details,
+                    "image_url": it.image_url,
+                    "thumb_url": it.thumb_url
+                } for it in list(self.items)[:limit]
+            ]
+
+    def set_thumb(self, image_url: str, thumb_url: str) -> int:
+        """Point every item showing ``image_url`` at its thumbnail; returns how many changed."""
+        changed = 0
+        with self._lock:
+            for it in self.items:
+                if it.image_url == image_url and it.thumb_url != thumb_url:
+                    it.thumb_url = thumb_url
+                    changed += 1
+            if changed:
+                self.version += 1
+        return changed
 
     def clear(self):
         """Clear all stored detections"""
-        self.items.clear()
-        self._last = None
-        self._last_emit_ts = 0.0
+        with self._lock:
+            self.items.clear()
+            self._last = None
+            self._last_emit_ts = 0.0
+            self.version += 1
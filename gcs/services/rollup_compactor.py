@@ -0,0 +1,93 @@
+# gcs/services/rollup_compactor.py
+import atexit
+import logging
+import threading
+from time import time
+from typing import Optional
+
+logger = logging.getLogger('uav_gcs')
+
+
+class RollupCompactor:
+    """Background thread that keeps the sensor rollups current.
+
+    Every ``interval_ms`` it folds the SensorData rows committed since the last run
+    (tracked by id in ``rollup_checkpoint``) into the 10 s / 1 min / 10 min buckets. It
+    reads only new rows, whichever path inserted them (HTTP, Socket.IO, NDJSON,
+    write-behind), so ingest itself stays untouched.
+    """
+
+    def __init__(self, interval_ms: int = 2000, batch_size: int = 5000):
+        self.interval_ms = interval_ms
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app = None
+        self._stats_lock = threading.Lock()
+        self._folded = 0
+        self._failed_runs = 0
+        self._last_run_ts: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def configure(self, interval_ms: int, batch_size: int):
+        """Apply settings from app config; only valid before the thread starts."""
+        if self.running:
+            return
+        self.interval_ms = interval_ms
+        self.batch_size = batch_size
+
+    def start(self, app):
+        """Start the compactor (idempotent); it works on ``app``'s database."""
+        self._app = app
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rollup-compactor", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        logger.info(f"Sensor rollups enabled (every {self.interval_ms}ms)")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def run_once(self, app=None) -> int:
+        """Compact now on the calling thread; returns rows folded."""
+        from .. import db
+        from .rollups import compact
+
+        app = app or self._app
+        try:
+            with app.app_context():
+                try:
+                    folded = compact(self.batch_size)
+                finally:
+                    db.session.remove()
+            with self._stats_lock:
+                self._folded += folded
+                self._last_run_ts = time()
+            return folded
+        except Exception as e:
+            with self._stats_lock:
+                self._failed_runs += 1
+            logger.error(f"Sensor rollup compaction failed: {str(e)}")
+            return 0
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "enabled": self.running,
+                "interval_ms": self.interval_ms,
+                "folded": self._folded,
+                "failed_runs": self._failed_runs,
+                "last_run_ts": self._last_run_ts,
+            }
+
+    def _run(self):
+        while not self._stop.wait(self.interval_ms / 1000.0):
+            self.run_once()
@@ -0,0 +1,173 @@
+# gcs/services/rollups.py
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .data_handler import SENSOR_FIELDS
+
+RESOLUTIONS = (10, 60, 600)  # bucket widths in seconds
+CHECKPOINT = "sensor_rollup"
+_EPOCH = datetime(1970, 1, 1)
+
+# Serializes compaction with backfills and history clears (one writer for the rollups)
+compact_lock = threading.RLock()
+
+
+def bucket_start(ts: datetime, resolution: int) -> datetime:
+    """Start of the ``resolution``-second bucket holding ``ts`` (naive UTC)."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    seconds = int((ts - _EPOCH).total_seconds()) // resolution * resolution
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def _new_bucket() -> dict:
+    return {"count": 0, **{field: [None, None, 0.0, 0] for field in SENSOR_FIELDS}}
+
+
+def aggregate(rows) -> Dict[Tuple[int, datetime], dict]:
+    """Fold SensorData rows into per-(resolution, bucket) min/max/sum/count."""
+    buckets: Dict[Tuple[int, datetime], dict] = {}
+    for row in rows:
+        if row.ts is None:
+            continue
+        for resolution in RESOLUTIONS:
+            key = (resolution, bucket_start(row.ts, resolution))
+            acc = buckets.get(key)
+            if acc is None:
+                acc = buckets[key] = _new_bucket()
+            acc["count"] += 1
+            for field in SENSOR_FIELDS:
+                value = getattr(row, field)
+                if value is None:
+                    continue
+                stat = acc[field]
+                stat[0] = value if stat[0] is None else min(stat[0], value)
+                stat[1] = value if stat[1] is None else max(stat[1], value)
+                stat[2] += value
+                stat[3] += 1
+    return buckets
+
+
+def _merge(rollup, acc: dict):
+    rollup.count = (rollup.count or 0) + acc["count"]
+    for field in SENSOR_FIELDS:
+        lo, hi, total, n = acc[field]
+        if not n:
+            continue
+        old_lo, old_hi = getattr(rollup, f"{field}_min"), getattr(rollup, f"{field}_max")
+        setattr(rollup, f"{field}_min", lo if old_lo is None else min(old_lo, lo))
+        setattr(rollup, f"{field}_max", hi if old_hi is None else max(old_hi, hi))
+        setattr(rollup, f"{field}_sum", (getattr(rollup, f"{field}_sum") or 0.0) + total)
+        setattr(rollup, f"{field}_count", (getattr(rollup, f"{field}_count") or 0) + n)
+
+
+def apply_buckets(buckets: Dict[Tuple[int, datetime], dict]):
+    """Merge aggregated buckets into the rollup table (caller commits)."""
+    from .. import db
+    from ..models import SensorRollup
+
+    for resolution in RESOLUTIONS:
+        keys = [bucket for res, bucket in buckets if res == resolution]
+        if not keys:
+            continue
+        existing = {
+            r.bucket_ts: r for r in SensorRollup.query.filter(
+                SensorRollup.resolution == resolution, SensorRollup.bucket_ts.in_(keys)
+            )
+        }
+        for bucket in keys:
+            rollup = existing.get(bucket)
+            if rollup is None:
+                rollup = SensorRollup(resolution=resolution, bucket_ts=bucket, count=0,
+                                      **{f"{field}_count": 0 for field in SENSOR_FIELDS})
+                db.session.add(rollup)
+            _merge(rollup, buckets[(resolution, bucket)])
+
+
+def checkpoint_id() -> int:
+    """Id of the newest SensorData row folded into the rollups (0 before the first run)."""
+    from .. import db
+    from ..models import RollupCheckpoint
+
+    checkpoint = db.session.get(RollupCheckpoint, CHECKPOINT)
+    return checkpoint.last_id if checkpoint else 0
+
+
+def compact(batch_size: int = 5000) -> int:
+    """Fold SensorData rows newer than the checkpoint into the rollups; returns rows folded.
+
+    Runs in the caller's app context. Each batch commits together with the advanced
+    checkpoint, so a crash never counts a row twice.
+    """
+    from .. import db
+    from ..models import RollupCheckpoint, SensorData
+
+    folded = 0
+    with compact_lock:
+        while True:
+            checkpoint = db.session.get(RollupCheckpoint, CHECKPOINT)
+            if checkpoint is None:
+                checkpoint = RollupCheckpoint(name=CHECKPOINT, last_id=0)
+                db.session.add(checkpoint)
+            rows = (SensorData.query.filter(SensorData.id > checkpoint.last_id)
+                    .order_by(SensorData.id).limit(batch_size).all())
+            if not rows:
+                db.session.commit()
+                return folded
+            try:
+                apply_buckets(aggregate(rows))
+                checkpoint.last_id = rows[-1].id
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            folded += len(rows)
+            if len(rows) < batch_size:
+                return folded
+
+
+def clear():
+    """Drop every rollup and the checkpoint (caller commits)."""
+    from ..models import RollupCheckpoint, SensorRollup
+
+    SensorRollup.query.delete()
+    RollupCheckpoint.query.delete()
+
+
+def rebuild(batch_size: int = 5000) -> int:
+    """Recompute all rollups from the raw SensorData rows; returns rows folded."""
+    from .. import db
+
+    with compact_lock:
+        clear()
+        db.session.commit()
+        return compact(batch_size)
+
+
+def serialize_rollup(rollup) -> dict:
+    out = {"ts": rollup.bucket_ts, "count": rollup.count}
+    for field in SENSOR_FIELDS:
+        n = getattr(rollup, f"{field}_count")
+        out[f"{field}_min"] = getattr(rollup, f"{field}_min")
+        out[f"{field}_max"] = getattr(rollup, f"{field}_max")
+        out[f"{field}_mean"] = getattr(rollup, f"{field}_sum") / n if n else None
+    return out
+
+
+def rollup_series(resolution: int, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  limit: Optional[int] = None) -> List[dict]:
+    """Buckets of one resolution with ``start <= bucket_ts < end``, oldest first."""
+    from ..models import SensorRollup
+
+    query = SensorRollup.query.filter(SensorRollup.resolution == resolution)
+    if start is not None:
+        query = query.filter(SensorRollup.bucket_ts >= bucket_start(start, resolution))
+    if end is not None:
+        query = query.filter(SensorRollup.bucket_ts < end)
+    if limit is not None:
+        # newest ``limit`` buckets, returned in chronological order
+        rows = query.order_by(SensorRollup.bucket_ts.desc()).limit(limit).all()[::-1]
+    else:
+        rows = query.order_by(SensorRollup.bucket_ts.asc()).all()
+    return [serialize_rollup(r) for r in rows]
@@ -0,0 +1,103 @@
+# gcs/services/sensor_frames.py
+"""Compact binary sensor frames for the AQSA uplink.
+
+Frame layout (version 1, little-endian, 40 bytes, no padding):
+
+    offset  size  type     field
+    0       1     uint8    version (= 1)
+    1       3     -        reserved (zero)
+    4       8     float64  timestamp, epoch seconds UTC (NaN = use server time)
+    12      4     float32  co_ppm
+    16      4     float32  no2_ppm
+    20      4     float32  nh3_ppm
+    24      4     float32  light_lux
+    28      4     float32  temp_c
+    32      4     float32  pressure_hpa
+    36      4     float32  humidity_pct
+
+Missing readings (and a missing timestamp) are sent as NaN; infinities and timestamps
+outside the datetime range are rejected. A body may hold any number of frames back to back.
+"""
+import math
+import struct
+from datetime import datetime
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to struct
+    np = None
+
+from .data_handler import SENSOR_FIELDS
+
+SENSOR_FRAME_MIMETYPE = "application/vnd.gcs.sensor-frame"
+FRAME_VERSION = 1
+FRAME_STRUCT = struct.Struct("<B3xd7f")
+FRAME_SIZE = FRAME_STRUCT.size  # 40 bytes
+
+if np is not None:
+    FRAME_DTYPE = np.dtype([
+        ("version", "u1"),
+        ("reserved", "V3"),
+        ("timestamp", "<f8"),
+    ] + [(field, "<f4") for field in SENSOR_FIELDS])
+
+
+def encode_frames(readings: List[dict]) -> bytes:
+    """Pack readings (dicts with epoch `timestamp` and sensor fields) into frames."""
+    out = bytearray()
+    for reading in readings:
+        ts = reading.get("timestamp")
+        values = [reading.get(field) for field in SENSOR_FIELDS]
+        out += FRAME_STRUCT.pack(
+            FRAME_VERSION,
+            float("nan") if ts is None else float(ts),
+            *[float("nan") if v is None else float(v) for v in values]
+        )
+    return bytes(out)
+
+
+def _to_payload(index: int, ts: float, values, source: str) -> dict:
+    payload = {"source": source}
+    if not math.isnan(ts):
+        try:
+            if not math.isfinite(ts):
+                raise ValueError(ts)
+            payload["timestamp"] = datetime.utcfromtimestamp(ts)
+        except (OverflowError, OSError, ValueError):
+            raise ValueError(f"Invalid timestamp at frame {index}") from None
+    for field, value in zip(SENSOR_FIELDS, values):
+        if math.isnan(value):
+            continue
+        if math.isinf(value):
+            raise ValueError(f"Non-finite {field} at frame {index}")
+        payload[field] = value
+    return payload
+
+
+def decode_frames(body: bytes, source: str = "payload") -> List[dict]:
+    """Decode a body of frames into sensor payload dicts (same keys as the JSON API).
+
+    Raises ValueError for a truncated body, an unsupported frame version, an infinite
+    reading or an out-of-range timestamp.
+    """
+    if not body or len(body) % FRAME_SIZE:
+        raise ValueError(f"Body length must be a non-zero multiple of {FRAME_SIZE} bytes")
+
+    if np is not None:
+        frames = np.frombuffer(body, dtype=FRAME_DTYPE)
+        bad = np.flatnonzero(frames["version"] != FRAME_VERSION)
+        if bad.size:
+            raise ValueError(f"Unsupported frame version at frame {int(bad[0])}")
+        # Column-wise conversion: one tolist() per field instead of per-frame unpacking
+        timestamps = frames["timestamp"].tolist()
+        columns = [frames[field].astype(np.float64).tolist() for field in SENSOR_FIELDS]
+        return [_to_payload(index, ts, values, source)
+                for index, (ts, values) in enumerate(zip(timestamps, zip(*columns)))]
+
+    payloads = []
+    for index, (version, ts, *values) in enumerate(FRAME_STRUCT.iter_unpack(body)):
+        if version != FRAME_VERSION:
+            raise ValueError(f"Unsupported frame version at frame {index}")
+        payloads.append(_to_payload(index, ts, values, source))
+    return payloads
@@ -0,0 +1,135 @@
+# gcs/services/table_stats.py
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import event, func, select
+
+TRACKED_TABLES = ("sensor_data", "target_detection", "system_log")
+_PENDING_KEY = "table_stats_pending"
+_RELOAD_KEY = "table_stats_reload"
+
+
+def _empty() -> dict:
+    return {"count": 0, "min_ts": None, "max_ts": None}
+
+
+def _naive_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    # Ingest may hand the ORM aware timestamps; the database (and load()) sees naive UTC
+    if ts is not None and ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _bump(entry: dict, ts: Optional[datetime], count: int = 1):
+    entry["count"] += count
+    if ts is not None:
+        entry["min_ts"] = ts if entry["min_ts"] is None else min(entry["min_ts"], ts)
+        entry["max_ts"] = ts if entry["max_ts"] is None else max(entry["max_ts"], ts)
+
+
+class TableStats:
+    """Live row counts and ts ranges per table and per target type, kept in memory.
+
+    Seeded once with GROUP BY queries, then kept current from ORM session events:
+    rows inserted in a flush are counted when their transaction commits (and dropped on
+    rollback). ORM deletes and bulk ``query.delete()`` on a tracked table make the next
+    commit re-seed from the database, since a deleted row may have held the min/max ts.
+    Reading the stats never touches the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables: Dict[str, dict] = {}
+        self._types: Dict[str, dict] = {}
+        self._loaded = False
+        self._installed = False
+        self.version: int = 0  # bumped on every change; used for HTTP ETags
+
+    def install(self, session):
+        """Hook the ORM session events (idempotent); ``session`` may be a scoped_session."""
+        if self._installed:
+            return
+        event.listen(session, "after_flush", self._after_flush)
+        event.listen(session, "do_orm_execute", self._on_execute)
+        event.listen(session, "after_commit", self._after_commit)
+        event.listen(session, "after_rollback", self._after_rollback)
+        self._installed = True
+
+    def load(self):
+        """(Re)seed every counter from the database; needs an app context."""
+        from .. import db
+        from ..models import SensorData, SystemLog, TargetDetection
+
+        # A connection of its own: this also runs from after_commit, where the session can't query
+        with db.engine.connect() as conn:
+            def _stats(model, *group_by):
+                columns = (*group_by, func.count(model.id), func.min(model.ts), func.max(model.ts))
+                return conn.execute(select(*columns).group_by(*group_by)).all()
+
+            tables = {name: _empty() for name in TRACKED_TABLES}
+            for name, model in (("sensor_data", SensorData), ("system_log", SystemLog)):
+                (count, min_ts, max_ts), = _stats(model)
+                tables[name] = {"count": count, "min_ts": min_ts, "max_ts": max_ts}
+            types = {}
+            for target_type, count, min_ts, max_ts in _stats(TargetDetection, TargetDetection.target_type):
+                types[target_type] = {"count": count, "min_ts": min_ts, "max_ts": max_ts}
+                _bump(tables["target_detection"], min_ts, 0)
+                _bump(tables["target_detection"], max_ts, count)
+
+        with self._lock:
+            self._tables, self._types = tables, types
+            self._loaded = True
+            self.version += 1
+
+    def snapshot(self) -> dict:
+        from ..models import LIVEDATA_TYPE
+
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            tables = {name: dict(entry) for name, entry in self._tables.items()}
+            types = {name: dict(entry) for name, entry in sorted(self._types.items(), key=lambda kv: str(kv[0]))}
+        # The database viewer and detection listings leave the livedata heartbeats out; like
+        # their SQL filter (target_type != 'livedata'), that drops NULL types as well
+        detections = _empty()
+        for name, entry in types.items():
+            if name is not None and name != LIVEDATA_TYPE:
+                _bump(detections, entry["min_ts"], 0)
+                _bump(detections, entry["max_ts"], entry["count"])
+        tables["target_detection"]["by_type"] = types
+        tables["target_detection"]["detections"] = detections
+        return {"tables": tables, "version": self.version}
+
+    def _after_flush(self, session, flush_context):
+        pending = session.info.setdefault(_PENDING_KEY, [])
+        for obj in session.new:
+            table = getattr(obj, "__tablename__", None)
+            if table in TRACKED_TABLES:
+                pending.append((table, getattr(obj, "target_type", None), _naive_utc(obj.ts)))
+        if any(getattr(obj, "__tablename__", None) in TRACKED_TABLES for obj in session.deleted):
+            session.info[_RELOAD_KEY] = True
+
+    def _on_execute(self, orm_execute_state):
+        mapper = orm_execute_state.bind_mapper
+        if orm_execute_state.is_delete and mapper is not None and mapper.local_table.name in TRACKED_TABLES:
+            orm_execute_state.session.info[_RELOAD_KEY] = True
+
+    def _after_commit(self, session):
+        pending = session.info.pop(_PENDING_KEY, None)
+        if session.info.pop(_RELOAD_KEY, False):
+            # Runs inside the committing code's app context
+            self.load()
+            return
+        if not pending or not self._loaded:
+            return
+        with self._lock:
+            for table, target_type, ts in pending:
+                _bump(self._tables.setdefault(table, _empty()), ts)
+                if table == "target_detection":
+                    _bump(self._types.setdefault(target_type, _empty()), ts)
+            self.version += 1
+
+    def _after_rollback(self, session):
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_RELOAD_KEY, None)
@@ -0,0 +1,195 @@
+import json
+import mimetypes
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from ..models import TargetDetection
+from .data_handler import naive_utc
+from .image_store import archive_image_stream, image_id, link_latest, parse_details
+
+
+def parse_ts(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp (with optional trailing Z) to naive UTC; None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        return naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except Exception:
+        return None
+
+
+def store_target_image_stream(stream, max_bytes: int) -> Tuple[str, Optional[str], bytes]:
+    """Stream a raw upload into the archive and refresh latest.jpg; returns (image_url, thumb_url, img_bytes)."""
+    archived_url, img_bytes = archive_image_stream(stream, max_bytes)
+    link_latest(archived_url)
+    return archived_url, None, img_bytes
+
+
+def buffer_latest_frame(device_id: Optional[str], image_url: str, img_bytes: bytes):
+    """Hand a just-received frame to the in-memory live buffer (/frames/...)."""
+    from .. import latest_frames
+
+    mimetype = mimetypes.guess_type(image_url)[0] or "application/octet-stream"
+    return latest_frames.put(device_id, img_bytes, image_id(image_url), mimetype)
+
+
+def _to_list(obj) -> list:
+    if obj is None:
+        return []
+    if isinstance(obj, list):
+        return obj
+    if isinstance(obj, dict):
+        # Check if this dict has the batch detection schema (target_type + details fields)
+        # If not, it's probably just a details object from the old API
+        if "target_type" in obj and "details" in obj:
+            return [obj]  # This is a single detection item
+        else:
+            return []  # This is just a details dict, not a detection item
+    if isinstance(obj, str):
+        # stringified JSON -> parse then recurse
+        try:
+            parsed = json.loads(obj)
+        except Exception:
+            return []
+        return _to_list(parsed)
+    return []
+
+
+def normalize_detections(raw_details: Any, legacy_target_type: Optional[str] = None,
+                         legacy_confidence: Any = None) -> list:
+    """Normalize `details` (object, array or JSON string) to a list of detection items."""
+    detections = _to_list(raw_details)
+
+    if not detections and legacy_target_type:
+        # Old-style API: target_type at top level, details is just the details object
+        legacy_details = parse_details(raw_details if raw_details is not None else {})
+
+        # Add top-level confidence to details if present
+        if legacy_confidence is not None:
+            legacy_details["confidence"] = float(legacy_confidence)
+
+        detections = [{
+            "target_type": legacy_target_type,
+            "details": legacy_details
+        }]
+    elif not detections and raw_details is not None:
+        # Have details but no target_type - use "unknown"
+        legacy_details = parse_details(raw_details)
+        # Accept even empty details
+        detections = [{
+            "target_type": "unknown",
+            "details": legacy_details
+        }]
+
+    return detections
+
+
+def build_detection_records(detections: list, image_url: str, top_ts: Optional[datetime],
+                            server_ts: datetime) -> Tuple[List[TargetDetection], List[dict]]:
+    """Build one TargetDetection row per detection item; returns (records, saved summaries)."""
+    records = []
+    saved = []
+    for det in detections:
+        # Validate/normalize one item
+        if not isinstance(det, dict):
+            continue
+        target_type = det.get("target_type") or "unknown"
+        details_obj = parse_details(det.get("details", {}))
+
+        # Merge top-level confidence into details if present
+        if "confidence" in det:
+            details_obj["confidence"] = det["confidence"]
+
+        ts = parse_ts(det.get("ts")) or top_ts or server_ts
+
+        records.append(TargetDetection(
+            ts=ts,
+            target_type=target_type,
+            details_json=details_obj,
+            image_url=image_url
+        ))
+        saved.append({
+            "target_type": target_type,
+            "ts": ts,
+            "details": details_obj
+        })
+    return records, saved
+
+
+def publish_detections(saved: List[dict], image_url: str, thumb_url: Optional[str],
+                       device_id: Optional[str], server_ts: datetime):
+    """Broadcast stored detections and feed the recent-detections window."""
+    from .. import socketio, recent_detections
+    from .logger import push_target_detected
+
+    created = len(saved)
+    accepted_detections = []
+    is_batch = (created > 1)  # Flag to suppress individual socket events for batches
+
+    for s in saved:
+        # Still call push_target_detected for logging, but skip socket emission for batches
+        # We'll emit a batch event instead
+        if not is_batch:
+            push_target_detected({
+                "ts": s["ts"],
+                "target_type": s["target_type"],
+                "details": s["details"],
+                "image_url": image_url,
+                "thumb_url": thumb_url,
+                "device_id": device_id
+            })
+        try:
+            # Use server timestamp seconds for de-dupe windowing
+            accepted = recent_detections.consider(
+                s["target_type"],
+                s["details"],
+                image_url,
+                server_ts=server_ts.timestamp(),
+            )
+            if accepted:
+                accepted_detections.append({
+                    "ts": accepted.ts,
+                    "type": accepted.type,
+                    "details": accepted.details,
+                    "image_url": accepted.image_url,
+                    "thumb_url": accepted.thumb_url
+                })
+        except Exception:
+            # non-fatal
+            pass
+
+    # Emit events based on ORIGINAL detection count (not filtered count)
+    # This prevents flickering when multiple detections arrive together
+    try:
+        if created == 1 and len(accepted_detections) == 1:
+            # Single detection - emit individual event
+            _emit_detection_event("recent_detection", accepted_detections[0], image_url, device_id)
+        elif created > 1 and len(accepted_detections) > 0:
+            # Multiple detections sent together - always emit batch event
+            # Even if some were filtered by deduplication
+            _emit_detection_event("target_batch", {
+                "count": len(accepted_detections),
+                "image_url": image_url,
+                "thumb_url": thumb_url,
+                "device_id": device_id,
+                "detections": accepted_detections
+            }, image_url, device_id)
+        # If all detections were filtered (len(accepted_detections) == 0), emit nothing
+    except Exception:
+        pass
+
+
+def _emit_detection_event(event: str, payload: dict, image_url: str, device_id: Optional[str]):
+    """Emit on /stream; image subscribers get the frame attached as binary ``image``."""
+    from .. import socketio, image_push
+    from .image_push import IMAGE_ROOM
+
+    subscribers = image_push.subscribers()
+    preview = image_push.preview(image_url, device_id) if subscribers else None
+    if preview is None:
+        socketio.emit(event, payload, namespace="/stream")
+        return
+    image, mimetype = preview
+    socketio.emit(event, {**payload, "image": image, "image_mimetype": mimetype},
+                  to=IMAGE_ROOM, namespace="/stream")
+    socketio.emit(event, payload, namespace="/stream", skip_sid=subscribers)
@@ -4,36 +4,61 @@ from threading import RLock
 from time import time
 
 class ThroughputMeter:
-    """Rolling average throughput calculator in kb/s."""
+    """Rolling average throughput calculator in kb/s.
+
+    Each sample records wire bytes (as received, possibly compressed) and decoded
+    bytes (after Content-Encoding is removed) so the live compression ratio is visible.
+    """
     def __init__(self, window_sec: float = 4.0):
         self.window = window_sec
         self._lock = RLock()
-        self._streams = {"AQSA": deque(), "TAIP": deque()}  # (ts, bytes)
+        self._streams = {"AQSA": deque(), "TAIP": deque()}  # (ts, wire_bytes, decoded_bytes)
 
-    def add(self, stream: str, nbytes: int):
+    def add(self, stream: str, nbytes: int, decoded_bytes: int = None):
         if stream not in self._streams or nbytes is None:
             return
+        if decoded_bytes is None:
+            decoded_bytes = nbytes
         now = time()
         with self._lock:
             q = self._streams[stream]
-            q.append((now, nbytes))
+            q.append((now, nbytes, decoded_bytes))
             cutoff = now - self.window
             while q and q[0][0] < cutoff:
                 q.popleft()
 
-    def kbps(self, stream: str) -> float:
+    def _totals(self, stream: str):
         now = time()
         with self._lock:
             q = self._streams[stream]
             cutoff = now - self.window
-            total_bytes = sum(b for t, b in q if t >= cutoff)
-        return round((total_bytes / self.window) * 8 / 1000, 2)  # kb/s
+            wire = sum(b for t, b, _ in q if t >= cutoff)
+            decoded = sum(d for t, _, d in q if t >= cutoff)
+        return wire, decoded
+
+    def _kbps(self, nbytes: int) -> float:
+        return round((nbytes / self.window) * 8 / 1000, 2)  # kb/s
+
+    def kbps(self, stream: str) -> float:
+        return self._kbps(self._totals(stream)[0])
+
+    def decoded_kbps(self, stream: str) -> float:
+        return self._kbps(self._totals(stream)[1])
+
+    def compression_ratio(self, stream: str) -> float:
+        """Decoded / wire bytes over the window (1.0 when nothing is compressed)."""
+        wire, decoded = self._totals(stream)
+        return round(decoded / wire, 2) if wire else 1.0
 
     def snapshot(self) -> dict:
         return {
             "window_sec": self.window,
             "aqsa_kbps": self.kbps("AQSA"),
             "taip_kbps": self.kbps("TAIP"),
+            "aqsa_decoded_kbps": self.decoded_kbps("AQSA"),
+            "taip_decoded_kbps": self.decoded_kbps("TAIP"),
+            "aqsa_compression_ratio": self.compression_ratio("AQSA"),
+            "taip_compression_ratio": self.compression_ratio("TAIP"),
             "ts": time(),
         }
 
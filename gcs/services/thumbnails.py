@@ -0,0 +1,207 @@
+# gcs/services/thumbnails.py
+import atexit
+import io
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; cards fall back to the full image
+    Image = None
+
+from .image_store import ARCHIVE_URL_PREFIX, PACK_URL_PREFIX, _atomic_write, image_id, open_archive, prune_empty_dirs
+
+logger = logging.getLogger('uav_gcs')
+
+THUMB_DIR = Path("gcs/static/targets/thumbs")
+THUMB_URL_PREFIX = "/static/targets/thumbs/"
+THUMB_QUALITY = 70
+
+_WAKE = object()  # posted by stop(), one per worker
+
+
+def thumb_url_for(image_url: str) -> Optional[str]:
+    """Thumbnail URL for an archived frame (same shard and content hash, always .jpg)."""
+    if not image_url:
+        return None
+    if image_url.startswith(PACK_URL_PREFIX):
+        # Packed frames have no shard; spread their thumbnails by hash prefix instead
+        digest = image_id(image_url)
+        return f"{THUMB_URL_PREFIX}{digest[:2]}/{digest}.jpg"
+    if not image_url.startswith(ARCHIVE_URL_PREFIX):
+        return None
+    rel = Path(image_url[len(ARCHIVE_URL_PREFIX):]).with_suffix(".jpg")
+    return THUMB_URL_PREFIX + rel.as_posix()
+
+
+def thumb_path(thumb_url: str) -> Path:
+    return THUMB_DIR / thumb_url[len(THUMB_URL_PREFIX):]
+
+
+def remove_thumbnail(image_url: str):
+    thumb_url = thumb_url_for(image_url)
+    if thumb_url:
+        path = thumb_path(thumb_url)
+        path.unlink(missing_ok=True)
+        prune_empty_dirs(path, THUMB_DIR)
+
+
+def existing_thumb_url(image_url: str) -> Optional[str]:
+    """The thumbnail URL if it has already been generated, else None."""
+    url = thumb_url_for(image_url)
+    if url and thumb_path(url).exists():
+        return url
+    return None
+
+
+def render_thumbnail(src, max_size: int) -> bytes:
+    """JPEG bytes of ``src`` (path or file object) scaled down to fit in ``max_size``."""
+    with Image.open(src) as img:
+        # JPEG draft mode decodes at 1/2, 1/4 or 1/8 scale - far cheaper than a full decode
+        img.draft("RGB", (max_size, max_size))
+        img.thumbnail((max_size, max_size))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, "JPEG", quality=THUMB_QUALITY, optimize=True)
+        return out.getvalue()
+
+
+def make_thumbnail(src, dst: Path, max_size: int):
+    """Write a JPEG thumbnail of ``src`` (path or file object) that fits in ``max_size``."""
+    data = render_thumbnail(src, max_size)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(dst, data)
+
+
+class ThumbnailWorker:
+    """Background pool that renders small JPEG thumbnails of archived target frames.
+
+    When a thumbnail is ready the recent-detections window is updated and a
+    ``thumbnail_ready`` event (``image_url``, ``thumb_url``) goes out on /stream so clients
+    can swap it in. Thumbnails are a nicety: without Pillow, or when the queue is full,
+    the request is dropped and cards keep showing the full image.
+    """
+
+    def __init__(self, workers: int = 1, max_queue: int = 64, max_size: int = 320):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_size = max_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._generated = 0
+        self._failed = 0
+        self._dropped = 0
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        """Start the workers (idempotent); a no-op without Pillow."""
+        if self.running or not self.available:
+            return
+        self._threads = [
+            threading.Thread(target=self._run, name=f"thumbnailer-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+        atexit.register(self.stop)
+        logger.info(f"Thumbnail worker enabled (workers={self.workers}, size={self.max_size}px)")
+
+    def configure(self, workers: int, max_queue: int, max_size: int):
+        """Apply sizing from app config; only valid before the workers start."""
+        if self.running:
+            return
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_size = max_size
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def submit(self, image_url: str) -> bool:
+        """Request a thumbnail for an archived frame; False if it was not queued."""
+        thumb_url = thumb_url_for(image_url)
+        if thumb_url is None:
+            return False
+        if thumb_path(thumb_url).exists():
+            # Duplicate frame (content-addressed archive): the thumbnail already exists
+            self._announce(image_url, thumb_url)
+            return False
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(image_url)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            return False
+
+    def flush(self):
+        """Block until every queued thumbnail has been rendered (or failed)."""
+        if self.running:
+            self._queue.join()
+
+    def stop(self):
+        if not self.running:
+            return
+        for _ in self._threads:
+            self._queue.put(_WAKE)
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "enabled": self.running,
+                "pending": self._queue.qsize(),
+                "generated": self._generated,
+                "failed": self._failed,
+                "dropped": self._dropped,
+            }
+
+    def _run(self):
+        while True:
+            image_url = self._queue.get()
+            try:
+                if image_url is _WAKE:
+                    return
+                self._render(image_url)
+            finally:
+                self._queue.task_done()
+
+    def _render(self, image_url: str):
+        thumb_url = thumb_url_for(image_url)
+        dst = thumb_path(thumb_url)
+        try:
+            if not dst.exists():
+                with open_archive(image_url) as src:
+                    make_thumbnail(src, dst, self.max_size)
+            with self._stats_lock:
+                self._generated += 1
+        except Exception as e:
+            with self._stats_lock:
+                self._failed += 1
+            logger.warning(f"Thumbnail failed for {image_url}: {str(e)}")
+            return
+        self._announce(image_url, thumb_url)
+
+    def _announce(self, image_url: str, thumb_url: str):
+        from .. import socketio, recent_detections
+
+        recent_detections.set_thumb(image_url, thumb_url)
+        try:
+            socketio.emit("thumbnail_ready", {"image_url": image_url, "thumb_url": thumb_url},
+                          namespace="/stream")
+        except Exception:
+            pass
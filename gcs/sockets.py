@@ -1,8 +1,21 @@
-from flask import Blueprint, request
-from flask_socketio import join_room
-
-from . import socketio
-from .services.logger import log_info, log_error
+import json
+import queue
+from datetime import datetime
+
+from flask import Blueprint, current_app, request
+from flask_socketio import join_room, leave_room
+
+from . import socketio, throughput_meter, image_writer, thumbnailer, image_push
+from .middleware import check_api_key
+from .services.data_handler import (
+    build_sensor_record, persist_records, serialize_sensor, validate_sensor_payload,
+)
+from .services.image_store import decode_b64_image, get_image_url, archive_url_for, validate_image_bytes
+from .services.image_push import IMAGE_ROOM
+from .services.logger import log_info, log_error, push_sensor_update, push_sensor_batch
+from .services.target_ingest import (
+    parse_ts, normalize_detections, build_detection_records, publish_detections, buffer_latest_frame,
+)
 
 bp = Blueprint("sockets", __name__)
 
@@ -57,6 +70,140 @@ def send_display_command(device_id, mode):
     socketio.emit("set_display", {"mode": mode}, room=device_id)
 
 
+# Payload ingest over the persistent connection (same validation/persistence as the
+# HTTP API). The handler's return value is delivered as the Socket.IO ack.
+def _payload_size(data) -> int:
+    """Approximate wire size of an event payload (binary attachments counted raw)."""
+    try:
+        binary = 0
+        if isinstance(data, dict):
+            binary = sum(len(v) for v in data.values() if isinstance(v, (bytes, bytearray)))
+        return binary + len(json.dumps(data, separators=(",", ":"), default=lambda o: None))
+    except Exception:
+        return 0
+
+
+def _authorized(data) -> bool:
+    provided = request.headers.get("X-API-Key")
+    if not provided and isinstance(data, dict):
+        provided = data.get("api_key")
+    return check_api_key(provided)
+
+
+@socketio.on("sensor_reading")
+def handle_sensor_reading(data):
+    """Ingest one sensor reading (object) or several (array); acks with stored ids."""
+    try:
+        if not _authorized(data):
+            return {"ok": False, "error": "Invalid or missing API key"}
+        
+        throughput_meter.add("AQSA", _payload_size(data))
+        
+        readings = data if isinstance(data, list) else [data]
+        if not readings:
+            return {"ok": False, "error": "At least one sensor reading is required"}
+        
+        errors = []
+        for index, item in enumerate(readings):
+            error = validate_sensor_payload(item)
+            if error:
+                errors.append({"index": index, "error": error})
+        if errors:
+            return {"ok": False, "error": errors[0]["error"], "errors": errors}
+        
+        records = [build_sensor_record(item) for item in readings]
+        record_dicts = [serialize_sensor(rec) for rec in records]
+        try:
+            seqs = persist_records(records)
+        except queue.Full:
+            return {"ok": False, "error": "Ingest queue full, retry later"}
+        
+        if len(record_dicts) == 1:
+            push_sensor_update(record_dicts[0])
+        else:
+            push_sensor_batch(record_dicts)
+        
+        if seqs is not None:
+            return {"ok": True, "queued": True, "seq": seqs}
+        return {"ok": True, "ids": [rec.id for rec in records]}
+    
+    except Exception as e:
+        log_error(f"Socket sensor_reading error: {str(e)}")
+        return {"ok": False, "error": "Internal server error"}
+
+
+@socketio.on("target_batch_upload")
+def handle_target_batch_upload(data):
+    """
+    Ingest detections like POST /api/targets (JSON form). The frame may be sent as a
+    binary attachment in `image` (no base64 overhead) or as `image_b64`.
+    Acks with the stored row ids and image URL.
+    """
+    try:
+        if not isinstance(data, dict):
+            return {"ok": False, "error": "Payload must be an object"}
+        if not _authorized(data):
+            return {"ok": False, "error": "Invalid or missing API key"}
+        
+        throughput_meter.add("TAIP", _payload_size(data))
+        
+        server_ts = datetime.utcnow()
+        device_id = data.get("device_id")
+        top_ts = parse_ts(data.get("ts"))
+        raw_details = data.get("details")
+        legacy_target_type = data.get("target_type")
+        
+        # Same checks as the HTTP upload paths: binary JPEG/PNG/GIF, at most MAX_IMAGE_BYTES
+        max_bytes = current_app.config.get("MAX_IMAGE_BYTES", 16 * 1024 * 1024)
+        img_bytes = None
+        try:
+            if data.get("image") is not None:
+                img_bytes = validate_image_bytes(data["image"], max_bytes)
+            elif "image_b64" in data:
+                img_bytes = decode_b64_image(data["image_b64"], max_bytes)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        if img_bytes is None and raw_details is None:
+            return {"ok": False, "error": "image or details required"}
+        
+        archived_url, thumb_url = None, None
+        if img_bytes:
+            archived_url = archive_url_for(img_bytes)
+        
+        detections = normalize_detections(raw_details, legacy_target_type, data.get("confidence"))
+        if not detections:
+            return {"ok": False, "error": "No detections found in 'details'"}
+        
+        image_url = archived_url or get_image_url()
+        records, saved = build_detection_records(detections, image_url, top_ts, server_ts)
+        try:
+            seqs = persist_records(records)
+        except queue.Full:
+            return {"ok": False, "error": "Ingest queue full, retry later"}
+        
+        def _publish():
+            publish_detections(saved, image_url, thumb_url, device_id, server_ts)
+            if archived_url:
+                thumbnailer.submit(archived_url)
+
+        if archived_url:
+            buffer_latest_frame(device_id, archived_url, img_bytes)
+            image_writer.submit(archived_url, img_bytes, on_done=_publish)
+        else:
+            _publish()
+        
+        ack = {"ok": True, "saved": len(records), "image_url": image_url, "thumb_url": thumb_url}
+        if seqs is not None:
+            ack.update({"queued": True, "seq": seqs})
+        else:
+            ack["ids"] = [rec.id for rec in records]
+        return ack
+    
+    except Exception as e:
+        log_error(f"Socket target_batch_upload error: {str(e)}")
+        return {"ok": False, "error": "Internal server error"}
+
+
 # Stream namespace handlers (existing)
 @socketio.on("connect", namespace="/stream")
 def handle_connect_stream():
@@ -67,6 +214,7 @@ def handle_connect_stream():
 
 @socketio.on("disconnect", namespace="/stream")
 def handle_disconnect_stream():
+    image_push.unsubscribe(request.sid)
     client_ip = request.remote_addr
     log_info(f"Client disconnected from /stream from {client_ip}")
 
@@ -79,3 +227,16 @@ def handle_error_stream(error):
 @socketio.on("ping", namespace="/stream")
 def handle_ping_stream():
     socketio.emit("pong", {"timestamp": "now"}, namespace="/stream")
+
+
+@socketio.on("subscribe_images", namespace="/stream")
+def handle_subscribe_images(data=None):
+    """Opt in (or out with {"enabled": false}) to frames attached to detection events."""
+    enabled = bool(data.get("enabled", True)) if isinstance(data, dict) else True
+    if enabled:
+        join_room(IMAGE_ROOM)
+        image_push.subscribe(request.sid)
+    else:
+        leave_room(IMAGE_ROOM)
+        image_push.unsubscribe(request.sid)
+    return {"ok": True, "images": enabled}
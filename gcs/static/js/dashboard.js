@@ -55,18 +55,92 @@ function formatDetails(type, details) {
     }
 }
 
+// ETag of the frame currently shown in #det-img; polls revalidate instead of cache-busting,
+// so an unchanged latest.jpg costs a bodiless 304
+let latestImageEtag = null;
+let latestImageObjectUrl = null;
+
+async function refreshLatestImage(img) {
+    try {
+        const res = await fetch('/targets/latest.jpg', { cache: 'no-cache' });
+        if (!res.ok) return;
+        const etag = res.headers.get('ETag');
+        if (etag && etag === latestImageEtag && img.src === latestImageObjectUrl) return;
+        const blob = await res.blob();
+        if (latestImageObjectUrl) URL.revokeObjectURL(latestImageObjectUrl);
+        latestImageObjectUrl = URL.createObjectURL(blob);
+        latestImageEtag = etag;
+        img.src = latestImageObjectUrl;
+    } catch (err) {
+        // Image not available
+    }
+}
+
+// Long-poll the in-memory frame buffer: the server answers as soon as a newer frame
+// arrives (or with a 304 after ~25s), so there is no polling timer
+async function watchLatestFrame(img) {
+    for (;;) {
+        try {
+            const headers = latestImageEtag ? { 'If-None-Match': latestImageEtag } : {};
+            const res = await fetch('/frames/latest.jpg?wait=25', { cache: 'no-store', headers });
+            if (res.status === 200) {
+                const blob = await res.blob();
+                if (latestImageObjectUrl) URL.revokeObjectURL(latestImageObjectUrl);
+                latestImageObjectUrl = URL.createObjectURL(blob);
+                latestImageEtag = res.headers.get('ETag');
+                img.src = latestImageObjectUrl;
+                continue;
+            }
+            if (res.status === 304) continue;
+        } catch (err) {
+            // Server unreachable; retry below
+        }
+        await new Promise((resolve) => setTimeout(resolve, 3500));
+    }
+}
+
+// Object URLs for frames pushed with detection events, keyed by archive URL
+const pushedImages = new Map();
+
+function rememberPushedImage(event) {
+    if (!event.image || !event.image_url) return null;
+    let objectUrl = pushedImages.get(event.image_url);
+    if (!objectUrl) {
+        objectUrl = URL.createObjectURL(new Blob([event.image], { type: event.image_mimetype || 'image/jpeg' }));
+        pushedImages.set(event.image_url, objectUrl);
+        if (pushedImages.size > 50) {
+            const [oldestUrl, oldestObjectUrl] = pushedImages.entries().next().value;
+            URL.revokeObjectURL(oldestObjectUrl);
+            pushedImages.delete(oldestUrl);
+        }
+    }
+    return objectUrl;
+}
+
+// Archive frames are content-addressed (cached as immutable); only latest.jpg needs revalidating
+function showPreviewImage(img, url) {
+    if (!url || url.endsWith('/latest.jpg')) {
+        refreshLatestImage(img);
+        return;
+    }
+    const pushed = pushedImages.get(url);
+    if (!pushed) {
+        img.src = url;
+        return;
+    }
+    // Show the pushed preview at once, then swap in the full frame when it has loaded
+    img.src = pushed;
+    const full = new Image();
+    full.onload = () => {
+        if (img.src === pushed) img.src = url;
+    };
+    full.src = url;
+}
+
 function refreshDetection(meta) {
     const img = document.getElementById('det-img');
     if (img) {
-        img.src = '/static/targets/latest.jpg?bust=' + Date.now();
-        
-        img.onerror = function() {
-            // Image not available
-        };
-        
-        img.onload = function() {
-            // Image loaded successfully
-        };
+        refreshLatestImage(img);
     }
 
     // If meta is provided, use the new setMultiplePreviews function instead of overwriting structure
@@ -76,6 +150,8 @@ function refreshDetection(meta) {
 }
 
 socket.on("connect", () => {
+    // Ask for detection frames inline (binary attachment) instead of a follow-up fetch
+    socket.emit("subscribe_images", { enabled: true });
     document.title = "UAV GCS - Connected";
     updateConnectionStatus("connected");
     addLogEntry("info", "Connected to GCS stream");
@@ -218,6 +294,11 @@ socket.on("target_detected", (e) => {
 socket.on("throughput_update", data => {
     document.getElementById("tp-aqsa").textContent = data.aqsa_kbps ?? "--";
     document.getElementById("tp-taip").textContent = data.taip_kbps ?? "--";
+    // Decoded rate and compression ratio for compressed uploads (hover to see)
+    document.getElementById("tp-aqsa").title =
+        `decoded ${data.aqsa_decoded_kbps ?? "--"} kb/s (x${data.aqsa_compression_ratio ?? 1})`;
+    document.getElementById("tp-taip").title =
+        `decoded ${data.taip_decoded_kbps ?? "--"} kb/s (x${data.taip_compression_ratio ?? 1})`;
     document.getElementById("tp-time").textContent =
         `Updated: ${new Date(data.ts * 1000).toLocaleTimeString()}`;
 });
@@ -228,6 +309,8 @@ let batchTimeout = null;
 
 socket.on('recent_detection', (item) => {
     console.log('DEBUG: Recent detection received:', item);
+    const pushed = rememberPushedImage(item);
+    if (pushed && item.thumb_url === item.image_url) item.thumb_url = pushed;
     addRecentItem(item);
     
     // Add to batch
@@ -262,9 +345,15 @@ socket.on('recent_detection', (item) => {
 
 // Handle batch detections to prevent flickering
 socket.on('target_batch', (batchData) => {
+    const pushed = rememberPushedImage(batchData);
     // Convert all detections to recent detection format and sort by timestamp
     const recentItems = batchData.detections
         .sort((a, b) => a.ts - b.ts); // Sort by timestamp to maintain order
+    if (pushed) {
+        recentItems.forEach(item => {
+            if (item.thumb_url === item.image_url) item.thumb_url = pushed;
+        });
+    }
     
     // Add all detections to the recent list in order
     recentItems.forEach(item => {
@@ -277,6 +366,15 @@ socket.on('target_batch', (batchData) => {
     }
 });
 
+// Swap full-size frames on the recent cards for their thumbnail once it has been rendered
+socket.on('thumbnail_ready', (data) => {
+    document.querySelectorAll('#recent-list img[data-image-url]').forEach(img => {
+        if (img.dataset.imageUrl === data.image_url) {
+            img.src = data.thumb_url;
+        }
+    });
+});
+
 function updateDataCounters() {
     const dataCountElement = document.getElementById("data-count");
     if (dataCountElement) {
@@ -316,6 +414,27 @@ function setupDeviceControls() {
     });
 }
 
+// Live feed page: one long-lived MJPEG connection; the server drops frames if we fall behind
+function setupLiveFeed() {
+    const img = document.getElementById('live-feed-img');
+    if (!img) return;
+    const status = document.getElementById('feed-status');
+    const connect = () => {
+        img.src = `/frames/live.mjpeg?t=${Date.now()}`;
+        if (status) status.textContent = 'Status: connecting';
+    };
+    img.addEventListener('load', () => {
+        if (status) status.textContent = 'Status: live';
+        set('feed-timestamp', `Last update: ${new Date().toLocaleTimeString()}`);
+    });
+    img.addEventListener('error', () => {
+        if (status) status.textContent = 'Status: disconnected';
+        setTimeout(connect, 3500);
+    });
+    const refreshBtn = document.getElementById('refresh-feed');
+    if (refreshBtn) refreshBtn.addEventListener('click', connect);
+}
+
 async function sendDisplayCommand(deviceId, mode) {
     const controlStatus = document.getElementById('control-status');
     
@@ -454,6 +573,8 @@ document.addEventListener("DOMContentLoaded", async () => {
     // Device control functionality
     setupDeviceControls();
     
+    setupLiveFeed();
+    
     // Load data
     updateDataCounters();
     
@@ -465,7 +586,10 @@ document.addEventListener("DOMContentLoaded", async () => {
     
     refreshDetection();
     
-    setInterval(() => refreshDetection(), 3500);
+    const detImg = document.getElementById('det-img');
+    if (detImg) {
+        watchLatestFrame(detImg);
+    }
 });
 
 async function loadLatestSensorData() {
@@ -513,7 +637,7 @@ async function loadRecentTargets() {
                     li.innerHTML = `
                         <div class="target-item">
                             <div class="target-image">
-                                <img src="${target.image_url || '/static/targets/latest.jpg'}" alt="${target.target_type}" onerror="this.src='/static/targets/latest.jpg'">
+                                <img src="${target.image_url || '/targets/latest.jpg'}" alt="${target.target_type}" onerror="this.src='/targets/latest.jpg'">
                             </div>
                             <div class="target-content">
                                 <div class="target-header">
@@ -599,7 +723,7 @@ function addRecentItem(item) {
     li.innerHTML = `
         <div class="target-item">
             <div class="target-image">
-                <img src="${item.thumb_url || item.image_url || '/static/targets/latest.jpg'}" alt="${item.type}" onerror="this.src='/static/targets/latest.jpg'">
+                <img src="${item.thumb_url || item.image_url || '/targets/latest.jpg'}" data-image-url="${item.image_url || ''}" alt="${item.type}" onerror="this.src='/targets/latest.jpg'">
             </div>
             <div class="target-content">
                 <div class="target-header">
@@ -627,8 +751,7 @@ function setPreview(item) {
     const meta = document.getElementById('det-meta');
     
     if (img) {
-        const newSrc = item.image_url + '?v=' + Date.now();
-        img.src = newSrc;
+        showPreviewImage(img, item.image_url);
     }
     if (meta) {
         // Format details based on target type
@@ -694,8 +817,7 @@ function setMultiplePreviews(items) {
     
     // Update image
     if (img && items.length > 0) {
-        const newSrc = items[0].image_url + '?v=' + Date.now();
-        img.src = newSrc;
+        showPreviewImage(img, items[0].image_url);
     }
     
     // Update header time and count
@@ -802,7 +924,8 @@ function switchToLiveCamera() {
     // Reset image to live feed
     const img = document.getElementById('det-img');
     if (img) {
-        img.src = '/static/targets/latest.jpg?v=' + Date.now();
+        latestImageEtag = null;
+        refreshLatestImage(img);
     }
     
     // Reset metadata to show live status - but preserve the fixed structure
@@ -12,6 +12,16 @@ const socket = io(ns, {
 
 // Chart configuration
 const MAX_DATA_POINTS = 100;
+// /api/sensor-history series -> [chart key, display decimals]
+const HISTORY_FIELDS = {
+    co_ppm: ['co', 2],
+    no2_ppm: ['no2', 2],
+    nh3_ppm: ['nh3', 2],
+    temp_c: ['temp', 1],
+    pressure_hpa: ['press', 1],
+    humidity_pct: ['hum', 1],
+    light_lux: ['light', 0]
+};
 let dataPointCount = 0;
 
 // Chart instances
@@ -297,7 +307,9 @@ function updateStatus() {
 // Load historical data
 async function loadHistoricalData() {
     try {
-        const response = await fetch('/api/sensor-history?limit=100');
+        // Every stored reading, downsampled server-side to what a chart can show. No time
+        // window: a flight recorded earlier (or a GCS clock off from the browser's) still shows
+        const response = await fetch(`/api/sensor-history?max_points=${MAX_DATA_POINTS}`);
         if (!response.ok) {
             console.warn('Historical data endpoint not available, starting with live data only');
             return;
@@ -305,52 +317,21 @@ async function loadHistoricalData() {
         
         const data = await response.json();
         
-        if (data && data.length > 0) {
-            console.log(`Loading ${data.length} historical data points`);
+        if (data && data.rows > 0) {
+            console.log(`Loading ${data.rows} historical readings (downsampled to ${data.max_points} points)`);
             
             // Batch load historical data for better performance
-            data.forEach(record => {
-                const timestamp = record.ts ? new Date(record.ts) : new Date();
-                const timeLabel = formatTime(timestamp);
+            Object.entries(HISTORY_FIELDS).forEach(([field, [chartKey, decimals]]) => {
+                const series = data.series[field];
+                if (!series || series.values.length === 0) return;
                 
                 // Add data points to arrays without updating charts
-                if (record.co_ppm !== undefined && record.co_ppm !== null) {
-                    chartData.co.labels.push(timeLabel);
-                    chartData.co.data.push(record.co_ppm);
-                    updateValueDisplay('co', record.co_ppm, 2);
-                }
-                if (record.no2_ppm !== undefined && record.no2_ppm !== null) {
-                    chartData.no2.labels.push(timeLabel);
-                    chartData.no2.data.push(record.no2_ppm);
-                    updateValueDisplay('no2', record.no2_ppm, 2);
-                }
-                if (record.nh3_ppm !== undefined && record.nh3_ppm !== null) {
-                    chartData.nh3.labels.push(timeLabel);
-                    chartData.nh3.data.push(record.nh3_ppm);
-                    updateValueDisplay('nh3', record.nh3_ppm, 2);
-                }
-                if (record.temp_c !== undefined && record.temp_c !== null) {
-                    chartData.temp.labels.push(timeLabel);
-                    chartData.temp.data.push(record.temp_c);
-                    updateValueDisplay('temp', record.temp_c, 1);
-                }
-                if (record.pressure_hpa !== undefined && record.pressure_hpa !== null) {
-                    chartData.press.labels.push(timeLabel);
-                    chartData.press.data.push(record.pressure_hpa);
-                    updateValueDisplay('press', record.pressure_hpa, 1);
-                }
-                if (record.humidity_pct !== undefined && record.humidity_pct !== null) {
-                    chartData.hum.labels.push(timeLabel);
-                    chartData.hum.data.push(record.humidity_pct);
-                    updateValueDisplay('hum', record.humidity_pct, 1);
-                }
-                if (record.light_lux !== undefined && record.light_lux !== null) {
-                    chartData.light.labels.push(timeLabel);
-                    chartData.light.data.push(record.light_lux);
-                    updateValueDisplay('light', record.light_lux, 0);
-                }
-                
-                dataPointCount++;
+                series.ts.forEach((ts, i) => {
+                    chartData[chartKey].labels.push(formatTime(new Date(ts)));
+                    chartData[chartKey].data.push(series.values[i]);
+                });
+                updateValueDisplay(chartKey, series.values[series.values.length - 1], decimals);
+                dataPointCount = Math.max(dataPointCount, series.values.length);
             });
             
             // Now update all charts once with the batched data
@@ -403,7 +384,12 @@ socket.on('reconnect', (attemptNumber) => {
 
 socket.on('sensor_update', (data) => {
     console.log('Sensor update received:', data);
-    updateAllCharts(data);
+    if (Array.isArray(data.batch)) {
+        // Coalesced batch from /api/sensors/batch - plot every reading in order
+        data.batch.forEach(reading => updateAllCharts(reading));
+    } else {
+        updateAllCharts(data);
+    }
 });
 
 // Update connection status indicator
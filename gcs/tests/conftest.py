@@ -0,0 +1,39 @@
+import pytest
+
+from config import Config
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_database(tmp_path_factory):
+    """Point every app created by the suite at a scratch SQLite file.
+
+    The engine is bound when create_app() runs, and pytest-flask's autouse fixtures pull in
+    the test modules' ``app`` fixtures before any function-scoped autouse fixture, so this is
+    session-scoped to be in place first; the checked-in instance database is never touched.
+    """
+    mp = pytest.MonkeyPatch()
+    mp.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path_factory.mktemp('db') / 'gcs-test.db'}")
+    # Tests that exercise the rollups drive compaction themselves
+    mp.setattr(Config, "ROLLUPS_ENABLED", False)
+    yield
+    mp.undo()
+
+
+@pytest.fixture(autouse=True)
+def scratch_workdir(tmp_path, monkeypatch):
+    """Run each test from its own directory; image_store writes relative to the cwd.
+
+    The image writer and thumbnailer keep writing after a request returns, so they are
+    drained and stopped here, before the working directory is restored.
+    """
+    from gcs import image_writer, thumbnailer
+    from gcs.services import image_store
+
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    image_writer.flush()
+    thumbnailer.flush()
+    image_writer.stop()
+    thumbnailer.stop()
+    image_store.forget_latest()
+    image_store.archive_index.reset()
@@ -1,9 +1,14 @@
+import io
+import json
+
 import pytest
 from datetime import datetime
 
 from gcs import create_app, db
 from gcs.models import SensorData, TargetDetection
-from gcs.services.data_handler import ingest_sensor_json, ingest_target_json
+from gcs.services.data_handler import (
+    ingest_sensor_json, ingest_sensor_batch, ingest_target_json, ingest_ndjson_stream, validate_sensor_payload,
+)
 
 
 @pytest.fixture
@@ -74,6 +79,28 @@ def test_ingest_sensor_json_invalid_timestamp(app):
         assert record.ts is not None  # Should use server time
 
 
+def test_ingest_sensor_batch(app):
+    with app.app_context():
+        payloads = [
+            {"timestamp": "2025-01-15T10:30:00Z", "co_ppm": 1.0},
+            {"timestamp": "2025-01-15T10:30:01Z", "co_ppm": 2.0, "source": "aqsa"}
+        ]
+        
+        records = ingest_sensor_batch(payloads)
+        
+        assert len(records) == 2
+        assert all(record.id is not None for record in records)
+        assert records[0].co_ppm == 1.0
+        assert records[1].source == "aqsa"
+
+
+def test_validate_sensor_payload():
+    assert validate_sensor_payload({"co_ppm": 1.0}) is None
+    assert "At least one" in validate_sensor_payload({"source": "x"})
+    assert "Invalid value for temp_c" in validate_sensor_payload({"temp_c": "warm"})
+    assert validate_sensor_payload(["co_ppm"]) is not None
+
+
 def test_ingest_target_json_valid_data(app):
     with app.app_context():
         payload = {
@@ -118,3 +145,36 @@ def test_ingest_target_json_invalid_timestamp(app):
         assert record.id is not None
         assert record.target_type == "aruco"
         assert record.ts is not None  # Should use server time
+
+
+def test_ndjson_target_offsets_stored_as_naive_utc(app):
+    lines = [
+        {"timestamp": "2025-01-15T20:30:00+10:00", "target_type": "gauge", "details": {"n": 1}},
+        {"timestamp": "2025-01-15T10:00:00Z", "target_type": "gauge", "details": {"n": 2}},
+        {"ts": "2025-01-15T10:45:00", "target_type": "gauge", "details": {"n": 3}},
+    ]
+    body = "".join(json.dumps(line) + "\n" for line in lines).encode()
+    
+    ingest_ndjson_stream(io.BytesIO(body))
+    
+    rows = TargetDetection.query.order_by(TargetDetection.ts).all()
+    assert [r.details_json["n"] for r in rows] == [2, 1, 3]
+    assert rows[1].ts == datetime(2025, 1, 15, 10, 30)
+    assert all(r.ts.tzinfo is None for r in rows)
+
+
+def test_ingest_ndjson_stream_chunks_and_long_lines(app):
+    with app.app_context():
+        body = b"".join(
+            json.dumps({"co_ppm": float(i), "source": "ndjson-test"}).encode() + b"\n" for i in range(5)
+        )
+        body += b'{"co_ppm": 1.0, "source": "' + b"x" * 200 + b'"}\n'
+        body += json.dumps({"target_type": "aruco", "details": {"id": 7}}).encode()  # no trailing newline
+        
+        summary = ingest_ndjson_stream(io.BytesIO(body), chunk_size=2, max_line_bytes=128)
+        
+        assert summary["sensors"] == 5
+        assert summary["targets"] == 1
+        assert summary["error_count"] == 1
+        assert summary["errors"][0]["line"] == 6
+        assert SensorData.query.filter_by(source="ndjson-test").count() == 5
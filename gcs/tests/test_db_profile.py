@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import text
+
+from config import Config
+from gcs import create_app, db, db_profile
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'profile.db'}")
+    return tmp_path / "profile.db"
+
+
+def _pragma(name):
+    return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_profile_applies_wal_and_pragmas(file_db):
+    app = create_app()
+    with app.app_context():
+        assert _pragma("journal_mode") == "wal"
+        assert _pragma("synchronous") == 1  # NORMAL
+        assert _pragma("busy_timeout") == 5000
+        assert _pragma("cache_size") == -64 * 1024
+        assert _pragma("temp_store") == 2  # MEMORY
+        assert db.engine.pool.size() == app.config["DB_POOL_SIZE"]
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_profile_disabled_keeps_sqlite_defaults(file_db, monkeypatch):
+    monkeypatch.setattr(Config, "SQLITE_PROFILE_ENABLED", False)
+    app = create_app()
+    with app.app_context():
+        assert _pragma("journal_mode") == "delete"
+        assert _pragma("synchronous") == 2  # FULL
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_profile_skips_memory_and_other_backends():
+    assert db_profile.is_sqlite_file("sqlite:///instance/uav_gcs.db")
+    assert not db_profile.is_sqlite_file("sqlite:///:memory:")
+    assert not db_profile.is_sqlite_file("sqlite://")
+    assert not db_profile.is_sqlite_file("postgresql://user:pw@localhost/uav_gcs")
+
+
+def test_profile_rejects_unknown_synchronous_mode():
+    with pytest.raises(ValueError):
+        db_profile.connection_pragmas({"SQLITE_SYNCHRONOUS": "sometimes"})
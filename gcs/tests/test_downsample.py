@@ -0,0 +1,134 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import Config
+from gcs import create_app, db
+from gcs.models import SensorData
+from gcs.services import downsample
+
+START = datetime(2025, 1, 15, 10, 0, 0)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(downsample, "np", None)
+    elif downsample.np is None:
+        pytest.skip("numpy not installed")
+    return request.param
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'history.db'}")
+    monkeypatch.setattr(Config, "ROLLUPS_ENABLED", False)
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _wave(n, spike_at=None):
+    y = [math.sin(i / 40.0) for i in range(n)]
+    if spike_at is not None:
+        y[spike_at] = 25.0
+    return [float(i) for i in range(n)], y
+
+
+def test_lttb_keeps_ends_shape_and_spikes(backend):
+    x, y = _wave(3000, spike_at=1234)
+
+    picked = downsample.lttb(x, y, 150)
+
+    assert len(picked) == 150
+    assert picked[0] == 0 and picked[-1] == 2999
+    assert picked == sorted(set(picked))
+    assert 1234 in picked
+    # Peaks of the sine survive
+    assert max(y[i] for i in picked if i != 1234) > 0.99
+
+
+def test_minmax_keeps_every_bucket_extreme(backend):
+    _, y = _wave(1000, spike_at=500)
+    y[700] = -25.0
+
+    picked = downsample.minmax(y, 20)
+
+    assert len(picked) <= 22
+    assert {0, 500, 700, 999} <= set(picked)
+    assert picked == sorted(picked)
+
+
+def test_numpy_and_python_backends_agree(monkeypatch):
+    if downsample.np is None:
+        pytest.skip("numpy not installed")
+    x, y = _wave(2000, spike_at=77)
+    expected = downsample.lttb(x, y, 300), downsample.minmax(y, 300)
+
+    monkeypatch.setattr(downsample, "np", None)
+
+    assert (downsample.lttb(x, y, 300), downsample.minmax(y, 300)) == expected
+
+
+def test_downsample_passes_short_series_through():
+    assert downsample.downsample([0.0, 1.0], [5.0, 6.0], 10) == [0, 1]
+    with pytest.raises(ValueError):
+        downsample.downsample([0.0], [1.0], 10, method="average")
+
+
+def test_sensor_series_skips_missing_values(backend):
+    ts = [START + timedelta(seconds=i) for i in range(6)]
+
+    series = downsample.sensor_series(ts, {"temp_c": [1.0, None, 3.0, None, 5.0, 6.0], "co_ppm": [None] * 6}, 10)
+
+    assert series["temp_c"] == {"ts": [ts[0], ts[2], ts[4], ts[5]], "values": [1.0, 3.0, 5.0, 6.0]}
+    assert series["co_ppm"] == {"ts": [], "values": []}
+
+
+def test_sensor_history_range_downsamples(app):
+    db.session.add_all([
+        SensorData(ts=START + timedelta(seconds=i), temp_c=math.sin(i / 100.0), co_ppm=1.0 if i < 3000 else None)
+        for i in range(4000)
+    ])
+    db.session.commit()
+    client = app.test_client()
+
+    response = client.get('/api/sensor-history?from=2025-01-15T10:10:00Z&to=2025-01-15T11:00:00Z&max_points=200')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["rows"] == 3000  # 10:10:00 .. 10:59:59
+    assert data["method"] == "lttb"
+    temp = data["series"]["temp_c"]
+    assert len(temp["ts"]) == len(temp["values"]) == 200
+    assert temp["ts"][0] == "2025-01-15T10:10:00"
+    assert temp["ts"][-1] == "2025-01-15T10:59:59"
+    assert len(data["series"]["co_ppm"]["values"]) == 200
+    assert data["series"]["co_ppm"]["ts"][-1] == "2025-01-15T10:49:59"
+
+    # What the graphs page asks for: the whole flight, however long ago it was recorded
+    whole = client.get('/api/sensor-history?max_points=100').get_json()
+    assert whole["rows"] == 4000
+    assert whole["series"]["temp_c"]["ts"][0] == "2025-01-15T10:00:00"
+    assert whole["series"]["temp_c"]["ts"][-1] == "2025-01-15T11:06:39"
+
+    minmax = client.get('/api/sensor-history?max_points=100&method=minmax').get_json()
+    assert minmax["rows"] == 4000
+    assert len(minmax["series"]["temp_c"]["values"]) <= 100
+    assert max(minmax["series"]["temp_c"]["values"]) == pytest.approx(1.0, abs=1e-3)
+
+    # limit= without range parameters keeps the original flat list
+    assert len(client.get('/api/sensor-history?limit=5').get_json()) == 5
+    assert client.get('/api/sensor-history?max_points=100&method=mean').status_code == 400
+    assert client.get('/api/sensor-history?from=soon').status_code == 400
+
+
+def test_sensor_history_range_empty(app):
+    data = app.test_client().get('/api/sensor-history?from=1736935200&max_points=50').get_json()
+
+    assert data["rows"] == 0
+    assert data["series"]["temp_c"] == {"ts": [], "values": []}
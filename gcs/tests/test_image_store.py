@@ -0,0 +1,238 @@
+import io
+import os
+import time
+
+import pytest
+
+from gcs.services import image_store
+from gcs.services.image_writer import ImageWriter
+from gcs.services.target_ingest import store_target_image_stream
+
+
+TEST_JPEG = b'\xff\xd8\xff\xe0' + b'\x00' * 200 + b'\xff\xd9'
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # image_store uses paths relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    image_store.forget_latest()
+    image_store.archive_index.reset()
+    yield tmp_path
+    image_store.forget_latest()
+    image_store.archive_index.reset()
+
+
+def _archive(img_bytes):
+    # What the image writer does with an uploaded frame
+    url = image_store.archive_url_for(img_bytes)
+    image_store.write_archive(url, img_bytes)
+    return url
+
+
+def _leftover_temp_files(root):
+    return [p for p in root.rglob("*.tmp")]
+
+
+def test_link_latest_swaps_to_newer_frame(workdir):
+    first = _archive(TEST_JPEG)
+    image_store.link_latest(first)
+    second_bytes = TEST_JPEG[:-2] + b'\x01\xff\xd9'
+    image_store.ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    (image_store.ARCHIVE_DIR / "newer_gauge.jpg").write_bytes(second_bytes)
+    
+    image_store.link_latest("/static/targets/archive/newer_gauge.jpg")
+    
+    latest = workdir / "gcs" / "static" / "targets" / "latest.jpg"
+    assert latest.read_bytes() == second_bytes
+    # The older archive file is untouched by the swap
+    assert image_store.archive_path(first).read_bytes() == TEST_JPEG
+
+
+def test_archive_stream_is_atomic_on_error(workdir):
+    with pytest.raises(ValueError):
+        image_store.archive_image_stream(io.BytesIO(TEST_JPEG * 10), max_bytes=500)
+    
+    assert list(image_store.ARCHIVE_DIR.iterdir()) == []
+
+
+def test_store_target_image_stream(workdir):
+    url, _, img_bytes = store_target_image_stream(io.BytesIO(TEST_JPEG), max_bytes=1024)
+    
+    # The streamed frame comes back in memory; no read back from the archive
+    assert img_bytes == TEST_JPEG
+    assert image_store.archive_path(url).read_bytes() == TEST_JPEG
+    assert image_store.latest_archive_url() == url
+
+
+def test_archive_is_content_addressed(workdir):
+    png = b'\x89PNG' + b'\x00' * 200
+    
+    first = _archive(TEST_JPEG)
+    second = _archive(TEST_JPEG)
+    other = _archive(png)
+    
+    assert first == second
+    assert first.endswith(".jpg") and other.endswith(".png")
+    assert sorted(e["url"] for e in image_store.archive_index.entries()) == sorted([first, other])
+    assert image_store.write_archive(first, TEST_JPEG) is False
+
+
+def test_archive_stream_deduplicates_against_existing_file(workdir):
+    url = _archive(TEST_JPEG)
+    
+    streamed_url, img_bytes = image_store.archive_image_stream(io.BytesIO(TEST_JPEG), max_bytes=1024, chunk_size=64)
+    
+    assert streamed_url == url
+    assert img_bytes == TEST_JPEG
+    assert len(image_store.archive_index) == 1
+    assert _leftover_temp_files(workdir) == []
+
+
+def test_archive_is_sharded_by_hour_and_indexed(workdir):
+    url = _archive(TEST_JPEG)
+    
+    rel = url[len(image_store.ARCHIVE_URL_PREFIX):]
+    shard, fname = rel.rsplit("/", 1)
+    assert shard == time.strftime("%Y/%m/%d/%H", time.gmtime())
+    assert fname == image_store.image_id(url) + ".jpg"
+    entry = image_store.archive_index.get(image_store.image_id(url))
+    assert entry["url"] == url and entry["size"] == len(TEST_JPEG)
+    
+    # The index survives a restart (reloaded from the append-only file)
+    image_store.archive_index.reset()
+    assert image_store.archive_index.get(image_store.image_id(url)) == entry
+    # A duplicate frame resolves to the indexed URL, whatever shard is current
+    assert image_store.archive_url_for(TEST_JPEG) == url
+
+
+def test_archive_index_time_range_and_torn_line(workdir):
+    index = image_store.archive_index
+    for i in range(5):
+        index.add(f"id{i}", f"/static/targets/archive/x/id{i}.jpg", 100 + i, ts=1000.0 + i)
+    with open(index.path, "a") as f:
+        f.write('{"id": "partial", "url"')
+    index.reset()
+    
+    assert [e["id"] for e in index.entries(start=1001, end=1004)] == ["id3", "id2", "id1"]
+    assert [e["id"] for e in index.entries(limit=2, newest_first=False)] == ["id0", "id1"]
+    assert index.count(start=1003) == 2
+    assert len(index) == 5
+
+
+def test_clear_archive_prunes_shards(workdir):
+    urls = [_archive(TEST_JPEG[:-2] + bytes([i]) + b'\xff\xd9') for i in range(3)]
+    
+    removed = image_store.clear_archive()
+    
+    assert sorted(e["url"] for e in removed) == sorted(urls)
+    assert len(image_store.archive_index) == 0
+    assert [p for p in image_store.ARCHIVE_DIR.rglob("*") if p.is_dir()] == []
+
+
+def test_pre_index_archive_is_indexed_once_at_startup(workdir, monkeypatch):
+    # Frames archived before the index existed
+    legacy = image_store.ARCHIVE_DIR / "2024" / "01" / "01" / "00" / "legacy.jpg"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(TEST_JPEG)
+    
+    image_store.configure_archive("files")
+    assert image_store.archive_index.get("legacy")["url"] == "/static/targets/archive/2024/01/01/00/legacy.jpg"
+    
+    # From then on neither start-up nor clear-history walks the archive directories
+    monkeypatch.setattr(image_store, "reindex_archive", lambda: pytest.fail("archive scan"))
+    image_store.configure_archive("files")
+    assert [e["id"] for e in image_store.clear_archive()] == ["legacy"]
+    assert [p for p in image_store.ARCHIVE_DIR.rglob("*")] == []
+
+
+def test_archive_index_kept_outside_static(workdir):
+    url = _archive(TEST_JPEG)
+    
+    assert image_store.archive_index.path.resolve() == (workdir / "instance" / "archive_index.jsonl").resolve()
+    assert not list((workdir / "gcs" / "static").rglob("*.jsonl"))
+    
+    # An index left under static/ by an older version is moved on start-up
+    legacy = image_store.ARCHIVE_DIR / "index.jsonl"
+    image_store.archive_index.path.rename(legacy)
+    image_store.configure_archive("files")
+    assert not legacy.exists()
+    assert image_store.archive_index.get(image_store.image_id(url))["url"] == url
+
+
+def test_reindex_archive_picks_up_existing_files(workdir):
+    url = _archive(TEST_JPEG)
+    image_store.archive_index.path.unlink()
+    image_store.archive_index.reset()
+    
+    assert image_store.reindex_archive() == 1
+    assert image_store.archive_index.get(image_store.image_id(url))["url"] == url
+
+
+@pytest.fixture
+def pack_backend(workdir):
+    image_store.configure_archive("pack")
+    yield
+    image_store.configure_archive("files")
+
+
+def test_pack_backend_appends_and_reads_frames(pack_backend, workdir):
+    png = b'\x89PNG' + b'\x00' * 200
+    
+    url = _archive(TEST_JPEG)
+    other, _ = image_store.archive_image_stream(io.BytesIO(png), max_bytes=1024)
+    duplicate = _archive(TEST_JPEG)
+    
+    assert url.startswith(image_store.PACK_URL_PREFIX) and url == duplicate
+    assert image_store.read_archive(url) == TEST_JPEG
+    assert image_store.read_archive(other) == png
+    entry = image_store.archive_index.get(image_store.image_id(other))
+    assert (entry["pack"], entry["offset"], entry["size"]) == ("seg-000001.pack", len(TEST_JPEG), len(png))
+    # No per-image files: just the segment and the index
+    assert not [p for p in image_store.ARCHIVE_DIR.rglob("*.jpg")]
+    
+    # latest.jpg is not rewritten for packed frames; only the pointer moves
+    image_store.link_latest(url)
+    assert image_store.latest_archive_url() == url
+    assert not (workdir / "gcs" / "static" / "targets" / "latest.jpg").exists()
+
+
+def test_clear_archive_removes_pack_segments(pack_backend, workdir):
+    _archive(TEST_JPEG)
+    segment = image_store.PACK_DIR / "seg-000001.pack"
+    assert segment.exists()
+    
+    image_store.clear_archive()
+    
+    assert not segment.exists()
+    assert len(image_store.archive_index) == 0
+
+
+def test_image_writer_writes_inline_when_not_running(workdir):
+    writer = ImageWriter()
+    done = []
+    url = image_store.archive_url_for(TEST_JPEG)
+    
+    queued = writer.submit(url, TEST_JPEG, on_done=lambda: done.append(url))
+    
+    assert queued is False
+    assert done == [url]
+    assert image_store.archive_path(url).read_bytes() == TEST_JPEG
+    assert image_store.latest_archive_url() == url
+    assert writer.stats()["inline"] == 1
+
+
+def test_image_writer_pool_keeps_latest_on_newest_frame(workdir):
+    writer = ImageWriter(workers=3, max_queue=16)
+    writer.start(app=None)
+    try:
+        urls = [f"/static/targets/archive/frame{i:02d}_valve.jpg" for i in range(12)]
+        for url in urls:
+            assert writer.submit(url, TEST_JPEG) is True
+        writer.flush()
+    finally:
+        writer.stop()
+    
+    assert all(image_store.archive_path(url).exists() for url in urls)
+    assert image_store.latest_archive_url() == urls[-1]
+    assert writer.stats()["written"] == 12
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from flask_migrate import stamp, upgrade
+from sqlalchemy import event, inspect, text
+
+from config import Config
+from gcs import create_app, db, recent_detections
+from gcs.models import TargetDetection
+
+MIGRATIONS = str(Path(__file__).resolve().parents[2] / "migrations")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'plans.db'}")
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        start = datetime(2025, 1, 15, 10, 0, 0)
+        db.session.add_all([
+            TargetDetection(ts=start + timedelta(seconds=i), target_type="livedata" if i % 10 else "gauge",
+                            details_json={}, image_url="/targets/latest.jpg")
+            for i in range(200)
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _query_plans(app, url):
+    """EXPLAIN QUERY PLAN for every target_detection SELECT the route runs."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "target_detection" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", _capture)
+    try:
+        assert app.test_client().get(url).status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _capture)
+    assert statements
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        return [
+            " | ".join(row[-1] for row in cursor.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall())
+            for sql, params in statements
+        ]
+    finally:
+        raw.close()
+
+
+def test_target_data_uses_detection_indexes(app):
+    plans = _query_plans(app, "/api/target-data?per_page=20")
+
+    # Page of rows: walk the partial index newest-first, no sort step
+    assert "SCAN target_detection USING INDEX ix_target_detection_ts_not_livedata" in plans
+    assert all("TEMP B-TREE" not in p for p in plans)
+    # paginate()'s COUNT(*) and the ETag's max(id) never read the table itself
+    assert all(p.startswith("SEARCH") or "USING" in p for p in plans), plans
+
+
+def test_recent_detections_fallback_uses_partial_index(app):
+    recent_detections.clear()
+
+    plans = _query_plans(app, "/api/recent-detections?limit=40")
+
+    assert "SCAN target_detection USING INDEX ix_target_detection_ts_not_livedata" in plans
+    assert all("TEMP B-TREE" not in p for p in plans)
+
+
+def test_type_lookup_uses_composite_index(app):
+    plan = " | ".join(row[-1] for row in db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM target_detection WHERE target_type = 'gauge' ORDER BY ts DESC"
+    )))
+
+    assert "ix_target_detection_target_type_ts (target_type=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_migration_adds_indexes_to_existing_database(app):
+    db.session.execute(text("DROP INDEX ix_target_detection_target_type_ts"))
+    db.session.execute(text("DROP INDEX ix_target_detection_ts_not_livedata"))
+    db.session.commit()
+    stamp(directory=MIGRATIONS, revision="3f1c2a9d7b10")
+
+    upgrade(directory=MIGRATIONS)
+
+    indexes = {ix["name"]: ix for ix in inspect(db.engine).get_indexes("target_detection")}
+    assert indexes["ix_target_detection_target_type_ts"]["column_names"] == ["target_type", "ts"]
+    assert indexes["ix_target_detection_ts_not_livedata"]["column_names"] == ["ts"]
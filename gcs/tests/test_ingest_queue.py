@@ -0,0 +1,97 @@
+import json
+import queue
+
+import pytest
+
+from gcs import create_app, db, ingest_queue
+from gcs.models import SensorData
+from gcs.services.ingest_queue import WriteBehindQueue
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        ingest_queue.stop()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_queue_group_commits_records(app):
+    wb = WriteBehindQueue(max_size=100, batch_size=10, flush_ms=20)
+    wb.start(app)
+    try:
+        seqs = wb.put_many([SensorData(co_ppm=float(i), source="wb-test") for i in range(25)])
+        wb.flush()
+        
+        assert seqs == list(range(1, 26))
+        stats = wb.stats()
+        assert stats["committed"] == 25
+        assert stats["last_committed_seq"] == 25
+        assert stats["pending"] == 0
+        assert SensorData.query.filter_by(source="wb-test").count() == 25
+    finally:
+        wb.stop()
+
+
+def test_queue_rejects_when_full():
+    wb = WriteBehindQueue(max_size=2)
+    wb.put(SensorData(co_ppm=1.0))
+    with pytest.raises(queue.Full):
+        wb.put_many([SensorData(co_ppm=2.0), SensorData(co_ppm=3.0)])
+
+
+def test_stop_commits_remaining_records(app):
+    wb = WriteBehindQueue(max_size=100, batch_size=1000, flush_ms=5000)
+    wb.start(app)
+    wb.put(SensorData(co_ppm=9.0, source="wb-stop"))
+    wb.stop()
+    
+    assert SensorData.query.filter_by(source="wb-stop").count() == 1
+
+
+def test_sensor_api_write_behind_returns_202(app, client):
+    app.config['WRITE_BEHIND_ENABLED'] = True
+    
+    response = client.post('/api/sensors',
+                          data=json.dumps({"co_ppm": 4.2, "source": "wb-route"}),
+                          content_type='application/json')
+    
+    assert response.status_code == 202
+    data = json.loads(response.data)
+    assert data['status'] == 'queued'
+    assert isinstance(data['seq'], int)
+    
+    ingest_queue.flush()
+    assert SensorData.query.filter_by(source="wb-route").count() == 1
+
+
+def test_target_api_write_behind_returns_202(app, client):
+    app.config['WRITE_BEHIND_ENABLED'] = True
+    payload = {
+        "details": [
+            {"target_type": "valve", "details": {"state": "wb-open"}},
+            {"target_type": "gauge", "details": {"reading_bar": 1.2}}
+        ]
+    }
+    
+    response = client.post('/api/targets',
+                          data=json.dumps(payload),
+                          content_type='application/json')
+    
+    assert response.status_code == 202
+    data = json.loads(response.data)
+    assert data['queued'] is True
+    assert len(data['seq']) == 2
+    
+    ingest_queue.flush()
+    assert ingest_queue.stats()['last_committed_seq'] >= data['seq'][-1]
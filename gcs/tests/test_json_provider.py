@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from gcs import create_app, db, json_provider
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+    json_provider.configure(app.config['JSON_BACKEND'])
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+SAMPLE = {"ts": datetime(2025, 1, 15, 10, 30, 0, 123456), "value": 1.5, "items": [1, None, "a"]}
+
+
+@pytest.mark.parametrize("backend", ["auto", "stdlib"])
+def test_dumps_writes_iso_datetimes(backend):
+    json_provider.configure(backend)
+    try:
+        encoded = json_provider.dumps(SAMPLE, separators=(",", ":"))
+    finally:
+        json_provider.configure("auto")
+    
+    assert json.loads(encoded) == {"ts": "2025-01-15T10:30:00.123456", "value": 1.5, "items": [1, None, "a"]}
+
+
+def test_loads_round_trip():
+    assert json_provider.loads(json_provider.dumps({"a": [1, 2.5, "x"]})) == {"a": [1, 2.5, "x"]}
+
+
+def test_backend_selection():
+    assert json_provider.configure("stdlib") == "stdlib"
+    expected = "orjson" if json_provider.orjson is not None else "stdlib"
+    assert json_provider.configure("auto") == expected
+
+
+@pytest.mark.parametrize("backend", ["auto", "stdlib"])
+def test_sensor_history_serializes_ts_as_iso(client, backend):
+    json_provider.configure(backend)
+    client.post('/api/sensors',
+                data=json.dumps({"timestamp": "2025-01-15T10:30:00", "co_ppm": 1.0}),
+                content_type='application/json')
+    
+    response = client.get('/api/sensor-history?limit=500')
+    
+    assert response.status_code == 200
+    timestamps = [row['ts'] for row in json.loads(response.data)]
+    assert "2025-01-15T10:30:00" in timestamps
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from config import Config
+from gcs import create_app, db
+from gcs.models import SensorData, TargetDetection
+from gcs.services.keyset import NEXT, decode_cursor, encode_cursor
+
+START = datetime(2025, 1, 15, 10, 0, 0)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'keyset.db'}")
+    monkeypatch.setattr(Config, "ROLLUPS_ENABLED", False)
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        # Pairs of rows share a timestamp so the id tie-break matters
+        db.session.add_all([SensorData(ts=START + timedelta(seconds=i // 2), temp_c=float(i)) for i in range(125)])
+        db.session.add_all([
+            TargetDetection(ts=START + timedelta(seconds=i), target_type="livedata" if i % 3 == 0 else "gauge",
+                            details_json={})
+            for i in range(30)
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _walk(client, url, key):
+    pages, cursor = [], ""
+    while cursor is not None:
+        body = client.get(f"{url}&{key}={cursor}").get_json()
+        pages.append(body)
+        cursor = body["next"]
+    return pages
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(NEXT, datetime(2025, 1, 15, 10, 0, 0, 123456), 42)
+
+    assert decode_cursor(cursor) == (NEXT, datetime(2025, 1, 15, 10, 0, 0, 123456), 42)
+    for bad in ("", "not-a-cursor", encode_cursor("x", START, 1)):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_sensor_data_cursor_pages_cover_every_row_once(app):
+    client = app.test_client()
+    expected = [r.id for r in SensorData.query.order_by(SensorData.ts.desc(), SensorData.id.desc())]
+
+    pages = _walk(client, "/api/sensor-data?per_page=50", "cursor")
+
+    assert [len(p["data"]) for p in pages] == [50, 50, 25]
+    assert [row["id"] for p in pages for row in p["data"]] == expected
+    assert pages[0]["prev"] is None and pages[-1]["next"] is None
+    assert "total" not in pages[0]
+
+    # prev from the last page walks back to the same pages
+    back = client.get(f"/api/sensor-data?per_page=50&cursor={pages[-1]['prev']}").get_json()
+    assert back["data"] == pages[1]["data"]
+    first = client.get(f"/api/sensor-data?per_page=50&cursor={back['prev']}").get_json()
+    assert first["data"] == pages[0]["data"]
+    assert first["prev"] is None
+    assert first["next"] == pages[0]["next"]
+
+
+def test_cursor_pages_include_null_timestamps(app):
+    null_ids = [r.id for r in SensorData.query.order_by(SensorData.id).limit(7)]
+    SensorData.query.filter(SensorData.id.in_(null_ids)).update({SensorData.ts: None})
+    db.session.commit()
+    client = app.test_client()
+    expected = ([r.id for r in SensorData.query.filter(SensorData.ts.isnot(None))
+                 .order_by(SensorData.ts.desc(), SensorData.id.desc())] + sorted(null_ids, reverse=True))
+
+    # The NULL rows come last (oldest), and a page may start or end inside them
+    pages = _walk(client, "/api/sensor-data?per_page=20", "cursor")
+    assert [row["id"] for p in pages for row in p["data"]] == expected
+    assert len(pages[-1]["data"]) == 5 and pages[-1]["data"][0]["ts"] is None
+
+    back, cursor = [], pages[-1]["prev"]
+    while cursor is not None:
+        body = client.get(f"/api/sensor-data?per_page=20&cursor={cursor}").get_json()
+        back.append(body["data"])
+        cursor = body["prev"]
+    assert back == [p["data"] for p in reversed(pages[:-1])]
+    assert decode_cursor(encode_cursor(NEXT, None, 5)) == (NEXT, None, 5)
+
+
+def test_cursor_survives_new_rows(app):
+    client = app.test_client()
+    first = client.get("/api/sensor-data?per_page=10&cursor=").get_json()
+    db.session.add(SensorData(ts=START + timedelta(hours=1), temp_c=0.0))
+    db.session.commit()
+
+    second = client.get(f"/api/sensor-data?per_page=10&cursor={first['next']}").get_json()
+
+    # An offset page would shift by one; the keyset page continues right after the last row seen
+    assert second["data"][0]["id"] == first["data"][-1]["id"] - 1
+
+
+def test_target_data_cursor_skips_livedata_and_counts_on_request(app):
+    client = app.test_client()
+
+    pages = _walk(client, "/api/target-data?per_page=8&total=1", "cursor")
+
+    rows = [row for p in pages for row in p["data"]]
+    assert len(rows) == 20
+    assert {row["target_type"] for row in rows} == {"gauge"}
+    assert pages[0]["total"] == 20
+
+
+def test_offset_pagination_still_supported(app):
+    data = app.test_client().get("/api/sensor-data?page=3&per_page=50").get_json()
+
+    assert (data["total"], data["pages"], data["current_page"]) == (125, 3, 3)
+    assert len(data["data"]) == 25
+
+
+def test_invalid_cursor_is_rejected(app):
+    assert app.test_client().get("/api/sensor-data?cursor=bogus").status_code == 400
+
+
+def test_cursor_page_reads_the_ts_index(app):
+    client = app.test_client()
+    cursor = client.get("/api/sensor-data?per_page=20&cursor=").get_json()["next"]
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM sensor_data" in statement and "LIMIT" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", _capture)
+    try:
+        assert client.get(f"/api/sensor-data?per_page=20&cursor={cursor}").status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _capture)
+
+    raw = db.engine.raw_connection()
+    try:
+        plan = " | ".join(row[-1] for row in raw.cursor().execute("EXPLAIN QUERY PLAN " + statements[0][0],
+                                                                  statements[0][1]).fetchall())
+    finally:
+        raw.close()
+    assert "ix_sensor_data_ts (ts<?)" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,145 @@
+import threading
+import time
+
+from gcs.services.latest_frames import DEFAULT_DEVICE, LatestFrames, mjpeg_stream
+
+
+def test_keeps_newest_frame_per_device():
+    frames = LatestFrames()
+
+    frames.put("uav-1", b"a1", "e-a1")
+    frames.put("uav-2", b"b1", "e-b1")
+    frames.put("uav-1", b"a2", "e-a2")
+
+    assert frames.get("uav-1").data == b"a2"
+    assert frames.get("uav-2").etag == "e-b1"
+    assert frames.get().data == b"a2"  # newest of any device
+    assert frames.get("uav-3") is None
+    assert [d["device_id"] for d in frames.devices()] == ["uav-1", "uav-2"]
+
+
+def test_frames_without_device_go_to_default():
+    frames = LatestFrames()
+
+    frame = frames.put(None, b"x", "e-x")
+
+    assert frame.device_id == DEFAULT_DEVICE
+    assert frames.get(DEFAULT_DEVICE) is frame
+
+
+def test_oldest_device_is_evicted():
+    frames = LatestFrames(max_devices=2)
+    for name in ("a", "b", "c"):
+        frames.put(name, name.encode(), name)
+
+    assert frames.get("a") is None
+    assert frames.get("c").data == b"c"
+
+
+def test_wait_newer_returns_immediately_when_etag_differs():
+    frames = LatestFrames()
+    frames.put("uav-1", b"a1", "e-a1")
+
+    started = time.monotonic()
+    frame = frames.wait_newer("uav-1", "stale", timeout=5)
+
+    assert frame.etag == "e-a1"
+    assert time.monotonic() - started < 1
+
+
+def test_wait_newer_wakes_on_put():
+    frames = LatestFrames()
+    frames.put("uav-1", b"a1", "e-a1")
+    timer = threading.Timer(0.1, frames.put, args=("uav-1", b"a2", "e-a2"))
+    timer.start()
+
+    frame = frames.wait_newer("uav-1", "e-a1", timeout=5)
+
+    timer.join()
+    assert frame.etag == "e-a2"
+
+
+def test_wait_newer_times_out_with_current_frame():
+    frames = LatestFrames()
+    frames.put("uav-1", b"a1", "e-a1")
+    # A frame from another device does not wake a per-device waiter
+    threading.Timer(0.05, frames.put, args=("uav-2", b"b1", "e-b1")).start()
+
+    frame = frames.wait_newer("uav-1", "e-a1", timeout=0.2)
+
+    assert frame.etag == "e-a1"
+
+
+def test_ring_keeps_recent_frames_per_device():
+    frames = LatestFrames(ring_size=3)
+    for i in range(5):
+        frames.put("uav-1", bytes([i]), f"e{i}")
+
+    assert [d["buffered"] for d in frames.devices()] == [3]
+    assert frames.get("uav-1").data == bytes([4])
+
+
+def test_next_frame_in_order_while_viewer_keeps_up():
+    frames = LatestFrames()
+    first = frames.put("uav-1", b"1", "e1")
+    assert frames.next_frame("uav-1", 0, timeout=0, max_lag=2) is first
+    second = frames.put("uav-1", b"2", "e2")
+    third = frames.put("uav-1", b"3", "e3")
+
+    assert frames.next_frame("uav-1", first.seq, timeout=0, max_lag=2) is second
+    assert frames.next_frame("uav-1", second.seq, timeout=0, max_lag=2) is third
+    assert frames.next_frame("uav-1", third.seq, timeout=0.05, max_lag=2) is None
+
+
+def test_next_frame_skips_ahead_for_slow_viewer():
+    frames = LatestFrames()
+    seen = frames.put("uav-1", b"0", "e0")
+    for i in range(1, 6):
+        newest = frames.put("uav-1", bytes([i]), f"e{i}")
+
+    assert frames.next_frame("uav-1", seen.seq, timeout=0, max_lag=2) is newest
+    assert frames.stats()["skipped"] == 4
+
+
+def test_next_frame_new_viewer_starts_at_newest():
+    frames = LatestFrames()
+    for i in range(2):
+        newest = frames.put("uav-1", bytes([i]), f"e{i}")
+
+    assert frames.next_frame("uav-1", 0, timeout=0, max_lag=2) is newest
+    assert frames.stats()["skipped"] == 0
+
+
+def test_mjpeg_stream_parts():
+    frames = LatestFrames()
+    frames.put("uav-1", b"jpeg-1", "e1")
+    parts = mjpeg_stream(frames, "uav-1", keepalive=0.05)
+
+    first = next(parts)
+    assert first == (b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 6\r\n\r\n"
+                     b"jpeg-1\r\n")
+    # Nothing new: the current frame is repeated as a keep-alive
+    assert next(parts) == first
+    frames.put("uav-1", b"jpeg-2", "e2")
+    assert next(parts).endswith(b"jpeg-2\r\n")
+    parts.close()
+
+
+def test_mjpeg_stream_keepalive_before_first_frame():
+    frames = LatestFrames()
+    parts = mjpeg_stream(frames, "uav-1", keepalive=0.05)
+
+    # No frame yet: the viewer still gets written to, so a disconnect ends the stream
+    assert next(parts) == b"\r\n"
+    frames.put("uav-1", b"jpeg-1", "e1")
+    assert next(parts).endswith(b"jpeg-1\r\n")
+    parts.close()
+
+
+def test_viewer_slots():
+    frames = LatestFrames()
+
+    assert frames.open_viewer(1)
+    assert not frames.open_viewer(1)
+    frames.close_viewer()
+    assert frames.open_viewer(1)
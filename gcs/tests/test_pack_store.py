@@ -0,0 +1,53 @@
+import pytest
+
+from gcs.services.pack_store import PackStore
+
+
+def test_append_and_read_back(tmp_path):
+    store = PackStore(tmp_path / "packs")
+    
+    first = store.append(b"A" * 100)
+    second = store.append(b"B" * 50)
+    
+    assert first == ("seg-000001.pack", 0)
+    assert second == ("seg-000001.pack", 100)
+    assert store.read(*second, 50) == b"B" * 50
+    assert store.read(*first, 100) == b"A" * 100
+
+
+def test_read_sees_frames_appended_after_first_mapping(tmp_path):
+    store = PackStore(tmp_path / "packs")
+    store.append(b"x" * 10)
+    assert store.read("seg-000001.pack", 0, 10) == b"x" * 10
+    
+    segment, offset = store.append(b"y" * 10)
+    
+    assert store.read(segment, offset, 10) == b"y" * 10
+
+
+def test_rolls_over_to_new_segment(tmp_path):
+    store = PackStore(tmp_path / "packs", segment_bytes=150)
+    
+    store.append(b"1" * 100)
+    segment, offset = store.append(b"2" * 100)
+    
+    assert (segment, offset) == ("seg-000002.pack", 0)
+    assert (tmp_path / "packs" / "seg-000001.pack").stat().st_size == 100
+
+
+def test_resumes_active_segment_after_restart(tmp_path):
+    PackStore(tmp_path / "packs").append(b"z" * 30)
+    
+    assert PackStore(tmp_path / "packs").append(b"w" * 5) == ("seg-000001.pack", 30)
+
+
+def test_remove_segments_and_reject_bad_names(tmp_path):
+    store = PackStore(tmp_path / "packs")
+    segment, offset = store.append(b"q" * 20)
+    store.read(segment, offset, 20)
+    
+    store.remove_segments({segment})
+    
+    assert not (tmp_path / "packs" / segment).exists()
+    with pytest.raises(ValueError):
+        store.read("../index.jsonl", 0, 1)
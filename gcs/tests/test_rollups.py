@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import Config
+from gcs import create_app, db
+from gcs.models import RollupCheckpoint, SensorData, SensorRollup
+from gcs.services import rollups
+
+START = datetime(2025, 1, 15, 10, 0, 0)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'rollups.db'}")
+    # Compaction is driven by the tests, not the background thread
+    monkeypatch.setattr(Config, "ROLLUPS_ENABLED", False)
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _add(offsets, temp=None, **fields):
+    db.session.add_all([
+        SensorData(ts=START + timedelta(seconds=s), temp_c=temp if temp is not None else float(s), **fields)
+        for s in offsets
+    ])
+    db.session.commit()
+
+
+def _rollup(resolution, ts):
+    return db.session.get(SensorRollup, (resolution, ts))
+
+
+def test_bucket_start_aligns_to_resolution():
+    ts = datetime(2025, 1, 15, 10, 7, 43, 500000)
+
+    assert rollups.bucket_start(ts, 10) == datetime(2025, 1, 15, 10, 7, 40)
+    assert rollups.bucket_start(ts, 60) == datetime(2025, 1, 15, 10, 7, 0)
+    assert rollups.bucket_start(ts, 600) == datetime(2025, 1, 15, 10, 0, 0)
+
+
+def test_aggregate_tracks_min_max_sum_count_per_field():
+    rows = [SensorData(ts=START + timedelta(seconds=s), temp_c=float(s), co_ppm=None) for s in (1, 4, 12)]
+
+    buckets = rollups.aggregate(rows)
+
+    first = buckets[(10, START)]
+    assert first["count"] == 2
+    assert first["temp_c"] == [1.0, 4.0, 5.0, 2]
+    assert first["co_ppm"] == [None, None, 0.0, 0]
+    assert buckets[(60, START)]["temp_c"] == [1.0, 12.0, 17.0, 3]
+
+
+def test_compact_folds_new_rows_incrementally(app):
+    _add(range(0, 30))
+
+    assert rollups.compact() == 30
+    bucket = _rollup(10, START)
+    assert (bucket.count, bucket.temp_c_min, bucket.temp_c_max, bucket.temp_c_sum) == (10, 0.0, 9.0, 45.0)
+    assert _rollup(60, START).count == 30
+    assert db.session.get(RollupCheckpoint, rollups.CHECKPOINT).last_id == 30
+
+    # A late reading lands in an existing bucket and is merged, not duplicated
+    _add([5], temp=-3.0)
+    assert rollups.compact() == 1
+    assert rollups.compact() == 0
+    db.session.expire_all()
+    bucket = _rollup(10, START)
+    assert (bucket.count, bucket.temp_c_min, bucket.temp_c_count) == (11, -3.0, 11)
+    assert SensorRollup.query.filter_by(resolution=10).count() == 3
+
+
+def test_compact_commits_in_batches(app):
+    _add(range(0, 25))
+
+    assert rollups.compact(batch_size=10) == 25
+    assert _rollup(600, START).count == 25
+
+
+def test_rebuild_matches_incremental_compaction(app):
+    _add(range(0, 20))
+    rollups.compact()
+    _add(range(20, 40))
+    rollups.compact()
+    incremental = rollups.rollup_series(10)
+
+    assert rollups.rebuild(batch_size=7) == 40
+    assert rollups.rollup_series(10) == incremental
+
+
+def test_sensor_rollups_route(app):
+    _add(range(0, 120), humidity_pct=50.0)
+    rollups.compact()
+    client = app.test_client()
+
+    response = client.get('/api/sensor-rollups?resolution=60&from=2025-01-15T10:00:30Z')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["resolution"] == 60
+    # from= snaps to the start of its bucket
+    assert [b["count"] for b in data["buckets"]] == [60, 60]
+    first = data["buckets"][0]
+    assert (first["temp_c_min"], first["temp_c_max"], first["temp_c_mean"]) == (0.0, 59.0, 29.5)
+    assert first["humidity_pct_mean"] == 50.0
+    assert first["co_ppm_mean"] is None
+
+    response = client.get('/api/sensor-rollups?resolution=10&limit=2')
+    assert [b["ts"] for b in response.get_json()["buckets"]] == [
+        "2025-01-15T10:01:40", "2025-01-15T10:01:50"
+    ]
+
+    etag = response.headers["ETag"]
+    assert client.get('/api/sensor-rollups?resolution=10&limit=2',
+                      headers={"If-None-Match": etag}).status_code == 304
+
+    assert client.get('/api/sensor-rollups?resolution=30').status_code == 400
+    assert client.get('/api/sensor-rollups?from=yesterday').status_code == 400
+
+
+def test_clear_history_drops_rollups(app):
+    _add(range(0, 10))
+    rollups.compact()
+
+    assert app.test_client().post('/api/clear-history').status_code == 200
+
+    assert SensorRollup.query.count() == 0
+    assert rollups.checkpoint_id() == 0
+
+
+def test_backfill_command(app):
+    _add(range(0, 15))
+
+    result = app.test_cli_runner().invoke(args=["backfill-rollups"])
+
+    assert "Rolled up 15 sensor rows" in result.output
+    assert _rollup(10, START + timedelta(seconds=10)).count == 5
+
+
+def test_compactor_run_once_records_stats(app):
+    from gcs.services.rollup_compactor import RollupCompactor
+
+    _add(range(0, 5))
+    compactor = RollupCompactor()
+
+    assert compactor.run_once(app) == 5
+    assert compactor.stats()["folded"] == 5
@@ -1,12 +1,15 @@
 import base64
+import gzip
 import io
 import json
 import os
 import tempfile
+import threading
+import time
 
 import pytest
 
-from gcs import create_app, db
+from gcs import create_app, db, image_writer, latest_frames
 
 
 @pytest.fixture
@@ -124,6 +127,240 @@ def test_sensor_api_invalid_numeric_value(client):
     assert 'Invalid value' in data['error']
 
 
+def test_sensor_batch_api_valid_data(client):
+    payload = [
+        {"timestamp": "2025-01-15T10:30:00Z", "co_ppm": 1.5, "temp_c": 22.5},
+        {"timestamp": "2025-01-15T10:30:01Z", "co_ppm": 1.6, "temp_c": 22.6},
+        {"timestamp": "2025-01-15T10:30:02Z", "no2_ppm": 0.8}
+    ]
+    
+    response = client.post('/api/sensors/batch',
+                          data=json.dumps(payload),
+                          content_type='application/json')
+    
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['status'] == 'ok'
+    assert data['saved'] == 3
+    assert len(data['ids']) == 3
+
+
+def test_sensor_batch_api_readings_object(client):
+    payload = {"readings": [{"co_ppm": 1.0}, {"co_ppm": 2.0}]}
+    
+    response = client.post('/api/sensors/batch',
+                          data=json.dumps(payload),
+                          content_type='application/json')
+    
+    assert response.status_code == 201
+    assert json.loads(response.data)['saved'] == 2
+
+
+def test_sensor_batch_api_rejects_whole_batch_on_invalid_item(client):
+    payload = [
+        {"co_ppm": 1.0},
+        {"co_ppm": "not a number"},
+        {"source": "test"}
+    ]
+    
+    response = client.post('/api/sensors/batch',
+                          data=json.dumps(payload),
+                          content_type='application/json')
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert [e['index'] for e in data['errors']] == [1, 2]
+    assert 'Invalid value' in data['errors'][0]['error']
+
+
+def test_sensor_batch_api_empty_or_not_array(client):
+    response = client.post('/api/sensors/batch',
+                          data=json.dumps([]),
+                          content_type='application/json')
+    assert response.status_code == 400
+    
+    response = client.post('/api/sensors/batch',
+                          data=json.dumps({"co_ppm": 1.0}),
+                          content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_ndjson_ingest_mixed_records(client):
+    lines = [
+        json.dumps({"timestamp": "2025-01-15T10:30:00Z", "co_ppm": 1.5}),
+        json.dumps({"ts": "2025-01-15T10:30:01Z", "target_type": "valve", "details": {"state": "open"}}),
+        "",
+        "not json",
+        json.dumps({"co_ppm": "bad"}),
+        json.dumps({"timestamp": "2025-01-15T10:30:02Z", "temp_c": 22.0})
+    ]
+    
+    response = client.post('/api/ingest/ndjson',
+                          data="\n".join(lines) + "\n",
+                          content_type='application/x-ndjson')
+    
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['saved'] == {"sensors": 2, "targets": 1}
+    assert data['error_count'] == 2
+    assert [e['line'] for e in data['errors']] == [4, 5]
+
+
+def test_ndjson_ingest_requires_content_type(client):
+    response = client.post('/api/ingest/ndjson',
+                          data=json.dumps({"co_ppm": 1.0}),
+                          content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_ndjson_ingest_no_valid_records(client):
+    response = client.post('/api/ingest/ndjson',
+                          data="garbage\n[1, 2]\n",
+                          content_type='application/x-ndjson')
+    assert response.status_code == 400
+    assert json.loads(response.data)['error_count'] == 2
+
+
+def test_sensor_api_gzip_body(app, client):
+    from gcs import throughput_meter
+    throughput_meter.reset()
+    raw = json.dumps({"co_ppm": 1.5, "source": "x" * 400}).encode()
+    body = gzip.compress(raw)
+    
+    response = client.post('/api/sensors',
+                          data=body,
+                          content_type='application/json',
+                          headers={'Content-Encoding': 'gzip'})
+    
+    assert response.status_code == 201
+    assert throughput_meter.compression_ratio("AQSA") == round(len(raw) / len(body), 2)
+
+
+def test_target_api_deflate_multipart(client):
+    import zlib
+    from werkzeug.test import EnvironBuilder
+    test_image_data = b'\xff\xd8\xff\xe0' + b'\x00' * 200 + b'\xff\xd9'
+    environ = EnvironBuilder(method='POST', data={
+        'file': (io.BytesIO(test_image_data), 'test.jpg', 'image/jpeg'),
+        'target_type': 'valve',
+        'details': '{"state": "open"}'
+    }).get_environ()
+    raw = environ['wsgi.input'].read()
+    
+    response = client.post('/api/targets',
+                          data=zlib.compress(raw),
+                          content_type=environ['CONTENT_TYPE'],
+                          headers={'Content-Encoding': 'deflate'})
+    
+    assert response.status_code == 201
+    assert json.loads(response.data)['detections'][0]['details']['state'] == 'open'
+
+
+def test_compressed_body_size_cap(app, client):
+    app.config['MAX_DECODED_BODY_BYTES'] = 1024
+    body = gzip.compress(json.dumps({"co_ppm": 1.0, "source": "x" * 5000}).encode())
+    
+    response = client.post('/api/sensors',
+                          data=body,
+                          content_type='application/json',
+                          headers={'Content-Encoding': 'gzip'})
+    
+    assert response.status_code == 413
+
+
+def test_compressed_zstd_bomb_is_capped(app, client):
+    zstandard = pytest.importorskip("zstandard")
+    app.config['MAX_DECODED_BODY_BYTES'] = 64 * 1024
+    # ~2 KB on the wire, 64 MB decoded
+    body = zstandard.ZstdCompressor().compress(b'[' + b' ' * (64 * 1024 * 1024) + b']')
+    
+    response = client.post('/api/sensors/batch',
+                          data=body,
+                          content_type='application/json',
+                          headers={'Content-Encoding': 'zstd'})
+    
+    assert response.status_code == 413
+
+
+def test_multi_member_gzip_body(client):
+    rows = [{"co_ppm": float(i), "source": "member"} for i in range(2)]
+    # Two gzip members back to back, as `cat a.gz b.gz` produces
+    body = gzip.compress(json.dumps(rows[0]).encode() + b'\n') + gzip.compress(json.dumps(rows[1]).encode() + b'\n')
+    
+    response = client.post('/api/ingest/ndjson',
+                          data=body,
+                          content_type='application/x-ndjson',
+                          headers={'Content-Encoding': 'gzip'})
+    
+    assert response.status_code == 201
+    assert json.loads(response.data)['saved']['sensors'] == 2
+
+
+def test_truncated_or_padded_compressed_bodies_are_rejected(client):
+    payload = json.dumps([{"co_ppm": 1.0, "source": "x" * 2000}]).encode()
+    bodies = [('gzip', gzip.compress(payload)[:-10]), ('gzip', gzip.compress(payload) + b'trailing junk')]
+    zstandard = pytest.importorskip("zstandard")
+    frame = zstandard.ZstdCompressor().compress(payload)
+    bodies += [('zstd', frame[:len(frame) // 2]), ('zstd', frame[:-3])]
+    
+    for encoding, body in bodies:
+        response = client.post('/api/sensors/batch',
+                              data=body,
+                              content_type='application/json',
+                              headers={'Content-Encoding': encoding})
+        assert response.status_code == 400, encoding
+
+
+def test_compressed_body_errors(client):
+    response = client.post('/api/sensors',
+                          data=b'not gzip at all',
+                          content_type='application/json',
+                          headers={'Content-Encoding': 'gzip'})
+    assert response.status_code == 400
+    
+    response = client.post('/api/sensors',
+                          data=b'{}',
+                          content_type='application/json',
+                          headers={'Content-Encoding': 'br-unknown'})
+    assert response.status_code == 415
+
+
+def test_read_api_etag_returns_304_until_data_changes(client):
+    client.post('/api/sensors', data=json.dumps({"co_ppm": 1.0}), content_type='application/json')
+    
+    first = client.get('/api/sensor-history?limit=10')
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+    
+    cached = client.get('/api/sensor-history?limit=10', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    
+    # A different query gets a different tag
+    other = client.get('/api/sensor-history?limit=20', headers={'If-None-Match': etag})
+    assert other.status_code == 200
+    
+    client.post('/api/sensors', data=json.dumps({"co_ppm": 2.0}), content_type='application/json')
+    changed = client.get('/api/sensor-history?limit=10', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_read_api_gzip_negotiation(client):
+    client.post('/api/sensors/batch',
+                data=json.dumps([{"co_ppm": float(i), "source": "gzip-test"} for i in range(50)]),
+                content_type='application/json')
+    
+    response = client.get('/api/sensor-data?per_page=50', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(json.loads(gzip.decompress(response.data))['data']) == 50
+    
+    plain = client.get('/api/sensor-data?per_page=50')
+    assert 'Content-Encoding' not in plain.headers
+
+
 def test_target_api_valid_data(client):
     # Create a small test image and encode as base64
     test_image_data = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C\x00\x08\x06\x06\x07\x06\x05\x08\x07\x07\x07\t\t\x08\n\x0c\x14\r\x0c\x0b\x0b\x0c\x19\x12\x13\x0f\x14\x1d\x1a\x1f\x1e\x1d\x1a\x1c\x1c $.\' ",#\x1c\x1c(7),01444\x1f\'9=82<.342\xff\xc0\x00\x11\x08\x00\x01\x00\x01\x01\x01\x11\x00\x02\x11\x01\x03\x11\x01\xff\xc4\x00\x14\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x08\xff\xc4\x00\x14\x10\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xda\x00\x0c\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00\xaa\xff\xd9'
@@ -334,6 +571,286 @@ def test_target_api_missing_image_b64(client):
     assert result['saved'] == 1
 
 
+def test_target_api_raw_jpeg_upload(client):
+    test_image_data = b'\xff\xd8\xff\xe0' + b'\x00' * 200 + b'\xff\xd9'
+    
+    response = client.post('/api/targets?target_type=gauge&device_id=raw_device',
+                          data=test_image_data,
+                          content_type='image/jpeg',
+                          headers={'X-Details': json.dumps({'reading_bar': 2.1, 'confidence': 0.9})})
+    
+    assert response.status_code == 201
+    result = json.loads(response.data)
+    assert result['saved'] == 1
+    assert result['image_url'].startswith('/static/targets/archive/')
+    assert result['detections'][0]['target_type'] == 'gauge'
+    assert result['detections'][0]['details']['reading_bar'] == 2.1
+
+
+def test_target_api_raw_upload_batch_details(client):
+    test_image_data = b'\x89PNG' + b'\x00' * 200
+    details = json.dumps([
+        {'target_type': 'valve', 'details': {'state': 'open'}},
+        {'target_type': 'aruco', 'details': {'id': 3}}
+    ])
+    
+    response = client.post('/api/targets',
+                          query_string={'details': details},
+                          data=test_image_data,
+                          content_type='application/octet-stream')
+    
+    assert response.status_code == 201
+    assert json.loads(response.data)['saved'] == 2
+
+
+def test_target_api_raw_upload_archives_once_and_links_latest(client):
+    from gcs.services import image_store
+    
+    test_image_data = b'\xff\xd8\xff\xe0' + b'\x00' * 200 + b'\xff\xd9'
+    response = client.post('/api/targets?target_type=gauge', data=test_image_data, content_type='image/jpeg')
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    
+    archive_file = image_store.archive_path(data['image_url'])
+    latest = os.path.join('gcs', 'static', 'targets', 'latest.jpg')
+    assert archive_file.read_bytes() == test_image_data
+    assert os.path.samefile(archive_file, latest)
+    assert image_store.latest_archive_url() == data['image_url']
+    assert data['thumb_url'] is None
+    assert [f for _, _, files in os.walk('gcs') for f in files if f.endswith('.tmp')] == []
+
+
+def test_target_api_raw_upload_rejects_non_image(client):
+    response = client.post('/api/targets?target_type=valve',
+                          data=b'hello world' * 20,
+                          content_type='application/octet-stream')
+    
+    assert response.status_code == 400
+    assert 'Invalid image format' in json.loads(response.data)['error']
+
+
+def test_target_api_image_written_by_image_writer(client):
+    test_image_data = b'\xff\xd8\xff\xe0' + b'\x00' * 200 + b'\xff\xd9'
+    payload = {
+        'image_b64': base64.b64encode(test_image_data).decode('utf-8'),
+        'target_type': 'valve',
+        'details': {'state': 'open'}
+    }
+    
+    response = client.post('/api/targets', data=json.dumps(payload), content_type='application/json')
+    assert response.status_code == 201
+    image_url = json.loads(response.data)['image_url']
+    assert image_url.startswith('/static/targets/archive/')
+    
+    image_writer.flush()
+    with open(os.path.join('gcs', image_url.lstrip('/')), 'rb') as f:
+        assert f.read() == test_image_data
+    record = json.loads(client.get('/api/target-data').data)['data'][0]
+    assert record['image_url'] == image_url
+    assert record['image_status'] is None
+
+
+def test_target_api_identical_frames_share_one_archive_file(client):
+    test_image_data = b'\xff\xd8\xff\xe0' + b'\x01' * 300 + b'\xff\xd9'
+    urls = []
+    for state in ('open', 'closed'):
+        payload = {
+            'image_b64': base64.b64encode(test_image_data).decode('utf-8'),
+            'target_type': 'valve',
+            'details': {'state': state}
+        }
+        response = client.post('/api/targets', data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 201
+        urls.append(json.loads(response.data)['image_url'])
+        image_writer.flush()
+    raw = client.post('/api/targets?target_type=valve', data=test_image_data, content_type='image/jpeg')
+    urls.append(json.loads(raw.data)['image_url'])
+    
+    assert len(set(urls)) == 1
+    assert image_writer.stats()['deduplicated'] >= 1
+    records = json.loads(client.get('/api/target-data').data)['data']
+    assert {r['image_url'] for r in records} == {urls[0]}
+
+
+def test_archive_listing_and_clear_history(client):
+    frames = [b'\xff\xd8\xff\xe0' + bytes([i]) * 200 + b'\xff\xd9' for i in (7, 8)]
+    for frame in frames:
+        response = client.post('/api/targets?target_type=gauge', data=frame, content_type='image/jpeg')
+        assert response.status_code == 201
+    
+    listing = json.loads(client.get('/api/archive?limit=1').data)
+    assert listing['count'] >= 2
+    assert len(listing['images']) == 1
+    newest = listing['images'][0]
+    assert newest['size'] == len(frames[1])
+    assert os.path.exists(os.path.join('gcs', newest['url'].lstrip('/')))
+    assert client.get('/api/archive?from=not-a-date').status_code == 400
+    
+    assert client.post('/api/clear-history').status_code == 200
+    assert json.loads(client.get('/api/archive').data) == {'images': [], 'count': 0}
+    assert not os.path.exists(os.path.join('gcs', newest['url'].lstrip('/')))
+
+
+def test_pack_backend_upload_served_from_archive_route(client, tmp_path, monkeypatch):
+    from gcs.services import image_store
+    
+    monkeypatch.chdir(tmp_path)
+    image_store.archive_index.reset()
+    image_store.configure_archive("pack")
+    try:
+        test_image_data = b'\xff\xd8\xff\xe0' + b'\x05' * 300 + b'\xff\xd9'
+        response = client.post('/api/targets?target_type=gauge', data=test_image_data, content_type='image/jpeg')
+        assert response.status_code == 201
+        image_url = json.loads(response.data)['image_url']
+        assert image_url.startswith('/archive/')
+        
+        served = client.get(image_url)
+        assert served.status_code == 200
+        assert served.mimetype == 'image/jpeg'
+        assert served.data == test_image_data
+        assert 'immutable' in served.headers['Cache-Control']
+        assert client.get(image_url, headers={'If-None-Match': served.headers['ETag']}).status_code == 304
+        assert client.get('/archive/' + '0' * 32 + '.jpg').status_code == 404
+        
+        # /targets/latest.jpg reads the packed frame; no latest.jpg copy is written
+        latest_frames.clear()
+        latest = client.get('/targets/latest.jpg')
+        assert latest.status_code == 200
+        assert latest.data == test_image_data
+        assert latest.headers['Cache-Control'] == 'no-cache'
+        assert client.get('/targets/latest.jpg', headers={'If-None-Match': latest.headers['ETag']}).status_code == 304
+        assert not os.path.exists(os.path.join('gcs', 'static', 'targets', 'latest.jpg'))
+    finally:
+        image_store.configure_archive("files")
+        image_store.archive_index.reset()
+
+
+def test_latest_image_conditional_get(client):
+    frames = [b'\xff\xd8\xff\xe0' + bytes([i]) * 400 + b'\xff\xd9' for i in (21, 22)]
+    client.post('/api/targets?target_type=gauge', data=frames[0], content_type='image/jpeg')
+    
+    first = client.get('/targets/latest.jpg')
+    assert first.status_code == 200
+    assert first.data == frames[0]
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert first.headers.get('Last-Modified')
+    etag = first.headers['ETag']
+    
+    unchanged = client.get('/targets/latest.jpg', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+    
+    client.post('/api/targets?target_type=gauge', data=frames[1], content_type='image/jpeg')
+    changed = client.get('/targets/latest.jpg', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.data == frames[1]
+    assert changed.headers['ETag'] != etag
+
+
+def test_live_frame_served_from_memory(client, monkeypatch):
+    frame = b'\xff\xd8\xff\xe0' + b'\x31' * 400 + b'\xff\xd9'
+    with monkeypatch.context() as m:
+        # The streamed upload is buffered as it is archived, not read back afterwards
+        m.setattr('gcs.routes.read_archive', lambda url: pytest.fail('archive read'))
+        client.post('/api/targets?target_type=gauge&device_id=uav-7', data=frame, content_type='image/jpeg')
+    # The live routes never touch the archive or latest.jpg on disk
+    monkeypatch.setattr('gcs.routes.latest_image_path', lambda: pytest.fail('disk read'))
+    
+    for url in ('/frames/uav-7/latest.jpg', '/frames/latest.jpg', '/targets/latest.jpg'):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.data == frame
+        assert response.headers['X-Device-Id'] == 'uav-7'
+        assert response.headers['Cache-Control'] == 'no-cache'
+        assert client.get(url, headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/frames/uav-missing/latest.jpg').status_code == 404
+    devices = json.loads(client.get('/api/frames').data)['devices']
+    assert devices[0]['device_id'] == 'uav-7'
+
+
+def test_live_frame_long_poll(app, client):
+    frames = [b'\xff\xd8\xff\xe0' + bytes([i]) * 400 + b'\xff\xd9' for i in (41, 42)]
+    client.post('/api/targets?target_type=gauge&device_id=uav-8', data=frames[0], content_type='image/jpeg')
+    etag = client.get('/frames/uav-8/latest.jpg').headers['ETag']
+    
+    # Nothing newer arrives: the poll blocks for the timeout, then ends in a 304
+    timed_out = client.get('/frames/uav-8/latest.jpg?wait=0.2', headers={'If-None-Match': etag})
+    assert timed_out.status_code == 304
+    
+    def upload():
+        time.sleep(0.2)
+        app.test_client().post('/api/targets?target_type=gauge&device_id=uav-8', data=frames[1],
+                               content_type='image/jpeg')
+    
+    uploader = threading.Thread(target=upload)
+    uploader.start()
+    started = time.monotonic()
+    woke = client.get('/frames/uav-8/latest.jpg?wait=10', headers={'If-None-Match': etag})
+    uploader.join()
+    assert woke.status_code == 200
+    assert woke.data == frames[1]
+    assert time.monotonic() - started < 5
+
+
+def test_live_mjpeg_stream(app, client):
+    frame = b'\xff\xd8\xff\xe0' + b'\x51' * 400 + b'\xff\xd9'
+    client.post('/api/targets?target_type=gauge&device_id=uav-9', data=frame, content_type='image/jpeg')
+    
+    response = client.get('/frames/uav-9/live.mjpeg', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'multipart/x-mixed-replace'
+    assert response.mimetype_params['boundary'] == 'frame'
+    part = next(iter(response.response))
+    assert part.startswith(b'--frame\r\nContent-Type: image/jpeg\r\n')
+    assert part.endswith(frame + b'\r\n')
+    
+    app.config['MJPEG_MAX_CLIENTS'] = 1
+    assert client.get('/frames/live.mjpeg', buffered=False).status_code == 503
+    response.close()
+    assert json.loads(client.get('/api/frames').data)['viewers'] == 0
+
+
+def test_archive_images_are_cached_as_immutable(app, client, tmp_path):
+    # The archive is written under the (scratch) working directory; serve /static from there
+    static_folder = app.static_folder
+    app.static_folder = str(tmp_path / 'gcs' / 'static')
+    frame = b'\xff\xd8\xff\xe0' + b'\x17' * 400 + b'\xff\xd9'
+    image_url = json.loads(client.post('/api/targets?target_type=gauge', data=frame,
+                                       content_type='image/jpeg').data)['image_url']
+    
+    response = client.get(image_url)
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'max-age=31536000' in response.headers['Cache-Control']
+    # Only the content-addressed images, not other static files or the moving latest.jpg
+    assert 'immutable' not in client.get('/targets/latest.jpg').headers['Cache-Control']
+    app.static_folder = static_folder
+    assert 'immutable' not in client.get('/static/js/dashboard.js').headers.get('Cache-Control', '')
+
+
+def test_target_api_failed_image_write_marks_row(client, monkeypatch):
+    def broken_write(archive_url, img_bytes):
+        raise OSError("No space left on device")
+    
+    monkeypatch.setattr('gcs.services.image_writer.write_archive', broken_write)
+    payload = {
+        'image_b64': base64.b64encode(b'\xff\xd8\xff\xe0' + b'\x00' * 200).decode('utf-8'),
+        'details': [
+            {'target_type': 'valve', 'details': {'state': 'open'}},
+            {'target_type': 'gauge', 'details': {'value': 3}}
+        ]
+    }
+    
+    response = client.post('/api/targets', data=json.dumps(payload), content_type='application/json')
+    # The metadata commit succeeds regardless of the image write
+    assert response.status_code == 201
+    
+    image_writer.flush()
+    records = json.loads(client.get('/api/target-data').data)['data']
+    assert [r['image_status'] for r in records] == ['failed', 'failed']
+    assert image_writer.stats()['failed'] >= 1
+
+
 def test_target_api_batch_detections_json(client):
     """Test batch detection with JSON array"""
     test_image_data = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C\x00\x08\x06\x06\x07\x06\x05\x08\x07\x07\x07\t\t\x08\n\x0c\x14\r\x0c\x0b\x0b\x0c\x19\x12\x13\x0f\x14\x1d\x1a\x1f\x1e\x1d\x1a\x1c\x1c $.\' ",#\x1c\x1c(7),01444\x1f\'9=82<.342\xff\xc0\x00\x11\x08\x00\x01\x00\x01\x01\x01\x11\x00\x02\x11\x01\x03\x11\x01\xff\xc4\x00\x14\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x08\xff\xc4\x00\x14\x10\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xda\x00\x0c\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00\xaa\xff\xd9'
@@ -0,0 +1,111 @@
+import json
+import struct
+
+import pytest
+
+from gcs import create_app, db
+from gcs.models import SensorData
+from gcs.services import sensor_frames
+from gcs.services.sensor_frames import (
+    FRAME_SIZE, SENSOR_FRAME_MIMETYPE, decode_frames, encode_frames,
+)
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+READINGS = [
+    {"timestamp": 1736937000.0, "co_ppm": 1.5, "temp_c": 22.5, "humidity_pct": 60.0},
+    {"timestamp": 1736937001.0, "no2_ppm": 0.25},
+]
+
+
+def test_frame_size():
+    assert FRAME_SIZE == 40
+    assert len(encode_frames(READINGS)) == 2 * FRAME_SIZE
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_decode_round_trip(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(sensor_frames, "np", None)
+    elif sensor_frames.np is None:
+        pytest.skip("numpy not installed")
+    
+    payloads = decode_frames(encode_frames(READINGS), source="aqsa")
+    
+    assert len(payloads) == 2
+    assert payloads[0]["co_ppm"] == 1.5
+    assert payloads[0]["temp_c"] == 22.5
+    assert "no2_ppm" not in payloads[0]
+    assert payloads[0]["timestamp"].isoformat() == "2025-01-15T10:30:00"
+    assert payloads[1] == {"source": "aqsa", "timestamp": payloads[1]["timestamp"], "no2_ppm": 0.25}
+
+
+def test_decode_rejects_truncated_body_and_bad_version():
+    body = encode_frames(READINGS)
+    with pytest.raises(ValueError):
+        decode_frames(body[:-1])
+    with pytest.raises(ValueError):
+        decode_frames(struct.pack("<B", 9) + body[1:FRAME_SIZE])
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("reading", [
+    {"timestamp": float("inf"), "co_ppm": 1.0},
+    {"timestamp": -1e20, "co_ppm": 1.0},
+    {"timestamp": 1736937000.0, "co_ppm": float("inf")},
+    {"timestamp": 1736937000.0, "temp_c": float("-inf")},
+])
+def test_decode_rejects_non_finite_values(monkeypatch, use_numpy, reading):
+    if not use_numpy:
+        monkeypatch.setattr(sensor_frames, "np", None)
+    elif sensor_frames.np is None:
+        pytest.skip("numpy not installed")
+    
+    with pytest.raises(ValueError, match="at frame 1"):
+        decode_frames(encode_frames([READINGS[0], reading]))
+
+
+def test_sensor_api_binary_frame_bad_timestamp(client):
+    response = client.post('/api/sensors',
+                          data=encode_frames([{"timestamp": 1e20, "co_ppm": 1.0}]),
+                          content_type=SENSOR_FRAME_MIMETYPE)
+    
+    assert response.status_code == 400
+    assert 'timestamp' in json.loads(response.data)['error']
+    assert SensorData.query.count() == 0
+
+
+def test_sensor_api_binary_frames(client):
+    response = client.post('/api/sensors?source=aqsa-bin',
+                          data=encode_frames(READINGS),
+                          content_type=SENSOR_FRAME_MIMETYPE)
+    
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['saved'] == 2
+    assert SensorData.query.filter_by(source="aqsa-bin").count() == 2
+
+
+def test_sensor_api_binary_frame_without_readings(client):
+    response = client.post('/api/sensors',
+                          data=encode_frames([{"timestamp": 1736937000.0}]),
+                          content_type=SENSOR_FRAME_MIMETYPE)
+    
+    assert response.status_code == 400
+    assert json.loads(response.data)['errors'][0]['index'] == 0
@@ -0,0 +1,154 @@
+import io
+
+import pytest
+
+from gcs import create_app, db, socketio, image_writer, recent_detections
+from gcs.models import SensorData, TargetDetection
+
+
+TEST_JPEG = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00' + b'\x00' * 120 + b'\xff\xd9'
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def sio(app):
+    client = socketio.test_client(app)
+    yield client
+    client.disconnect()
+
+
+def test_sensor_reading_ack_carries_id(app, sio):
+    ack = sio.emit("sensor_reading", {"co_ppm": 1.25, "source": "sio-test"}, callback=True)
+    
+    assert ack["ok"] is True
+    assert len(ack["ids"]) == 1
+    assert db.session.get(SensorData, ack["ids"][0]).co_ppm == 1.25
+
+
+def test_sensor_reading_accepts_list(app, sio):
+    ack = sio.emit("sensor_reading", [{"co_ppm": 1.0}, {"temp_c": 20.5}], callback=True)
+    
+    assert ack["ok"] is True
+    assert len(ack["ids"]) == 2
+
+
+def test_sensor_reading_validation_error(app, sio):
+    ack = sio.emit("sensor_reading", {"co_ppm": "high"}, callback=True)
+    
+    assert ack["ok"] is False
+    assert "Invalid value" in ack["error"]
+
+
+def test_target_batch_upload_with_binary_image(app, sio):
+    payload = {
+        "image": TEST_JPEG,
+        "device_id": "sio_device",
+        "details": [
+            {"target_type": "valve", "details": {"state": "open"}},
+            {"target_type": "aruco", "details": {"id": 4}}
+        ]
+    }
+    
+    ack = sio.emit("target_batch_upload", payload, callback=True)
+    
+    assert ack["ok"] is True
+    assert ack["saved"] == 2
+    assert len(ack["ids"]) == 2
+    assert ack["image_url"].startswith("/static/targets/archive/")
+    assert db.session.get(TargetDetection, ack["ids"][1]).target_type == "aruco"
+
+
+def test_target_batch_upload_requires_details_or_image(app, sio):
+    ack = sio.emit("target_batch_upload", {"device_id": "sio_device"}, callback=True)
+    
+    assert ack["ok"] is False
+
+
+@pytest.mark.parametrize("image, error", [
+    (b"not an image at all", "too small"),
+    (b"not an image" * 20, "Invalid image format"),
+    ("a string, not bytes", "binary data"),
+    (TEST_JPEG + b"\x00" * 400, "exceeds"),
+])
+def test_target_batch_upload_rejects_bad_image(app, sio, image, error):
+    app.config["MAX_IMAGE_BYTES"] = 512
+    
+    ack = sio.emit("target_batch_upload", {
+        "image": image,
+        "details": [{"target_type": "valve", "details": {"state": "open"}}],
+    }, callback=True)
+    
+    assert ack["ok"] is False
+    assert error in ack["error"]
+
+
+def _upload_and_collect(app, sio, image, marker_ids):
+    subscriber = socketio.test_client(app, namespace="/stream")
+    plain = socketio.test_client(app, namespace="/stream")
+    ack = subscriber.emit("subscribe_images", {"enabled": True}, namespace="/stream", callback=True)
+    assert ack == {"ok": True, "images": True}
+    recent_detections.clear()
+    
+    sio.emit("target_batch_upload", {
+        "image": image,
+        "details": [{"target_type": "aruco", "details": {"id": i}} for i in marker_ids],
+    }, callback=True)
+    image_writer.flush()
+    
+    received = {}
+    for name, client in (("subscriber", subscriber), ("plain", plain)):
+        received[name] = [e["args"][0] for e in client.get_received("/stream") if e["name"] == "target_batch"]
+        client.disconnect(namespace="/stream")
+    return received
+
+
+def test_subscribed_client_gets_frame_attached(app, sio, monkeypatch):
+    # Without Pillow the original frame is attached as-is (it is under IMAGE_PUSH_MAX_BYTES)
+    monkeypatch.setattr("gcs.services.image_push.Image", None)
+    
+    received = _upload_and_collect(app, sio, TEST_JPEG, (901, 902))
+    
+    assert len(received["subscriber"]) == 1
+    assert received["subscriber"][0]["image"] == TEST_JPEG
+    assert received["subscriber"][0]["image_mimetype"] == "image/jpeg"
+    assert len(received["plain"]) == 1
+    assert "image" not in received["plain"][0]
+    assert received["plain"][0]["image_url"] == received["subscriber"][0]["image_url"]
+
+
+def test_subscribed_client_gets_downscaled_frame(app, sio):
+    Image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    Image.new("RGB", (1280, 960), (10, 200, 90)).save(buf, format="JPEG")
+    
+    received = _upload_and_collect(app, sio, buf.getvalue(), (903, 904))
+    
+    with Image.open(io.BytesIO(received["subscriber"][0]["image"])) as pushed:
+        assert max(pushed.size) <= app.config["IMAGE_PUSH_SIZE"]
+
+
+
+def test_sensor_reading_mixed_timestamps_broadcast(app, sio):
+    listener = socketio.test_client(app, namespace="/stream")
+    
+    # One reading with an explicit UTC timestamp, one stamped by the server
+    ack = sio.emit("sensor_reading", [{"co_ppm": 1, "timestamp": "2025-01-15T10:00:00Z"}, {"co_ppm": 2}],
+                   callback=True)
+    
+    assert ack["ok"] is True
+    updates = [e["args"][0] for e in listener.get_received("/stream") if e["name"] == "sensor_update"]
+    listener.disconnect(namespace="/stream")
+    assert len(updates) == 1
+    assert [r["co_ppm"] for r in updates[0]["batch"]] == [1, 2]
+    assert db.session.get(SensorData, ack["ids"][0]).ts.tzinfo is None
@@ -0,0 +1,131 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from config import Config
+from gcs import create_app, db, table_stats
+from gcs.models import SensorData, TargetDetection
+
+START = datetime(2025, 1, 15, 10, 0, 0)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'stats.db'}")
+    monkeypatch.setattr(Config, "ROLLUPS_ENABLED", False)
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _stats(client):
+    return client.get('/api/stats').get_json()["tables"]
+
+
+def test_load_seeds_counts_and_ranges(app):
+    db.session.add_all([SensorData(ts=START + timedelta(seconds=i), temp_c=1.0) for i in range(5)])
+    db.session.add_all([
+        TargetDetection(ts=START + timedelta(seconds=i), target_type=t, details_json={})
+        for i, t in enumerate(["gauge", "gauge", "valve", "livedata"])
+    ])
+    db.session.commit()
+    table_stats._loaded = False  # forget the counters so the snapshot re-seeds
+
+    tables = table_stats.snapshot()["tables"]
+
+    assert tables["sensor_data"] == {"count": 5, "min_ts": START, "max_ts": START + timedelta(seconds=4)}
+    targets = tables["target_detection"]
+    assert targets["count"] == 4
+    assert {t: e["count"] for t, e in targets["by_type"].items()} == {"gauge": 2, "livedata": 1, "valve": 1}
+    assert targets["detections"] == {"count": 3, "min_ts": START, "max_ts": START + timedelta(seconds=2)}
+    assert tables["system_log"]["count"] == 0
+
+
+def test_ingest_updates_counts_without_queries(app):
+    client = app.test_client()
+    assert client.post('/api/sensors', data=json.dumps({"timestamp": "2025-01-15T10:30:00Z", "temp_c": 21.0}),
+                       content_type='application/json').status_code == 201
+    assert client.post('/api/sensors/batch', data=json.dumps([
+        {"timestamp": "2025-01-15T09:00:00Z", "temp_c": 20.0},
+        {"timestamp": "2025-01-15T11:00:00Z", "temp_c": 22.0},
+    ]), content_type='application/json').status_code == 201
+    assert client.post('/api/targets', data=json.dumps({"target_type": "valve", "details": {"state": "open"}}),
+                       content_type='application/json').status_code == 201
+
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _capture)
+    try:
+        tables = _stats(client)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _capture)
+
+    assert statements == []
+    assert tables["sensor_data"]["count"] == 3
+    assert tables["sensor_data"]["min_ts"] == "2025-01-15T09:00:00"
+    assert tables["sensor_data"]["max_ts"] == "2025-01-15T11:00:00"
+    assert tables["target_detection"]["by_type"]["valve"]["count"] == 1
+    assert tables["target_detection"]["detections"]["count"] == 1
+
+
+def test_detections_match_the_not_livedata_query(app):
+    from gcs.models import not_livedata
+
+    db.session.add_all([
+        TargetDetection(ts=START + timedelta(seconds=i), target_type=t, details_json={})
+        for i, t in enumerate(["gauge", None, "livedata"])
+    ])
+    db.session.commit()
+
+    expected = TargetDetection.query.filter(not_livedata()).count()
+    assert expected == 1
+    # Counted from the commit events, then re-seeded from the database
+    assert _stats(app.test_client())["target_detection"]["detections"]["count"] == expected
+    table_stats._loaded = False
+    assert table_stats.snapshot()["tables"]["target_detection"]["detections"]["count"] == expected
+
+
+def test_rolled_back_rows_are_not_counted(app):
+    before = table_stats.snapshot()["tables"]["sensor_data"]["count"]
+    db.session.add(SensorData(ts=START, temp_c=1.0))
+    db.session.flush()
+    db.session.rollback()
+
+    assert table_stats.snapshot()["tables"]["sensor_data"]["count"] == before
+
+
+def test_deletes_reseed_counts(app):
+    rows = [SensorData(ts=START + timedelta(seconds=i), temp_c=1.0) for i in range(3)]
+    db.session.add_all(rows)
+    db.session.commit()
+
+    db.session.delete(rows[-1])
+    db.session.commit()
+    assert table_stats.snapshot()["tables"]["sensor_data"] == {
+        "count": 2, "min_ts": START, "max_ts": START + timedelta(seconds=1)
+    }
+
+    client = app.test_client()
+    assert client.post('/api/clear-history').status_code == 200
+    tables = _stats(client)
+    assert tables["sensor_data"] == {"count": 0, "min_ts": None, "max_ts": None}
+    assert tables["target_detection"]["by_type"] == {}
+
+
+def test_stats_etag_tracks_changes(app):
+    client = app.test_client()
+    etag = client.get('/api/stats').headers["ETag"]
+    assert client.get('/api/stats', headers={"If-None-Match": etag}).status_code == 304
+
+    db.session.add(SensorData(ts=START, temp_c=1.0))
+    db.session.commit()
+
+    assert client.get('/api/stats', headers={"If-None-Match": etag}).status_code == 200
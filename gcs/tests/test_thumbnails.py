@@ -0,0 +1,99 @@
+import base64
+import io
+import json
+
+import pytest
+
+from gcs import create_app, db, socketio, image_writer, thumbnailer, recent_detections
+from gcs.services import image_store
+from gcs.services.thumbnails import ThumbnailWorker, thumb_path, thumb_url_for
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(size=(1280, 960), color=(40, 120, 200)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def _archive(img_bytes):
+    # What the image writer does with an uploaded frame
+    url = image_store.archive_url_for(img_bytes)
+    image_store.write_archive(url, img_bytes)
+    return url
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recent_detections.clear()
+    image_store.archive_index.reset()
+    yield tmp_path
+    recent_detections.clear()
+    image_store.archive_index.reset()
+
+
+def test_thumb_url_for_archive_only():
+    assert thumb_url_for("/static/targets/archive/abc123.png") == "/static/targets/thumbs/abc123.jpg"
+    assert thumb_url_for("/static/targets/latest.jpg") is None
+    assert thumb_url_for(None) is None
+
+
+def test_worker_renders_small_thumbnail(workdir):
+    url = _archive(_jpeg())
+    worker = ThumbnailWorker(workers=1, max_queue=4, max_size=160)
+    worker.start()
+    try:
+        assert worker.submit(url) is True
+        worker.flush()
+    finally:
+        worker.stop()
+    
+    with Image.open(thumb_path(thumb_url_for(url))) as thumb:
+        assert thumb.format == "JPEG"
+        assert max(thumb.size) == 160
+    assert worker.stats()["generated"] == 1
+
+
+def test_worker_counts_unreadable_image_as_failed(workdir):
+    url = _archive(b'\xff\xd8\xff\xe0' + b'\x00' * 200)
+    worker = ThumbnailWorker()
+    worker.start()
+    try:
+        worker.submit(url)
+        worker.flush()
+    finally:
+        worker.stop()
+    
+    assert worker.stats()["failed"] == 1
+    assert not thumb_path(thumb_url_for(url)).exists()
+
+
+def test_target_upload_fills_thumb_url_and_emits_event(workdir):
+    app = create_app()
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        sio = socketio.test_client(app, namespace="/stream")
+        client = app.test_client()
+        payload = {
+            'image_b64': base64.b64encode(_jpeg()).decode('utf-8'),
+            'target_type': 'valve',
+            'details': {'state': 'open', 'confidence': 0.9}
+        }
+        
+        response = client.post('/api/targets', data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 201
+        image_url = json.loads(response.data)['image_url']
+        image_writer.flush()
+        thumbnailer.flush()
+        
+        events = [e for e in sio.get_received("/stream") if e["name"] == "thumbnail_ready"]
+        assert events and events[-1]["args"][0] == {"image_url": image_url, "thumb_url": thumb_url_for(image_url)}
+        recent = json.loads(client.get('/api/recent-detections').data)
+        assert recent[-1]["thumb_url"] == thumb_url_for(image_url)
+        
+        sio.disconnect(namespace="/stream")
+        db.drop_all()
@@ -0,0 +1,29 @@
+"""add target_detection.image_status
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-16 09:12:40.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() after this change already have the column
+    columns = [c['name'] for c in sa.inspect(op.get_bind()).get_columns('target_detection')]
+    if 'image_status' not in columns:
+        with op.batch_alter_table('target_detection', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('image_status', sa.String(length=16), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('target_detection', schema=None) as batch_op:
+        batch_op.drop_column('image_status')
@@ -0,0 +1,38 @@
+"""add (target_type, ts) and detections-only ts indexes on target_detection
+
+Revision ID: 8b4e6d2c1a37
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 10:04:12.530871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e6d2c1a37'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+NOT_LIVEDATA = "target_type != 'livedata'"
+
+
+def upgrade():
+    # Databases created by db.create_all() after this change already have the indexes
+    bind = op.get_bind()
+    existing = {ix['name'] for ix in sa.inspect(bind).get_indexes('target_detection')}
+    if 'ix_target_detection_target_type_ts' not in existing:
+        op.create_index('ix_target_detection_target_type_ts', 'target_detection', ['target_type', 'ts'])
+    # Partial indexes only where the backend has them (not MySQL)
+    if bind.dialect.name in ('sqlite', 'postgresql') and 'ix_target_detection_ts_not_livedata' not in existing:
+        op.create_index('ix_target_detection_ts_not_livedata', 'target_detection', ['ts'],
+                        sqlite_where=sa.text(NOT_LIVEDATA), postgresql_where=sa.text(NOT_LIVEDATA))
+
+
+def downgrade():
+    bind = op.get_bind()
+    existing = {ix['name'] for ix in sa.inspect(bind).get_indexes('target_detection')}
+    if 'ix_target_detection_ts_not_livedata' in existing:
+        op.drop_index('ix_target_detection_ts_not_livedata', table_name='target_detection')
+    op.drop_index('ix_target_detection_target_type_ts', table_name='target_detection')